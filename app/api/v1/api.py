@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from app.api.v1.articles import router as articles_router
+from app.api.v1.stats import router as stats_router
 
 api_router = APIRouter()
 
@@ -7,4 +8,10 @@ api_router.include_router(
     articles_router,
     prefix="/articles",
     tags=["articles"]
-) 
\ No newline at end of file
+)
+
+api_router.include_router(
+    stats_router,
+    prefix="/stats",
+    tags=["stats"]
+)
@@ -1,11 +1,16 @@
 import logging
 from typing import List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime
-from app.core.database import get_db
+from datetime import datetime, timedelta
+from app.core.database import get_async_db, get_db, get_read_db
+from app.core.counters import count_query, estimate_count
+from app.core.db_utils import article_list_options, article_search
+from app.core.pagination import keyset_query, paginate
 from app.models.article import Article
+from app.models.article_stats import ArticleDailyStats
 from app.schemas.article import ArticleInDB
 from app.core.config import settings
 
@@ -22,30 +27,92 @@ def get_sources():
 
 @router.get("/", response_model=List[ArticleInDB])
 def get_articles(
-    db: Session = Depends(get_db),
-    skip: int = 0,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = None,
     limit: int = 100,
     days: Optional[int] = None
 ):
-    query = select(Article).order_by(Article.published_at.desc())
+    """
+    文章列表（新到舊）
+
+    以 keyset 分頁：回應標頭 X-Next-Cursor 為下一頁的游標，作為 cursor 參數傳入；沒有下一頁時不回傳。
+    """
+    query = select(Article).options(*article_list_options())
+
+    if settings.DEDUP_HIDE_DUPLICATES:
+        query = query.filter(Article.duplicate_of_id.is_(None))
     
     if days:
         from datetime import datetime, timedelta
         cutoff_date = datetime.now() - timedelta(days=days)
         query = query.filter(Article.published_at >= cutoff_date)
     
-    query = query.offset(skip).limit(limit)
-    articles = db.execute(query).scalars().all()
+    try:
+        query = keyset_query(query, limit, after=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    articles, next_cursor, _ = paginate(db.execute(query).scalars().all(), limit, after=cursor)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
     
     logger.info(f"Found {len(articles)} articles in database")
     for article in articles:
         logger.info(f"Article {article.id}: {article.title} ({article.published_at})")
     return articles
 
+@router.get("/count")
+async def count_articles(
+    source: Optional[str] = None,
+    days: Optional[int] = None,
+    q: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """文章數量（從統計表讀取；指定搜尋關鍵字時回傳估計值）"""
+    since = (datetime.now() - timedelta(days=days)) if days else None
+    search = article_search(q)
+    if search is None:
+        total = await db.scalar(count_query(source=source, since=since.date() if since else None))
+        return {"total": total, "estimated": False}
+
+    query = select(Article).where(search[0])
+    if settings.DEDUP_HIDE_DUPLICATES:
+        query = query.where(Article.duplicate_of_id.is_(None))
+    if source:
+        query = query.where(Article.source == source)
+    if since:
+        query = query.where(Article.published_at >= since)
+    return {"total": await estimate_count(db, query), "estimated": True}
+
+@router.get("/search", response_model=List[ArticleInDB])
+async def search_articles(
+    q: str,
+    source: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """全文搜尋文章（依相關度排序，標題命中優先）"""
+    search = article_search(q)
+    if search is None:
+        raise HTTPException(status_code=400, detail="Search keyword is empty")
+    condition, rank = search
+
+    query = select(Article).options(*article_list_options()).where(condition)
+    if settings.DEDUP_HIDE_DUPLICATES:
+        query = query.where(Article.duplicate_of_id.is_(None))
+    if source:
+        query = query.where(Article.source == source)
+
+    query = query.order_by(rank.desc(), Article.published_at.desc()).offset(skip).limit(limit)
+    articles = (await db.execute(query)).scalars().all()
+    logger.info(f"Search '{q}' returned {len(articles)} articles")
+    return articles
+
 @router.get("/{article_id}", response_model=ArticleInDB)
 def get_article(
     article_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     query = select(Article).filter(Article.id == article_id)
     article = db.execute(query).scalar_one_or_none()
@@ -58,7 +125,7 @@ def get_article(
 
 
 @router.delete("/all")
-async def delete_all_articles(
+def delete_all_articles(
     db: Session = Depends(get_db),
     confirm: bool = False
 ):
@@ -72,6 +139,7 @@ async def delete_all_articles(
     try:
         stmt = delete(Article)
         db.execute(stmt)
+        db.execute(delete(ArticleDailyStats))
         db.commit()
         return {"message": "All articles deleted"}
     except Exception as e:
@@ -0,0 +1,34 @@
+import logging
+from datetime import date, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.stats import GROUP_COLUMNS, stats_query
+from app.schemas.stats import DailyStats
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/", response_model=List[DailyStats])
+async def get_stats(
+    group_by: str = "source,day",
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    days: int = Query(30, ge=1, le=3660),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    文章統計（從每日統計表讀取，不掃描 articles）
+
+    group_by 為以逗號分隔的 source、category、day，例如 source,day 為各來源每日的文章數，
+    category 為各分類的平均內文長度（avg_content_bytes）
+    """
+    groups = [name.strip() for name in group_by.split(',') if name.strip()]
+    invalid = [name for name in groups if name not in GROUP_COLUMNS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid group_by: {', '.join(invalid)}")
+
+    since = date.today() - timedelta(days=days - 1)
+    query = stats_query(groups, source=source, category=category, since=since)
+    return (await db.execute(query)).all()
@@ -0,0 +1,192 @@
+"""
+大量文章載入
+以 COPY 串流寫入暫存資料表，再用一個語句合併到 articles（見 db_utils.merge_statement），
+適用於歷史回補與從暫存區還原
+"""
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import BigInteger, Column, MetaData, String, Table, and_, func, not_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db_utils import (
+    MERGE_COLUMNS,
+    daily_stats_keys,
+    enqueue_recrawl,
+    flag_near_duplicates,
+    merge_statement,
+    with_fingerprints,
+)
+from app.core.partitions import ensure_partitions_for
+from app.core.stats import refresh_daily_stats
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+_TEXT_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _staging_table() -> Table:
+    """
+    暫存資料表（TEMP 資料表不寫 WAL，交易結束時刪除）
+
+    字串欄位不限長度、沒有 NOT NULL，不合法的文章也能載入，合併時再篩選出來回報。
+    """
+    columns = [Column('seq', BigInteger)]
+    for name in MERGE_COLUMNS:
+        column_type = Article.__table__.c[name].type
+        columns.append(Column(name, String() if isinstance(column_type, String) else column_type))
+    return Table(
+        'article_staging',
+        MetaData(),
+        *columns,
+        prefixes=['TEMPORARY'],
+        postgresql_on_commit='DROP'
+    )
+
+
+def _valid_row(staging: Table):
+    """符合 articles 欄位限制的條件（由 Article 模型的 NOT NULL 與字串長度產生）"""
+    conditions = []
+    for name in MERGE_COLUMNS:
+        column = Article.__table__.c[name]
+        if not column.nullable:
+            conditions.append(staging.c[name].isnot(None))
+        length = getattr(column.type, 'length', None)
+        if length:
+            conditions.append(or_(staging.c[name].is_(None), func.char_length(staging.c[name]) <= length))
+    return and_(*conditions)
+
+
+def _format_value(value: Any) -> str:
+    """轉換為 COPY text 格式的欄位值"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+class _CopyStream:
+    """將文章逐列轉成 COPY 資料的檔案物件（不一次建立整份內容）"""
+
+    def __init__(self, rows: Iterable[Tuple[Any, ...]]):
+        self._rows = iter(rows)
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._buffer += ('\t'.join(_format_value(value) for value in row) + '\n').encode('utf-8')
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    readline = read
+
+
+def _copy_rows(session: Session, staging: Table, rows: List[Dict[str, Any]]) -> None:
+    columns = ('seq',) + MERGE_COLUMNS
+    stream = _CopyStream(
+        (seq, *(row.get(name) for name in MERGE_COLUMNS))
+        for seq, row in enumerate(rows)
+    )
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN", stream)
+    finally:
+        cursor.close()
+
+
+def _merge_chunk(
+    session: Session,
+    rows: List[Dict[str, Any]],
+    update_existing: bool
+) -> Tuple[int, int, Set[int]]:
+    """載入並合併一段文章，回傳 (新增數量, 更新數量, 被拒絕文章的序號)"""
+    ensure_partitions_for(session, (row.get('published_at') for row in rows))
+    staging = _staging_table()
+    staging.create(session.connection())
+    _copy_rows(session, staging, rows)
+
+    valid = _valid_row(staging)
+    rejected_seqs = set(session.execute(select(staging.c.seq).where(not_(valid))).scalars())
+
+    # 同一網址只保留最後一筆（同一列不能更新兩次），依網址排序避免死結
+    source = select(*(staging.c[name] for name in MERGE_COLUMNS))\
+        .where(valid)\
+        .distinct(staging.c.url)\
+        .order_by(staging.c.url, staging.c.seq.desc())\
+        .cte('incoming')
+    results = session.execute(merge_statement(source, update_existing)).scalars().all()
+    session.commit()
+
+    inserted = sum(1 for is_insert in results if is_insert)
+    return inserted, len(results) - inserted, rejected_seqs
+
+
+def copy_upsert_articles(
+    session: Session,
+    articles: Iterable[Mapping[str, Any]],
+    chunk_rows: Optional[int] = None,
+    update_existing: bool = True
+) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    以 COPY 大量寫入文章
+
+    每 chunk_rows 篇為一個交易：COPY 到暫存資料表，再以一個語句合併到 articles。
+    違反欄位限制的文章（缺少必要欄位、字串過長）不寫入，回傳給呼叫端。
+
+    Args:
+        session: 資料庫 session
+        articles: 文章資料
+        chunk_rows: 每個交易的文章數量（預設 COPY_CHUNK_ROWS）
+        update_existing: 網址已存在時是否更新（False 時略過）
+
+    Returns:
+        tuple: (新增數量, 更新數量, 被拒絕的文章)
+    """
+    chunk_rows = chunk_rows or settings.COPY_CHUNK_ROWS
+    inserted_count = 0
+    updated_count = 0
+    rejected: List[Dict[str, Any]] = []
+
+    def process(chunk: List[Dict[str, Any]]) -> None:
+        nonlocal inserted_count, updated_count
+        inserted, updated, rejected_seqs = _merge_chunk(session, chunk, update_existing)
+        inserted_count += inserted
+        updated_count += updated
+        rejected.extend(chunk[seq] for seq in sorted(rejected_seqs))
+        logger.info(f"COPY 載入 {len(chunk)} 篇文章（新增: {inserted}，更新: {updated}，拒絕: {len(rejected_seqs)}）")
+
+        accepted = [row for seq, row in enumerate(chunk) if seq not in rejected_seqs]
+        if inserted or updated:
+            refresh_daily_stats(session, daily_stats_keys(accepted))
+        for i in range(0, len(accepted), settings.DB_WRITER_BATCH_SIZE):
+            batch = accepted[i:i + settings.DB_WRITER_BATCH_SIZE]
+            if settings.DEDUP_ENABLED:
+                flag_near_duplicates(session, batch)
+            if settings.RECRAWL_ENABLED:
+                enqueue_recrawl(session, [row['url'] for row in batch])
+
+    chunk: List[Dict[str, Any]] = []
+    for article_data in articles:
+        chunk.append(with_fingerprints(article_data))
+        if len(chunk) >= chunk_rows:
+            process(chunk)
+            chunk = []
+    if chunk:
+        process(chunk)
+
+    for row in rejected:
+        logger.warning(f"文章不符合欄位限制，未寫入: {row.get('url') or row.get('title')}")
+    return inserted_count, updated_count, rejected
+
@@ -152,6 +152,27 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = "db"
     POSTGRES_DB: str = "sportsnavidb"
     DATABASE_URL: Optional[str] = None
+    DATABASE_READ_URL: Optional[str] = None   # 讀取用的複本（未設定時使用 DATABASE_URL）
+    DATABASE_BULK_URL: Optional[str] = None   # 匯出等大量讀取（未設定時使用 DATABASE_READ_URL）
+
+    # 資料庫連線池（寫入、網頁讀取、大量讀取各自獨立，長時間的匯出不會佔滿網頁的連線）
+    # 語句逾時單位為毫秒，0 表示不限制
+    #
+    # 連線數預算（PostgreSQL max_connections=50，見 docker-compose.yml）：
+    # 每個連線池最多 POOL_SIZE + MAX_OVERFLOW 條連線，讀取與大量讀取各有同步與非同步兩個連線池
+    # - 網頁 Process：寫入 5 + 讀取 5 × 2 + 大量讀取 2 × 2 = 19
+    # - 爬蟲 Process 與重新爬取 Process 只使用寫入連線池：各 5
+    #   （寫入器 1 條 + MAX_CONCURRENT_CRAWLERS 個爬蟲同時查詢重複標題與日期）
+    # 合計 29，保留其餘連線給管理工具與部署時新舊 Process 重疊；調高時請維持合計在 max_connections 以下
+    DB_WRITE_POOL_SIZE: int = 3
+    DB_WRITE_MAX_OVERFLOW: int = 2
+    DB_WRITE_STATEMENT_TIMEOUT_MS: int = 0
+    DB_READ_POOL_SIZE: int = 3
+    DB_READ_MAX_OVERFLOW: int = 2
+    DB_READ_STATEMENT_TIMEOUT_MS: int = 10000
+    DB_BULK_POOL_SIZE: int = 1
+    DB_BULK_MAX_OVERFLOW: int = 1
+    DB_BULK_STATEMENT_TIMEOUT_MS: int = 600000
 
     # Chrome 設定
     CHROME_BIN: str = "/usr/bin/chromium"
@@ -160,18 +181,71 @@ class Settings(BaseSettings):
     DISABLE_IMAGES: bool = True
 
     # 爬蟲設定
+    CRAWLER_BROWSER_BACKEND: str = "selenium"  # selenium 或 playwright
     CRAWLER_MAX_RETRIES: int = 3
     CRAWLER_TIMEOUT: int = 30
     CRAWLER_DELAY_MIN: int = 1
     CRAWLER_DELAY_MAX: int = 3
+    CRAWLER_PAGE_LOAD_TIMEOUT: int = 20
+    CRAWLER_HOST_MIN_INTERVAL: float = 1.0  # 同一主機兩次請求的最短間隔（秒）
+    CRAWLER_PREFETCH_DEPTH: int = 0         # 解析目前文章時預先抓取的文章數（0 表示關閉）
+    CRAWLER_FEED_DISCOVERY: bool = True     # 有設定 feed 網址的來源以 feed 取得文章列表
+    CRAWLER_FEED_URLS: Dict[str, str] = {}  # 來源的 RSS/Atom feed 網址（優先於 NEWS_SOURCES 的 feed_url）
+    CRAWLER_PICKUP_METADATA_LOOKUP: bool = False  # 無法從網址判斷日期的ピックアップ文章，先以 HTTP 查詢發布時間
+    CRAWLER_USER_AGENT: str = (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    # 爬蟲時間預算（秒，0 表示不限制）
+    CRAWLER_TIME_BUDGET_SECONDS: int = 600           # 每個來源的預設時間預算
+    CRAWLER_SOURCE_TIME_BUDGETS: Dict[str, int] = {}  # 個別來源的時間預算，例如 {"npb": 900}
+    CRAWLER_RUN_TIME_BUDGET_SECONDS: int = 9000      # 整次排程的時間預算，需短於排程間隔（最短 3 小時）
 
     # 記憶體管理設定
     MAX_CONCURRENT_CRAWLERS: int = int(os.getenv('MAX_CONCURRENT_CRAWLERS', '3'))
     MAX_RAM_GB: int = 8
     RESERVED_RAM_GB: int = 2
+    CRAWLER_DRIVER_MAX_PAGES: int = 200          # 載入此數量的頁面後重新建立 driver
+    CRAWLER_DRIVER_MAX_RSS_MB: int = 1024        # 瀏覽器 Process 樹的記憶體超過此值時重新建立 driver
 
-    # 資料保留設定
+    # 資料保留設定（articles 依發布月份分割，過期的分割整個移除）
     RETENTION_MONTHS: int = 13
+    PARTITION_AHEAD_MONTHS: int = 3          # 預先建立未來幾個月的分割
+    RETENTION_KEEP_DETACHED: bool = False    # 過期的分割只卸離不刪除（保留為獨立資料表以便備份）
+
+    # 重複文章偵測設定
+    DEDUP_ENABLED: bool = True
+    DEDUP_SIMHASH_MAX_DISTANCE: int = 3      # SimHash 漢明距離 <= 此值視為近似重複
+    DEDUP_SKIP_BY_TITLE: bool = True         # 標題指紋已存在時不抓取內文
+    DEDUP_DROP_DUPLICATE_CONTENT: bool = False  # 近似重複的文章不保留內文
+    DEDUP_HIDE_DUPLICATES: bool = True       # 列表、搜尋與匯出隱藏重複文章
+
+    # 資料庫寫入器設定（所有爬蟲共用一個寫入連線）
+    DB_WRITER_BATCH_SIZE: int = 500          # 累積到此數量就寫入
+    DB_WRITER_FLUSH_SECONDS: float = 2.0     # 最長等待秒數
+
+    # COPY 大量載入設定（回補、從暫存區還原）
+    COPY_CHUNK_ROWS: int = 50000             # 每個交易載入的文章數
+
+    # 爬蟲輸出暫存區設定（資料庫無法使用時保留爬取結果）
+    SPOOL_ENABLED: bool = True
+    SPOOL_DIR: str = "data/spool"
+    SPOOL_SEGMENT_BYTES: int = 64 * 1024 * 1024  # 單一暫存檔大小上限
+    SPOOL_FSYNC: bool = True                     # 每筆紀錄寫入後同步到磁碟
+    SPOOL_DRAIN_INTERVAL_MINUTES: int = 10       # 補寫暫存區文章的排程間隔
+
+    # 重新爬取設定（偵測文章發布後的修改）
+    RECRAWL_ENABLED: bool = True
+    # [文章年齡上限, 檢查間隔]（小時）：6 小時內每小時、1 天內每 3 小時、3 天內每 12 小時、7 天內每 2 天
+    RECRAWL_SCHEDULE_HOURS: List[List[float]] = [[6, 1], [24, 3], [72, 12], [168, 48]]
+    RECRAWL_BATCH_SIZE: int = 100            # 每次最多重新抓取的文章數
+    RECRAWL_INTERVAL_MINUTES: int = 60       # 排程間隔
+    RECRAWL_TIME_BUDGET_SECONDS: int = 900   # 每次的時間預算
+
+    # 每日文章統計設定（每批寫入後更新；排程重新計算近期的統計）
+    STATS_REFRESH_DAYS: int = 7              # 排程重新計算最近幾天（涵蓋重新爬取的期間）
+    STATS_REFRESH_INTERVAL_MINUTES: int = 60 # 排程間隔
 
     # 日誌設定
     LOG_LEVEL: str = "INFO"
@@ -0,0 +1,57 @@
+"""
+文章數量查詢
+總數與來源列表從 article_counts 讀取（由觸發器維護）；有全文搜尋條件時以查詢計畫的估計值代替 COUNT(*)
+"""
+import json
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.article_count import ArticleCount
+
+
+def count_query(
+    source: Optional[str] = None,
+    since: Optional[date] = None,
+    hide_duplicates: Optional[bool] = None
+) -> Select:
+    """
+    文章總數的查詢
+
+    Args:
+        source: 只計算指定來源
+        since: 只計算此日期之後發布的文章
+        hide_duplicates: 是否排除重複文章（預設使用 DEDUP_HIDE_DUPLICATES）
+    """
+    if hide_duplicates is None:
+        hide_duplicates = settings.DEDUP_HIDE_DUPLICATES
+    total = ArticleCount.article_count - ArticleCount.duplicate_count if hide_duplicates else ArticleCount.article_count
+
+    query = select(func.coalesce(func.sum(total), 0))
+    if source:
+        query = query.where(ArticleCount.source == source)
+    if since:
+        query = query.where(ArticleCount.day >= since)
+    return query
+
+
+def sources_query() -> Select:
+    """有文章的來源列表"""
+    return select(ArticleCount.source)\
+        .group_by(ArticleCount.source)\
+        .having(func.sum(ArticleCount.article_count) > 0)\
+        .order_by(ArticleCount.source)
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """以 EXPLAIN 的估計列數代替 COUNT(*)（不執行查詢）"""
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+    # 字面值中的冒號（時間、tsquery）不是參數
+    plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}".replace(':', r'\:')))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
@@ -1,14 +1,87 @@
+from typing import Dict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
 
-# 創建資料庫引擎
-engine = create_engine(
+# 連線池分為三組，各自的大小與語句逾時分開設定：
+# - 寫入：爬蟲、排程工作與結構維護（DATABASE_URL）
+# - 讀取：網頁與 API（DATABASE_READ_URL，可指向複本；複本可能稍微落後主資料庫）
+# - 大量讀取：匯出（DATABASE_BULK_URL），長時間的匯出不會佔用網頁的連線
+# 讀取連線池的交易預設為唯讀，使用主資料庫或複本時行為相同
+# 各 Process 的連線數合計需低於 PostgreSQL 的 max_connections（預算見 config.py 的 DB_* 設定）
+READ_URL = settings.DATABASE_READ_URL or settings.DATABASE_URL
+BULK_URL = settings.DATABASE_BULK_URL or READ_URL
+
+
+def session_settings(statement_timeout_ms: int = 0, read_only: bool = False) -> Dict[str, str]:
+    """連線建立時套用的 PostgreSQL 設定"""
+    options = {}
+    if statement_timeout_ms:
+        options['statement_timeout'] = str(statement_timeout_ms)
+    if read_only:
+        options['default_transaction_read_only'] = 'on'
+    return options
+
+
+def pool_connection_limit() -> Dict[str, int]:
+    """各組連線池最多開啟的連線數（讀取與大量讀取包含同步與非同步兩個連線池）"""
+    return {
+        'write': settings.DB_WRITE_POOL_SIZE + settings.DB_WRITE_MAX_OVERFLOW,
+        'read': 2 * (settings.DB_READ_POOL_SIZE + settings.DB_READ_MAX_OVERFLOW),
+        'bulk': 2 * (settings.DB_BULK_POOL_SIZE + settings.DB_BULK_MAX_OVERFLOW),
+    }
+
+
+def create_pool_engine(
+    url: str,
+    pool_size: int,
+    max_overflow: int,
+    statement_timeout_ms: int = 0,
+    read_only: bool = False
+) -> Engine:
+    """建立同步引擎（psycopg2）"""
+    options = session_settings(statement_timeout_ms, read_only)
+    connect_args = {'options': ' '.join(f'-c {name}={value}' for name, value in options.items())} if options else {}
+    return create_engine(
+        url,
+        pool_pre_ping=True,        # 自動偵測斷開的連接
+        pool_size=pool_size,       # 連接池大小
+        max_overflow=max_overflow, # 超出 pool_size 時的最大連接數
+        connect_args=connect_args
+    )
+
+
+def async_database_url(url: str) -> URL:
+    """將同步的資料庫連線字串轉換為 asyncpg 驅動"""
+    return make_url(url).set(drivername='postgresql+asyncpg')
+
+
+def create_async_pool_engine(
+    url: str,
+    pool_size: int,
+    max_overflow: int,
+    statement_timeout_ms: int = 0,
+    read_only: bool = False
+) -> AsyncEngine:
+    """建立非同步引擎（asyncpg）"""
+    return create_async_engine(
+        async_database_url(url),
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args={'server_settings': session_settings(statement_timeout_ms, read_only)}
+    )
+
+
+# 寫入引擎
+engine = create_pool_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # 自動偵測斷開的連接
-    pool_size=5,         # 連接池大小
-    max_overflow=10      # 超出 pool_size 時的最大連接數
+    settings.DB_WRITE_POOL_SIZE,
+    settings.DB_WRITE_MAX_OVERFLOW,
+    settings.DB_WRITE_STATEMENT_TIMEOUT_MS
 )
 
 # 創建 Session 類別
@@ -18,16 +91,97 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# 同步讀取引擎（同步的 API 路由使用）
+read_engine = create_pool_engine(
+    READ_URL,
+    settings.DB_READ_POOL_SIZE,
+    settings.DB_READ_MAX_OVERFLOW,
+    settings.DB_READ_STATEMENT_TIMEOUT_MS,
+    read_only=True
+)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# 同步大量讀取引擎（排程的 Google Sheets 匯出使用）
+bulk_engine = create_pool_engine(
+    BULK_URL,
+    settings.DB_BULK_POOL_SIZE,
+    settings.DB_BULK_MAX_OVERFLOW,
+    settings.DB_BULK_STATEMENT_TIMEOUT_MS,
+    read_only=True
+)
+
+BulkSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=bulk_engine)
+
+# 非同步讀取引擎（FastAPI 的 async 路由使用，查詢時不會阻塞事件迴圈）
+async_engine = create_async_pool_engine(
+    READ_URL,
+    settings.DB_READ_POOL_SIZE,
+    settings.DB_READ_MAX_OVERFLOW,
+    settings.DB_READ_STATEMENT_TIMEOUT_MS,
+    read_only=True
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False  # commit 後仍可在模板中讀取屬性（非同步 session 不能延遲載入）
+)
+
+# 非同步大量讀取引擎（匯出路由使用）
+async_bulk_engine = create_async_pool_engine(
+    BULK_URL,
+    settings.DB_BULK_POOL_SIZE,
+    settings.DB_BULK_MAX_OVERFLOW,
+    settings.DB_BULK_STATEMENT_TIMEOUT_MS,
+    read_only=True
+)
+
+AsyncBulkSessionLocal = async_sessionmaker(bind=async_bulk_engine, autoflush=False, expire_on_commit=False)
+
 # 創建 Base 類別，所有的 Model 都會繼承這個類別
 Base = declarative_base()
 
 
 def get_db():
     """
-    獲取資料庫 session 的依賴函數
+    獲取資料庫 session 的依賴函數（寫入）
     """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    獲取唯讀資料庫 session 的依賴函數（同步的讀取路由使用）
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    獲取非同步唯讀資料庫 session 的依賴函數（async 路由使用；寫入使用 get_db）
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_bulk_db():
+    """
+    獲取大量讀取用的非同步 session（匯出路由使用，不佔用網頁的連線池）
+    """
+    async with AsyncBulkSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engines() -> None:
+    """關閉非同步連線池（連線屬於建立時的事件迴圈）"""
+    await async_engine.dispose()
+    await async_bulk_engine.dispose()
@@ -2,10 +2,28 @@
 資料庫工具函數
 提供批次操作和優化的資料庫操作方法
 """
-from typing import List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable, Mapping
+from sqlalchemy import String, Text, case, cast, column as sql_column, exists, func, insert, literal, or_, select, update, values
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, load_only, with_expression
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.article import Article
+from app.models.article_count import ArticleCount
+from app.models.article_url import ArticleUrl
+from app.models.recrawl import RecrawlEntry
+from app.schemas.article_record import ArticleRecord
+from app.core.config import settings
+from app.core.fingerprint import (
+    SIMHASH_BANDS,
+    article_fingerprints,
+    find_near_duplicates,
+    title_fingerprint,
+)
+from app.core.partitions import drop_expired_partitions, ensure_partitions_for, retention_start
+from app.core.search import search_query, search_vector
+from app.core.stats import refresh_daily_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,134 +37,646 @@ def batch_upsert_articles(
     """
     批次插入或更新文章
 
+    每批次以一個語句合併寫入（見 merge_statement），並以 RETURNING 精確計算新增與更新數量。
+    內容沒有變化的文章不會被改寫，也不計入更新數量。寫入後更新受影響日期的每日統計。
+    同一網址只保留最後一筆，並依網址排序，讓並行的爬蟲以相同順序鎖定資料列，避免死結。
+
     Args:
         session: 資料庫 session
         articles: 文章資料列表
         batch_size: 每批次處理的數量
 
     Returns:
-        tuple: (新增數量, 更新數量)
+        tuple: (新增數量, 更新數量)（更新數量不含內容未變化的文章）
     """
     inserted_count = 0
     updated_count = 0
+    rows_by_url = {}
+    for article_data in articles:
+        params = with_fingerprints(article_data)
+        rows_by_url[params['url']] = params
+    rows = [rows_by_url[url] for url in sorted(rows_by_url)]
+    ensure_partitions_for(session, (row.get('published_at') for row in rows))
 
-    for i in range(0, len(articles), batch_size):
-        batch = articles[i:i + batch_size]
-
-        for article_data in batch:
-            try:
-                # 使用 PostgreSQL 的 ON CONFLICT 語法進行 upsert
-                stmt = insert(Article).values(**article_data)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['url'],  # 使用 url 作為唯一鍵
-                    set_={
-                        'title': stmt.excluded.title,
-                        'content': stmt.excluded.content,
-                        'description': stmt.excluded.description,
-                        'published_at': stmt.excluded.published_at,
-                        'image_url': stmt.excluded.image_url,
-                        'category': stmt.excluded.category,
-                        'reporter': stmt.excluded.reporter,
-                        'updated_at': stmt.excluded.updated_at,
-                    }
-                )
-
-                result = session.execute(stmt)
-
-                # 判斷是插入還是更新
-                # 注意：這個方法可能不夠準確，但足夠用於日誌記錄
-                if result.rowcount > 0:
-                    # 檢查是否為更新（通過查詢檢查記錄是否已存在）
-                    existing = session.query(Article).filter(
-                        Article.url == article_data['url']
-                    ).first()
-                    if existing and existing.created_at != existing.updated_at:
-                        updated_count += 1
-                    else:
-                        inserted_count += 1
-
-            except Exception as e:
-                logger.error(f"Error upserting article {article_data.get('url', 'unknown')}: {str(e)}")
-                continue
+    for i in range(0, len(rows), batch_size):
+        batch = rows[i:i + batch_size]
+
+        try:
+            inserted, updated = _upsert_rows(session, batch)
+        except OperationalError:
+            # 資料庫無法連線時不逐筆重試，讓呼叫端保留文章稍後重試
+            raise
+        except Exception as e:
+            # 整批失敗時逐筆寫入，只略過有問題的文章
+            logger.warning(f"Batch upsert failed, retrying row by row: {str(e)}")
+            session.rollback()
+            inserted, updated = _upsert_rows_one_by_one(session, batch)
+
+        inserted_count += inserted
+        updated_count += updated
 
         # 每批次提交一次
         session.commit()
-        logger.info(f"Batch {i//batch_size + 1}: Processed {len(batch)} articles")
+        logger.info(
+            f"Batch {i//batch_size + 1}: Processed {len(batch)} articles "
+            f"(inserted {inserted}, updated {updated}, unchanged {len(batch) - inserted - updated})"
+        )
+
+        if settings.DEDUP_ENABLED:
+            flag_near_duplicates(session, batch)
+        if settings.RECRAWL_ENABLED:
+            enqueue_recrawl(session, [article_data['url'] for article_data in batch])
+
+    if inserted_count or updated_count:
+        refresh_daily_stats(session, daily_stats_keys(rows))
+
+    return inserted_count, updated_count
+
+
+def daily_stats_keys(rows: Iterable[Mapping[str, Any]]) -> set:
+    """文章所屬的 (來源, 發布日期)"""
+    return {
+        (row['source'], row['published_at'].date())
+        for row in rows
+        if row.get('source') and row.get('published_at')
+    }
+
+
+# PostgreSQL 單一語句的參數數量上限為 65535
+MAX_BIND_PARAMS = 60000
+
+# 由資料庫預設值產生的欄位
+SERVER_DEFAULT_COLUMNS = ('created_at', 'updated_at')
+
+# 寫入的欄位（id 與時間戳記由資料庫產生）
+MERGE_COLUMNS = tuple(
+    column.name for column in Article.__table__.columns
+    if column.name != 'id' and column.name not in SERVER_DEFAULT_COLUMNS
+)
+
+
+def _upsert_statement(rows: List[Dict[str, Any]]):
+    """多列 upsert 語句（缺少的欄位寫入 NULL）"""
+    table = Article.__table__
+    data = values(*(sql_column(name, table.c[name].type) for name in MERGE_COLUMNS), name='incoming_rows')\
+        .data([tuple(row.get(name) for name in MERGE_COLUMNS) for row in rows])
+    return merge_statement(select(data).cte('incoming'))
+
+
+def incoming_columns(source) -> Dict[str, Any]:
+    """
+    待寫入文章的欄位
+
+    VALUES 中只有 NULL 或字串的欄位會被推斷為 text，非字串欄位轉回資料表的型別；
+    字串欄位不轉換，超過長度時寫入失敗而不是被截斷。
+    """
+    table = Article.__table__
+    return {
+        name: source.c[name] if isinstance(table.c[name].type, String) else cast(source.c[name], table.c[name].type)
+        for name in MERGE_COLUMNS
+    }
+
+
+def merge_statement(source, update_existing: bool = True):
+    """
+    將 source 中的文章合併到 articles（source 中的網址不可重複）
+
+    articles 依月份分割，沒有網址的唯一索引可供 ON CONFLICT 使用：
+    已登記在 article_urls 的網址以 UPDATE 更新（只更新內容有變化的文章），其他以 INSERT 新增，
+    兩者在同一個語句中執行。並行寫入同一個新網址時，後寫入的交易會因 article_urls 的主鍵而失敗。
+
+    Returns:
+        查詢：每篇新增或更新的文章一列 inserted 旗標
+    """
+    table = Article.__table__
+    incoming = incoming_columns(source)
+
+    new_rows = select(*incoming.values()).where(~exists().where(ArticleUrl.url == incoming['url']))
+    inserted = insert(table).from_select(list(MERGE_COLUMNS), new_rows).returning(table.c.url).cte('inserted')
+    results = select(literal(True).label('inserted')).select_from(inserted)
+
+    if update_existing:
+        updated = update(table)\
+            .values(upsert_set(incoming))\
+            .where(table.c.url == incoming['url'])\
+            .where(upsert_changed(incoming))\
+            .returning(table.c.url)\
+            .cte('updated')
+        results = results.union_all(select(literal(False)).select_from(updated))
+    return results
+
+
+def upsert_set(incoming: Mapping[str, Any]) -> Dict[str, Any]:
+    """網址已存在時更新的欄位"""
+    return {
+        'title': incoming['title'],
+        # 略過內文抓取的重複文章不會覆蓋已儲存的內文
+        'content': _keep_existing(incoming, 'content'),
+        'description': incoming['description'],
+        'published_at': incoming['published_at'],
+        'image_url': incoming['image_url'],
+        'category': incoming['category'],
+        'reporter': incoming['reporter'],
+        'updated_at': func.now(),
+        **{column: _keep_existing(incoming, column) for column in FINGERPRINT_COLUMNS},
+        'search_vector': _search_vector_update(incoming),
+    }
+
+
+def _search_vector_update(incoming: Mapping[str, Any]):
+    """新資料沒有內文時（只有標題的向量）保留既有的搜尋向量"""
+    existing = Article.__table__.c.search_vector
+    return case(
+        (incoming['content_hash'].is_(None), func.coalesce(existing, incoming['search_vector'])),
+        else_=func.coalesce(incoming['search_vector'], existing)
+    )
+
+
+# 直接比較的欄位（內文與指紋由 content_hash 代表）
+COMPARED_COLUMNS = ('title', 'description', 'published_at', 'image_url', 'category', 'reporter')
+
+
+def upsert_changed(incoming: Mapping[str, Any]):
+    """
+    網址已存在時，只有內容有變化才更新
+
+    內容相同的文章不改寫資料列（不產生 dead tuple 與 WAL，也不更新 updated_at），
+    RETURNING 不會回傳這些文章，因此不計入更新數量。
+    """
+    table = Article.__table__
+    return or_(
+        # 新資料沒有內文時沿用既有的雜湊，只比較其他欄位
+        _keep_existing(incoming, 'content_hash').is_distinct_from(table.c.content_hash),
+        _keep_existing(incoming, 'duplicate_of_id').is_distinct_from(table.c.duplicate_of_id),
+        *(incoming[column].is_distinct_from(table.c[column]) for column in COMPARED_COLUMNS),
+    )
+
+
+def _upsert_rows(session: Session, rows: List[Dict[str, Any]]) -> tuple[int, int]:
+    """寫入已依網址排序且不重複的文章，回傳 (新增數量, 更新數量)"""
+    if not rows:
+        return 0, 0
+    chunk_size = max(1, MAX_BIND_PARAMS // len(MERGE_COLUMNS))
 
+    inserted = 0
+    total = 0
+    for i in range(0, len(rows), chunk_size):
+        results = session.execute(_upsert_statement(rows[i:i + chunk_size])).scalars().all()
+        inserted += sum(1 for is_insert in results if is_insert)
+        total += len(results)
+    return inserted, total - inserted
+
+
+def _upsert_rows_one_by_one(session: Session, rows: List[Dict[str, Any]]) -> tuple[int, int]:
+    """逐筆寫入（每筆使用 savepoint，失敗的文章不影響其他文章）"""
+    inserted_count = 0
+    updated_count = 0
+    for row in rows:
+        try:
+            with session.begin_nested():
+                inserted, updated = _upsert_rows(session, [row])
+            inserted_count += inserted
+            updated_count += updated
+        except OperationalError:
+            raise
+        except Exception as e:
+            logger.error(f"Error upserting article {row.get('url', 'unknown')}: {str(e)}")
     return inserted_count, updated_count
 
 
+# 指紋與重複標記欄位（新資料沒有值時保留既有值）
+FINGERPRINT_COLUMNS = (
+    'title_fingerprint',
+    'content_simhash',
+    *(f'simhash_band_{i}' for i in range(SIMHASH_BANDS)),
+    'duplicate_of_id',
+    'content_hash',
+)
+
+
+def _keep_existing(incoming: Mapping[str, Any], column: str):
+    return func.coalesce(incoming[column], Article.__table__.c[column])
+
+
+def with_fingerprints(article_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    為文章資料補上指紋欄位（已有 content_simhash 時不重算）
+
+    ArticleRecord 只在這裡轉成一次寫入參數（只含資料表欄位）。
+    """
+    if isinstance(article_data, ArticleRecord):
+        params = article_data.to_params()
+        if 'content_simhash' not in params:
+            params.update(article_fingerprints(params.get('title'), params.get('content')))
+        return params
+    if 'content_simhash' in article_data:
+        return article_data
+    return {
+        **article_data,
+        **article_fingerprints(article_data.get('title'), article_data.get('content')),
+    }
+
+
+def flag_near_duplicates(
+    session: Session,
+    articles: List[Dict[str, Any]],
+    max_distance: Optional[int] = None
+) -> int:
+    """
+    標記近似重複的文章
+
+    以 SimHash 分段索引找出候選文章（任一段相同），再計算漢明距離確認。
+    重複文章的 duplicate_of_id 指向最早儲存（id 最小）的原始文章。
+
+    Args:
+        session: 資料庫 session
+        articles: 剛寫入的文章資料（需包含指紋欄位）
+        max_distance: 允許的最大漢明距離（預設使用設定值）
+
+    Returns:
+        int: 新標記的重複文章數量
+    """
+    if max_distance is None:
+        max_distance = settings.DEDUP_SIMHASH_MAX_DISTANCE
+
+    rows = [a for a in articles if a.get('content_simhash') is not None]
+    if not rows:
+        return 0
+
+    band_columns = [getattr(Article, f'simhash_band_{i}') for i in range(SIMHASH_BANDS)]
+    band_filters = [
+        column.in_({row[f'simhash_band_{i}'] for row in rows})
+        for i, column in enumerate(band_columns)
+    ]
+
+    try:
+        candidates = session.query(Article.id, Article.url, Article.content_simhash, *band_columns, Article.published_at)\
+            .filter(Article.duplicate_of_id.is_(None))\
+            .filter(or_(*band_filters))\
+            .order_by(Article.id)\
+            .all()
+
+        # 依分段值建立候選索引，只比對至少有一段相同的文章
+        buckets: List[Dict[int, List[Any]]] = [{} for _ in range(SIMHASH_BANDS)]
+        for candidate in candidates:
+            for i in range(SIMHASH_BANDS):
+                buckets[i].setdefault(candidate[3 + i], []).append(candidate)
+
+        batch_urls = {row['url'] for row in rows}
+        published = {candidate.id: candidate.published_at for candidate in candidates}
+        duplicates: Dict[int, int] = {}
+        for candidate in candidates:
+            if candidate.url not in batch_urls:
+                continue
+            earlier = {
+                other.id: other.content_simhash
+                for i in range(SIMHASH_BANDS)
+                for other in buckets[i].get(candidate[3 + i], [])
+                if other.id < candidate.id
+            }
+            matches = find_near_duplicates(candidate.content_simhash, earlier.items(), max_distance)
+            if matches:
+                # 原始文章本身也可能在同一批被標記為重複
+                original_id = matches[0]
+                duplicates[candidate.id] = duplicates.get(original_id, original_id)
+
+        if not duplicates:
+            return 0
+
+        # 主鍵包含分割鍵 published_at
+        changes = []
+        for article_id, original_id in duplicates.items():
+            change = {'id': article_id, 'published_at': published[article_id], 'duplicate_of_id': original_id}
+            if settings.DEDUP_DROP_DUPLICATE_CONTENT:
+                change['content'] = None
+            changes.append(change)
+
+        session.bulk_update_mappings(Article, changes)
+        session.commit()
+        logger.info(f"Flagged {len(changes)} near-duplicate articles")
+        return len(changes)
+
+    except Exception as e:
+        logger.error(f"Error flagging near-duplicate articles: {str(e)}")
+        session.rollback()
+        return 0
+
+
+def find_title_duplicates(
+    session: Session,
+    articles: Iterable[Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    依標題指紋找出已儲存的同標題文章（不同 URL）
+
+    用於在抓取內文前略過其他媒體轉載的相同文章。
+
+    Args:
+        session: 資料庫 session
+        articles: 列表頁的文章資訊（需包含 url 與 title）
+
+    Returns:
+        dict: {列表頁 URL: 原始文章資訊}
+    """
+    by_fingerprint: Dict[int, List[str]] = {}
+    for article in articles:
+        fingerprint = title_fingerprint(article.get('title'))
+        if fingerprint is not None and article.get('url'):
+            by_fingerprint.setdefault(fingerprint, []).append(article['url'])
+    if not by_fingerprint:
+        return {}
+
+    originals = session.query(
+        Article.id, Article.url, Article.title_fingerprint, Article.published_at,
+        Article.description, Article.image_url
+    )\
+        .filter(Article.title_fingerprint.in_(list(by_fingerprint)))\
+        .filter(Article.duplicate_of_id.is_(None))\
+        .filter(Article.content.isnot(None))\
+        .order_by(Article.id)\
+        .all()
+
+    matches: Dict[str, Dict[str, Any]] = {}
+    for original in originals:
+        for url in by_fingerprint.get(original.title_fingerprint, []):
+            # 同一個 URL 照常重新抓取
+            if url == original.url or url in matches:
+                continue
+            matches[url] = {
+                'id': original.id,
+                'url': original.url,
+                'published_at': original.published_at,
+                'description': original.description,
+                'image_url': original.image_url,
+            }
+    return matches
+
+
 def bulk_insert_articles(
     session: Session,
     articles: List[Dict[str, Any]],
     batch_size: int = 100
 ) -> int:
     """
-    批次插入文章（僅插入，不更新）
-    適用於確定不會有重複的情況
+    批次插入文章（僅插入，不更新已存在的網址）
+    以 COPY 載入，適用於大量回補
 
     Args:
         session: 資料庫 session
         articles: 文章資料列表
-        batch_size: 每批次處理的數量
+        batch_size: 保留參數（COPY 以 COPY_CHUNK_ROWS 分段）
 
     Returns:
         int: 插入的文章數量
     """
-    inserted_count = 0
+    from app.core.bulk_load import copy_upsert_articles
 
-    for i in range(0, len(articles), batch_size):
-        batch = articles[i:i + batch_size]
+    inserted_count, _, _ = copy_upsert_articles(session, articles, update_existing=False)
+    return inserted_count
 
-        try:
-            # 使用 bulk_insert_mappings 進行批次插入
-            session.bulk_insert_mappings(Article, batch)
-            session.commit()
-            inserted_count += len(batch)
-            logger.info(f"Batch {i//batch_size + 1}: Inserted {len(batch)} articles")
-        except Exception as e:
-            logger.error(f"Error in batch insert: {str(e)}")
-            session.rollback()
-            # 如果批次失敗，嘗試逐個插入
-            for article_data in batch:
-                try:
-                    article = Article(**article_data)
-                    session.add(article)
-                    session.commit()
-                    inserted_count += 1
-                except Exception as e:
-                    logger.error(f"Error inserting article {article_data.get('url', 'unknown')}: {str(e)}")
-                    session.rollback()
-                    continue
 
-    return inserted_count
+def recrawl_interval(published_at: datetime, now: Optional[datetime] = None) -> Optional[timedelta]:
+    """
+    依文章發布後經過的時間決定下次檢查的間隔
+
+    RECRAWL_SCHEDULE_HOURS 為 [文章年齡上限, 檢查間隔]（小時）的列表，超過最後一個上限時回傳 None（不再檢查）
+    """
+    if published_at is None:
+        return None
+    age_hours = ((now or datetime.now()) - published_at).total_seconds() / 3600
+    for max_age, interval in settings.RECRAWL_SCHEDULE_HOURS:
+        if age_hours < max_age:
+            return timedelta(hours=interval)
+    return None
 
 
-def cleanup_old_articles(
+def enqueue_recrawl(session: Session, urls: List[str], now: Optional[datetime] = None) -> int:
+    """
+    將剛寫入的文章加入重新爬取佇列（已在佇列中的不重複加入）
+
+    Returns:
+        int: 加入的文章數量
+    """
+    if not urls:
+        return 0
+    now = now or datetime.now()
+
+    rows = session.query(Article.id, Article.url, Article.source, Article.published_at)\
+        .filter(Article.url.in_(urls))\
+        .filter(Article.duplicate_of_id.is_(None))\
+        .filter(Article.content.isnot(None))\
+        .all()
+
+    entries = []
+    for row in rows:
+        interval = recrawl_interval(row.published_at, now)
+        if interval is None:
+            continue
+        entries.append({
+            'article_id': row.id,
+            'url': row.url,
+            'source': row.source,
+            'published_at': row.published_at,
+            'next_check_at': now + interval,
+            'check_count': 0,
+            'change_count': 0,
+        })
+    if not entries:
+        return 0
+
+    stmt = pg_insert(RecrawlEntry).values(entries).on_conflict_do_nothing(index_elements=['article_id'])
+    session.execute(stmt)
+    session.commit()
+    return len(entries)
+
+
+def find_published_dates(
     session: Session,
-    days: int = 365
+    urls: Iterable[str]
+) -> Dict[str, Any]:
+    """
+    查詢已儲存文章的發布時間
+
+    Args:
+        session: 資料庫 session
+        urls: 文章網址
+
+    Returns:
+        dict: {網址: 發布時間}
+    """
+    urls = list(set(urls))
+    if not urls:
+        return {}
+    rows = session.query(Article.url, Article.published_at)\
+        .filter(Article.url.in_(urls))\
+        .all()
+    return {row.url: row.published_at for row in rows}
+
+
+def reclean_articles(
+    session: Session,
+    source: Optional[str] = None,
+    batch_size: int = 500
 ) -> int:
     """
-    清理舊文章
+    以目前的清理規則重新處理已儲存的文章內容
+    只更新內容有變動的文章
 
     Args:
         session: 資料庫 session
-        days: 保留最近幾天的文章
+        source: 只處理指定來源（None 表示全部）
+        batch_size: 每批次處理的數量
 
     Returns:
-        int: 刪除的文章數量
+        int: 更新的文章數量
     """
-    from datetime import datetime, timedelta
+    from app.services.crawler.content_cleaner import get_source_cleaner
 
-    cutoff_date = datetime.now() - timedelta(days=days)
+    updated_count = 0
+    last_id = 0
 
+    while True:
+        query = session.query(Article.id, Article.published_at, Article.source, Article.title, Article.content)\
+            .filter(Article.id > last_id)
+        if source:
+            query = query.filter(Article.source == source)
+        rows = query.order_by(Article.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        # 依來源分組，每個來源使用各自的清理器批次處理
+        by_source: Dict[str, List[Any]] = {}
+        for row in rows:
+            by_source.setdefault(row.source, []).append(row)
+
+        changes = []
+        for source_name, source_rows in by_source.items():
+            cleaner = get_source_cleaner(source_name)
+            cleaned = cleaner.clean_many(row.content for row in source_rows)
+            for row, content in zip(source_rows, cleaned):
+                if row.content and content != row.content:
+                    description = content[:200] + '...' if len(content) > 200 else content
+                    # 內容改變時一併更新指紋與搜尋向量（與重新爬取相同）
+                    changes.append({
+                        'id': row.id,
+                        'published_at': row.published_at,
+                        'content': content,
+                        'description': description,
+                        **article_fingerprints(row.title, content),
+                    })
+
+        if changes:
+            session.bulk_update_mappings(Article, changes)
+            session.commit()
+            updated_count += len(changes)
+
+        last_id = rows[-1].id
+        logger.info(f"Recleaned up to article {last_id}: {len(changes)} updated in this batch")
+
+    return updated_count
+
+
+# 列表顯示的欄位（不含內文與搜尋向量）
+ARTICLE_LIST_COLUMNS = (
+    'id', 'url', 'source', 'category', 'reporter', 'title',
+    'description', 'image_url', 'published_at', 'duplicate_of_id',
+)
+
+
+def article_list_options(excerpt_length: Optional[int] = None) -> list:
+    """
+    文章列表的載入選項：只選取列表顯示的欄位
+
+    其他欄位在列表中存取時直接報錯（非同步 session 不能延遲載入，也避免逐筆查詢）。
+
+    Args:
+        excerpt_length: 同時載入沒有摘要的文章的內文開頭（Article.excerpt），
+            只有缺少摘要的文章會讀取內文
+    """
+    options = [load_only(*(getattr(Article, name) for name in ARTICLE_LIST_COLUMNS), raiseload=True)]
+    if excerpt_length:
+        excerpt = case((Article.description.is_(None), func.left(Article.content, excerpt_length)))
+        options.append(with_expression(Article.excerpt, excerpt))
+    return options
+
+
+def article_search(keyword: Optional[str]):
+    """
+    全文搜尋條件（使用 search_vector 的 GIN 索引）
+
+    Args:
+        keyword: 搜尋關鍵字（以空白分隔的多個關鍵字須全部符合）
+
+    Returns:
+        tuple: (WHERE 條件, 排序分數)；關鍵字沒有可搜尋的內容時回傳 None
+    """
+    query = search_query(keyword)
+    if query is None:
+        return None
+    tsquery = cast(literal(query, Text), TSQUERY)
+    return Article.search_vector.op('@@')(tsquery), func.ts_rank(Article.search_vector, tsquery)
+
+
+def backfill_search_vectors(session: Session, batch_size: int = 500) -> int:
+    """
+    為尚未建立搜尋向量的文章補上 search_vector
+
+    Returns:
+        int: 更新的文章數量
+    """
+    updated_count = 0
+    last_id = 0
+
+    while True:
+        rows = session.query(Article.id, Article.published_at, Article.title, Article.content)\
+            .filter(Article.id > last_id)\
+            .filter(Article.search_vector.is_(None))\
+            .order_by(Article.id)\
+            .limit(batch_size)\
+            .all()
+        if not rows:
+            break
+
+        changes = [
+            {'id': row.id, 'published_at': row.published_at, 'search_vector': vector}
+            for row in rows
+            if (vector := search_vector(row.title, row.content)) is not None
+        ]
+        if changes:
+            session.bulk_update_mappings(Article, changes)
+            session.commit()
+            updated_count += len(changes)
+
+        last_id = rows[-1].id
+
+    if updated_count:
+        logger.info(f"Backfilled search vectors for {updated_count} articles")
+    return updated_count
+
+
+def cleanup_old_articles(session: Session) -> int:
+    """
+    清理超過保留期間（RETENTION_MONTHS）的文章
+
+    articles 依月份分割，整個移除過期的分割（不需要逐列 DELETE）。
+
+    Args:
+        session: 資料庫 session
+
+    Returns:
+        int: 刪除的文章數量（依數量統計表）
+    """
     try:
-        result = session.query(Article).filter(
-            Article.published_at < cutoff_date
-        ).delete()
+        removed = session.scalar(
+            select(func.coalesce(func.sum(ArticleCount.article_count), 0))
+            .where(ArticleCount.day < retention_start())
+        )
+        partitions = drop_expired_partitions(session.connection())
         session.commit()
-        logger.info(f"Cleaned up {result} articles older than {days} days")
-        return result
+        if not partitions:
+            return 0
+        logger.info(f"Cleaned up {removed} articles in {len(partitions)} expired partitions")
+        return removed
     except Exception as e:
         logger.error(f"Error cleaning up old articles: {str(e)}")
         session.rollback()
@@ -0,0 +1,200 @@
+"""
+文章寫入器
+所有爬蟲透過佇列把文章交給單一寫入執行緒，合併成大批次後以同一個資料庫連線寫入
+
+有暫存區（spool）時文章先寫入本機檔案，寫入執行緒再從暫存區批次寫入資料庫，
+資料庫無法使用時保留在暫存區，稍後重試。
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.bulk_load import copy_upsert_articles
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.db_utils import batch_upsert_articles
+from app.core.spool import ArticleSpool, get_spool
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ArticleWriter:
+    """
+    單一寫入者的文章寫入器
+
+    - 爬蟲呼叫 submit() 送出文章，不需要自己開啟 session
+    - 寫入執行緒累積到 batch_size 筆或等待 flush_interval 秒後一次寫入
+    - 整個寫入器只使用一個資料庫連線
+    - 有 spool 時 submit() 寫入暫存區後即完成，寫入資料庫失敗時每 flush_interval 秒重試
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        spool: Optional[ArticleSpool] = None
+    ):
+        self.batch_size = batch_size or settings.DB_WRITER_BATCH_SIZE
+        self.flush_interval = settings.DB_WRITER_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self.session_factory = session_factory
+        self.spool = spool
+        self.written = 0
+        # 暫存區中可能還有上次未寫入的文章
+        self._backlog = spool is not None
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'ArticleWriter':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='article-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, articles: List[Dict[str, Any]]) -> Future:
+        """
+        送出要寫入的文章
+
+        Returns:
+            Future: 文章寫入並提交後完成（有 spool 時寫入暫存區後即完成），結果為文章數量
+        """
+        future: Future = Future()
+        if not articles:
+            future.set_result(0)
+            return future
+        if self._thread is None:
+            raise RuntimeError("ArticleWriter 尚未啟動")
+        if self.spool is not None:
+            self.spool.append(articles)
+            future.set_result(len(articles))
+        self._queue.put((list(articles), future))
+        return future
+
+    def close(self) -> None:
+        """寫入所有已送出的文章後結束寫入執行緒"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'ArticleWriter':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        session = self.session_factory()
+        try:
+            stopping = False
+            while not stopping:
+                try:
+                    # 暫存區有未寫入的文章時定期重試
+                    item = self._queue.get(timeout=self.flush_interval if self._backlog else None)
+                except queue.Empty:
+                    self._flush(session, [])
+                    continue
+                if item is _STOP:
+                    break
+
+                pending = [item]
+                count = len(item[0])
+                flush_at = time.monotonic() + self.flush_interval
+                # 合併其他爬蟲送出的文章，直到批次大小或等待時間上限
+                while count < self.batch_size:
+                    timeout = flush_at - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    pending.append(item)
+                    count += len(item[0])
+
+                self._flush(session, pending)
+
+            if self.spool is not None:
+                # 關閉目前的暫存檔後再寫入一次，已全部寫入的暫存檔才能刪除
+                self.spool.close()
+                self._flush(session, [])
+        finally:
+            session.close()
+            if self.spool is not None:
+                self.spool.close()
+
+    def _flush(self, session: Session, pending: List[Tuple[List[Dict[str, Any]], Future]]) -> None:
+        if self.spool is not None:
+            self._drain_spool(session)
+            return
+
+        articles = [article for batch, _ in pending for article in batch]
+        try:
+            inserted, updated = batch_upsert_articles(session, articles, batch_size=len(articles))
+        except Exception as e:
+            logger.error(f"批次寫入 {len(articles)} 篇文章失敗: {str(e)}")
+            session.rollback()
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        self.written += len(articles)
+        logger.info(f"寫入 {len(pending)} 批共 {len(articles)} 篇文章（新增: {inserted}，更新: {updated}）")
+        for batch, future in pending:
+            future.set_result(len(batch))
+
+    def _drain_spool(self, session: Session) -> None:
+        try:
+            drained = self.spool.drain(
+                lambda articles: batch_upsert_articles(session, articles, batch_size=len(articles)),
+                self.batch_size
+            )
+        except Exception as e:
+            logger.error(f"從暫存區寫入資料庫失敗，{self.flush_interval} 秒後重試: {str(e)}")
+            session.rollback()
+            self._backlog = True
+            return
+
+        self._backlog = False
+        if drained:
+            self.written += drained
+            logger.info(f"從暫存區寫入 {drained} 篇文章")
+
+
+def drain_spool(spool: Optional[ArticleSpool] = None) -> int:
+    """
+    將暫存區中的文章寫入資料庫（排程與啟動時呼叫，補寫先前失敗的文章）
+
+    Returns:
+        int: 寫入的文章數量
+    """
+    spool = spool or get_spool()
+    if spool is None:
+        return 0
+
+    session = SessionLocal()
+    try:
+        # 累積的文章可能很多，以 COPY 載入
+        drained = spool.drain(
+            lambda articles: copy_upsert_articles(session, articles),
+            settings.COPY_CHUNK_ROWS
+        )
+        if drained:
+            logger.info(f"從暫存區寫入 {drained} 篇文章")
+        return drained
+    except Exception as e:
+        logger.error(f"從暫存區寫入資料庫失敗: {str(e)}")
+        session.rollback()
+        return 0
+    finally:
+        session.close()
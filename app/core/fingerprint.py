@@ -0,0 +1,143 @@
+"""
+文章指紋工具
+用於偵測不同媒體轉載的近似重複文章
+"""
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.search import search_vector
+
+# SimHash 位元數與分段設定：64 位元切成 4 段，每段 16 位元
+# 漢明距離 <= 3 的兩個指紋至少有一段完全相同（鴿籠原理）
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+
+# 日文沒有空白斷詞，以字元 n-gram 作為 shingle
+SHINGLE_SIZE = 3
+
+# 正規化時移除的空白與標點符號
+_STRIP_RE = re.compile(r'[\s　、。，．・「」『』（）()\[\]【】〈〉《》!！?？:：;；"\'“”‘’…\-―ー〜~]+')
+
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """正規化文字（NFKC、全半形統一、小寫、移除空白與標點）"""
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFKC', text).lower()
+    return _STRIP_RE.sub('', text)
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def to_signed64(value: int) -> int:
+    """將無號 64 位元整數轉為 PostgreSQL BIGINT 可存放的有號整數"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def simhash(text: Optional[str]) -> Optional[int]:
+    """
+    計算內容的 SimHash 指紋
+
+    Returns:
+        有號 64 位元整數，內容過短時回傳 None
+    """
+    normalized = normalize_text(text)
+    if len(normalized) < SHINGLE_SIZE:
+        return None
+
+    shingles = Counter(
+        normalized[i:i + SHINGLE_SIZE]
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    )
+    hashes = np.fromiter((_hash64(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+
+    # 每個位元依 shingle 權重投票
+    bits = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).astype(np.int64)
+    votes = weights @ (bits * 2 - 1)
+
+    fingerprint = 0
+    for position in np.flatnonzero(votes > 0):
+        fingerprint |= 1 << int(position)
+    return to_signed64(fingerprint)
+
+
+def simhash_bands(fingerprint: Optional[int]) -> Tuple[Optional[int], ...]:
+    """將指紋切成 LSH 分段（每段 16 位元）"""
+    if fingerprint is None:
+        return (None,) * SIMHASH_BANDS
+    value = to_unsigned64(fingerprint)
+    mask = (1 << BAND_BITS) - 1
+    return tuple((value >> (i * BAND_BITS)) & mask for i in range(SIMHASH_BANDS))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(to_unsigned64(a) ^ to_unsigned64(b)).count('1')
+
+
+def title_fingerprint(title: Optional[str]) -> Optional[int]:
+    """標題指紋（正規化後的雜湊），用於在抓取內文前比對已知的重複文章"""
+    normalized = normalize_text(title)
+    if not normalized:
+        return None
+    return to_signed64(_hash64(normalized))
+
+
+def content_hash(title: Optional[str], content: Optional[str]) -> Optional[str]:
+    """標題與內文的雜湊（未正規化），用於判斷文章是否被修改"""
+    if not content:
+        return None
+    value = f"{title or ''}\x00{content}"
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def article_fingerprints(title: Optional[str], content: Optional[str]) -> dict:
+    """計算文章的所有指紋欄位（含全文搜尋向量）"""
+    content_simhash = simhash(content)
+    bands = simhash_bands(content_simhash)
+    fields = {
+        'title_fingerprint': title_fingerprint(title),
+        'content_simhash': content_simhash,
+        'content_hash': content_hash(title, content),
+        'search_vector': search_vector(title, content),
+    }
+    for i, band in enumerate(bands):
+        fields[f'simhash_band_{i}'] = band
+    return fields
+
+
+def find_near_duplicates(
+    fingerprint: int,
+    candidates: Iterable[Tuple[int, int]],
+    max_distance: int
+) -> List[int]:
+    """
+    從候選文章中找出近似重複
+
+    Args:
+        fingerprint: 目標文章的 SimHash
+        candidates: (文章 id, SimHash) 列表
+        max_distance: 允許的最大漢明距離
+
+    Returns:
+        list: 符合的文章 id（依 id 排序）
+    """
+    return sorted(
+        article_id
+        for article_id, other in candidates
+        if other is not None and hamming_distance(fingerprint, other) <= max_distance
+    )
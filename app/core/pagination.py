@@ -0,0 +1,87 @@
+"""
+文章列表的 keyset 分頁
+以 (published_at DESC, id DESC) 排序，用上一頁最後一篇文章的位置作為游標，
+任何一頁都只需從索引讀取一頁的資料（OFFSET 需要掃過並丟棄前面所有的列）
+"""
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+
+from app.models.article import Article
+
+_SORT_KEY = tuple_(Article.published_at, Article.id)
+
+
+def encode_cursor(article: Any) -> str:
+    """將文章的排序位置編碼為游標"""
+    value = f"{article.published_at.isoformat()}|{article.id}"
+    return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    解碼游標
+
+    Raises:
+        ValueError: 游標格式不正確
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        published_at, article_id = value.rsplit('|', 1)
+        return datetime.fromisoformat(published_at), int(article_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"無效的分頁游標: {cursor}") from e
+
+
+def keyset_query(
+    query: Select,
+    limit: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None
+) -> Select:
+    """
+    加上 keyset 分頁條件（多取一筆，用來判斷是否還有下一頁）
+
+    Args:
+        query: 文章查詢（不含排序）
+        limit: 每頁數量
+        after: 下一頁游標（取這篇文章之後的文章）
+        before: 上一頁游標（取這篇文章之前的文章）；同時指定時以 before 為準
+
+    Raises:
+        ValueError: 游標格式不正確
+    """
+    if before:
+        # 反向讀取，paginate() 再轉回新到舊的順序
+        return query.where(_SORT_KEY > tuple_(*decode_cursor(before)))\
+            .order_by(Article.published_at.asc(), Article.id.asc())\
+            .limit(limit + 1)
+    if after:
+        query = query.where(_SORT_KEY < tuple_(*decode_cursor(after)))
+    return query.order_by(Article.published_at.desc(), Article.id.desc()).limit(limit + 1)
+
+
+def paginate(
+    rows: Sequence[Any],
+    limit: int,
+    after: Optional[str] = None,
+    before: Optional[str] = None
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    整理 keyset_query 的查詢結果
+
+    Returns:
+        tuple: (本頁文章, 下一頁游標, 上一頁游標)；沒有下一頁或上一頁時為 None
+    """
+    has_more = len(rows) > limit
+    items = list(rows[:limit])
+    if before:
+        items.reverse()
+        next_cursor = encode_cursor(items[-1]) if items else None
+        previous_cursor = encode_cursor(items[0]) if items and has_more else None
+    else:
+        next_cursor = encode_cursor(items[-1]) if has_more else None
+        previous_cursor = encode_cursor(items[0]) if items and after else None
+    return items, next_cursor, previous_cursor
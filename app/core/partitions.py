@@ -0,0 +1,207 @@
+"""
+articles 的月份分割
+articles 依 published_at 以月份做範圍分割：
+- 保留期間（RETENTION_MONTHS）到未來 PARTITION_AHEAD_MONTHS 個月的分割預先建立
+- 過期的分割整個卸離並刪除（不需要大量 DELETE），或改名保留為獨立資料表
+- 寫入保留期間以外的文章（回補）時自動建立所需的分割
+"""
+import logging
+import re
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = 'articles_p'
+_PARTITION_RE = re.compile(rf'^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$')
+
+# 已確認存在的分割（每個 Process 各自快取，減少查詢系統目錄）
+_known_partitions: Set[date] = set()
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def detached_name(month: date, now: Optional[datetime] = None) -> str:
+    """卸離後保留的資料表名稱（加上卸離時間，不會與之後重新建立的分割衝突）"""
+    return f"{partition_name(month)}_detached_{now or datetime.now():%Y%m%d%H%M%S}"
+
+
+def retention_start(now: Optional[datetime] = None) -> date:
+    """保留的第一個月份（更早的分割會被移除）"""
+    return add_months(month_start(now or datetime.now()), -settings.RETENTION_MONTHS)
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('articles')")
+    ).scalar() or False
+
+
+def existing_partitions(conn: Connection) -> List[date]:
+    """已建立的月份分割（依月份排序）"""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'articles'::regclass"
+    )).scalars()
+    months = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_partition(conn: Connection, month: date) -> None:
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF articles "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    _known_partitions.add(month)
+
+
+def ensure_partitions(conn: Connection, now: Optional[datetime] = None) -> List[date]:
+    """
+    建立保留期間到未來 PARTITION_AHEAD_MONTHS 個月之間缺少的分割
+
+    Returns:
+        list: 新建立的月份
+    """
+    existing = set(existing_partitions(conn))
+    _known_partitions.update(existing)
+    month = retention_start(now)
+    last = add_months(month_start(now or datetime.now()), settings.PARTITION_AHEAD_MONTHS)
+    created = []
+    while month <= last:
+        if month not in existing:
+            create_partition(conn, month)
+            created.append(month)
+        month = add_months(month, 1)
+    if created:
+        logger.info(f"已建立文章分割: {', '.join(partition_name(m) for m in created)}")
+    return created
+
+
+def ensure_partitions_for(session: Session, published_dates: Iterable[Optional[datetime]]) -> None:
+    """
+    寫入前確認文章發布月份的分割存在（回補較舊的文章時）
+
+    在呼叫端的交易中建立並提交，避免另開連線時被自己的交易持有的鎖擋住。
+    """
+    months = {month_start(value) for value in published_dates if value is not None}
+    missing = months - _known_partitions
+    if not missing:
+        return
+
+    conn = session.connection()
+    existing = set(existing_partitions(conn))
+    _known_partitions.update(existing)
+    missing -= existing
+    for month in sorted(missing):
+        create_partition(conn, month)
+        logger.info(f"已建立文章分割: {partition_name(month)}")
+    if missing:
+        session.commit()
+
+
+def drop_expired_partitions(conn: Connection, now: Optional[datetime] = None) -> List[str]:
+    """
+    移除早於保留期間的分割
+
+    分割先卸離再刪除（RETENTION_KEEP_DETACHED 時改名為 articles_pYYYYMM_detached_<卸離時間> 保留），
+    並清除網址登記表與統計中對應的資料（移除分割不會觸發 DELETE 觸發器）。
+
+    Returns:
+        list: 移除的分割名稱
+    """
+    cutoff = retention_start(now)
+    removed = []
+    for month in existing_partitions(conn):
+        if month >= cutoff:
+            break
+        name = partition_name(month)
+        bounds = {'start': month, 'end': add_months(month, 1)}
+        conn.execute(text(f"ALTER TABLE articles DETACH PARTITION {name}"))
+        conn.execute(text("DELETE FROM article_urls WHERE published_at >= :start AND published_at < :end"), bounds)
+        conn.execute(text("DELETE FROM article_counts WHERE day >= :start AND day < :end"), bounds)
+        conn.execute(text("DELETE FROM article_daily_stats WHERE day >= :start AND day < :end"), bounds)
+        if settings.RETENTION_KEEP_DETACHED:
+            # 改名，之後回補同一個月份時才能建立新的分割
+            conn.execute(text(f"ALTER TABLE {name} RENAME TO {detached_name(month)}"))
+        else:
+            conn.execute(text(f"DROP TABLE {name}"))
+        _known_partitions.discard(month)
+        removed.append(name)
+
+    if removed:
+        action = '卸離' if settings.RETENTION_KEEP_DETACHED else '刪除'
+        logger.info(f"已{action}過期的文章分割: {', '.join(removed)}")
+    return removed
+
+
+def partition_articles(conn: Connection) -> None:
+    """
+    將既有的 articles 轉換為分割資料表（只執行一次，在同一個交易中完成）
+
+    舊資料表改名後建立新的分割資料表，複製資料後刪除舊資料表；id 沿用原值。
+    """
+    old = 'articles_unpartitioned'
+    logger.info("將 articles 轉換為月份分割資料表...")
+    conn.execute(text("LOCK TABLE articles IN ACCESS EXCLUSIVE MODE"))
+    conn.execute(text(f"ALTER TABLE articles RENAME TO {old}"))
+    sequence = conn.execute(text(f"SELECT pg_get_serial_sequence('{old}', 'id')")).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {old}_id_seq"))
+
+    # 索引與約束的名稱會和新資料表衝突
+    for name in conn.execute(text(
+        f"SELECT conname FROM pg_constraint WHERE conrelid = '{old}'::regclass AND contype IN ('p', 'u')"
+    )).scalars().all():
+        conn.execute(text(f'ALTER TABLE {old} DROP CONSTRAINT "{name}"'))
+    for name in conn.execute(text(
+        f"SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = '{old}'::regclass"
+    )).scalars().all():
+        conn.execute(text(f"DROP INDEX {name}"))
+
+    Article.__table__.create(conn)
+    for (month,) in conn.execute(text(f"SELECT DISTINCT date_trunc('month', published_at) FROM {old}")):
+        create_partition(conn, month.date())
+    ensure_partitions(conn)
+
+    columns = ', '.join(column.name for column in Article.__table__.columns)
+    count = conn.execute(text(f"INSERT INTO articles ({columns}) SELECT {columns} FROM {old}")).rowcount
+    conn.execute(text(
+        "SELECT setval(pg_get_serial_sequence('articles', 'id'), max(id)) FROM articles HAVING max(id) IS NOT NULL"
+    ))
+    conn.execute(text(f"DROP TABLE {old}"))
+    logger.info(f"articles 已轉換為分割資料表（{count} 篇文章）")
+
+
+def maintain_partitions() -> None:
+    """建立未來的分割並移除過期的分割（由排程器呼叫）"""
+    from app.core.database import engine
+
+    try:
+        with engine.begin() as conn:
+            ensure_partitions(conn)
+        with engine.begin() as conn:
+            drop_expired_partitions(conn)
+    except Exception as e:
+        logger.exception(f"維護文章分割失敗: {str(e)}")
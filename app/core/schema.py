@@ -0,0 +1,181 @@
+"""
+資料庫結構維護
+create_all 只會建立不存在的資料表，既有的 articles 表需要在這裡補上新增的欄位與索引，
+並轉換為月份分割資料表（見 app/core/partitions.py）
+"""
+import logging
+from typing import List, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from app.core.partitions import ensure_partitions, is_partitioned, partition_articles
+from app.models.article import Article
+from app.models.article_url import ArticleUrl  # noqa: F401  確保 create_all 會建立 article_urls
+from app.core.stats import rebuild_daily_stats
+from app.models.article_count import ArticleCount  # noqa: F401  確保 create_all 會建立 article_counts
+from app.models.article_stats import ArticleDailyStats  # noqa: F401  確保 create_all 會建立 article_daily_stats
+from app.models.recrawl import RecrawlEntry  # noqa: F401  確保 create_all 會建立 recrawl_queue
+
+logger = logging.getLogger(__name__)
+
+# 後續版本新增的 articles 欄位（欄位名稱, 型別）
+ARTICLE_COLUMNS: List[Tuple[str, str]] = [
+    ('title_fingerprint', 'BIGINT'),
+    ('content_simhash', 'BIGINT'),
+    ('simhash_band_0', 'INTEGER'),
+    ('simhash_band_1', 'INTEGER'),
+    ('simhash_band_2', 'INTEGER'),
+    ('simhash_band_3', 'INTEGER'),
+    ('duplicate_of_id', 'INTEGER'),
+    ('content_hash', 'VARCHAR(32)'),
+    ('search_vector', 'TSVECTOR'),
+]
+
+
+# article_counts 的增減量：每列文章貢獻 (+1/-1, 是否為重複文章)
+_COUNT_ROWS = """
+    SELECT source, COALESCE(category, '') AS category, published_at::date AS day,
+           {sign} AS n, {sign} * (duplicate_of_id IS NOT NULL)::int AS d
+    FROM {table}
+"""
+
+# 依來源、分類、日期彙總後寫入（依主鍵排序，並行的交易以相同順序鎖定，避免死結）
+_COUNT_UPSERT = """
+    INSERT INTO article_counts AS c (source, category, day, article_count, duplicate_count)
+    SELECT source, category, day, sum(n), sum(d)
+    FROM ({rows}) AS changes
+    GROUP BY source, category, day
+    HAVING sum(n) <> 0 OR sum(d) <> 0
+    ORDER BY source, category, day
+    ON CONFLICT (source, category, day) DO UPDATE SET
+        article_count = c.article_count + excluded.article_count,
+        duplicate_count = c.duplicate_count + excluded.duplicate_count;
+"""
+
+# 陳述式層級觸發器：每個 INSERT/UPDATE/DELETE 陳述式只彙總一次（批次寫入不會逐列更新計數）
+COUNTER_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION article_counts_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_COUNT_UPSERT.format(rows=_COUNT_ROWS.format(sign=1, table='new_rows'))}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_COUNT_UPSERT.format(rows=_COUNT_ROWS.format(sign=-1, table='old_rows'))}
+    ELSE
+        {_COUNT_UPSERT.format(rows=_COUNT_ROWS.format(sign=1, table='new_rows')
+                              + ' UNION ALL ' + _COUNT_ROWS.format(sign=-1, table='old_rows'))}
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+COUNTER_TRIGGERS = [
+    ('article_counts_insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('article_counts_update', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('article_counts_delete', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+# 分割資料表的唯一索引必須包含分割鍵，網址的唯一性改由 article_urls 登記表保證：
+# 登記表的主鍵衝突會讓寫入 articles 的陳述式失敗
+URL_REGISTRY_FUNCTION = """
+CREATE OR REPLACE FUNCTION article_urls_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO article_urls (url, published_at)
+        SELECT url, published_at FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM article_urls u USING old_rows o WHERE u.url = o.url;
+    ELSE
+        UPDATE article_urls u SET url = n.url, published_at = n.published_at
+        FROM old_rows o JOIN new_rows n ON n.id = o.id
+        WHERE u.url = o.url AND (n.url <> o.url OR n.published_at <> o.published_at);
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+URL_REGISTRY_TRIGGERS = [
+    ('article_urls_insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('article_urls_update', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('article_urls_delete', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+def rebuild_article_counts(conn: Connection) -> None:
+    """從 articles 重新計算 article_counts"""
+    conn.execute(text("DELETE FROM article_counts"))
+    conn.execute(text(_COUNT_UPSERT.format(rows=_COUNT_ROWS.format(sign=1, table='articles'))))
+
+
+def _install_triggers(
+    conn: Connection,
+    procedure: str,
+    function: str,
+    triggers: List[Tuple[str, str, str]]
+) -> bool:
+    """
+    建立 articles 上的陳述式層級觸發器
+
+    Returns:
+        bool: 是否為新建立（已存在時不做任何事）
+    """
+    conn.execute(text(function))
+    installed = conn.execute(
+        text("SELECT count(*) FROM pg_trigger WHERE tgname = :name AND tgrelid = 'articles'::regclass"),
+        {'name': triggers[0][0]}
+    ).scalar()
+    if installed:
+        return False
+
+    # 建立觸發器與計算初始值之間不能有其他寫入
+    conn.execute(text("LOCK TABLE articles IN SHARE ROW EXCLUSIVE MODE"))
+    for name, event, transition in triggers:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name} ON articles"))
+        conn.execute(text(
+            f"CREATE TRIGGER {name} AFTER {event} ON articles "
+            f"REFERENCING {transition} FOR EACH STATEMENT EXECUTE FUNCTION {procedure}()"
+        ))
+    return True
+
+
+def _ensure_url_registry(conn: Connection) -> None:
+    if _install_triggers(conn, 'article_urls_apply', URL_REGISTRY_FUNCTION, URL_REGISTRY_TRIGGERS):
+        conn.execute(text("DELETE FROM article_urls"))
+        conn.execute(text("INSERT INTO article_urls (url, published_at) SELECT url, published_at FROM articles"))
+        logger.info("已建立文章網址登記表")
+
+
+def _ensure_counter_triggers(conn: Connection) -> None:
+    if _install_triggers(conn, 'article_counts_apply', COUNTER_FUNCTION, COUNTER_TRIGGERS):
+        rebuild_article_counts(conn)
+        logger.info("已建立文章數量統計")
+
+
+def _ensure_daily_stats(conn: Connection) -> None:
+    empty = conn.execute(text(
+        "SELECT NOT EXISTS (SELECT 1 FROM article_daily_stats) AND EXISTS (SELECT 1 FROM articles)"
+    )).scalar()
+    if empty:
+        rebuild_daily_stats(conn)
+        logger.info("已建立每日文章統計")
+
+
+def ensure_schema(engine: Engine) -> None:
+    """補上既有資料表缺少的欄位、索引與觸發器（可重複執行）"""
+    with engine.begin() as conn:
+        for name, column_type in ARTICLE_COLUMNS:
+            conn.execute(text(f"ALTER TABLE articles ADD COLUMN IF NOT EXISTS {name} {column_type}"))
+
+        if not is_partitioned(conn):
+            partition_articles(conn)
+        ensure_partitions(conn)
+
+        for index in Article.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+        _ensure_url_registry(conn)
+        _ensure_counter_triggers(conn)
+        _ensure_daily_stats(conn)
+
+    logger.info("資料庫結構檢查完成")
@@ -0,0 +1,86 @@
+"""
+日文全文搜尋工具
+日文沒有空白斷詞，將正規化後的文字切成字元 bigram，以帶位置的 tsvector 儲存並建立 GIN 索引；
+查詢時把關鍵字轉成相鄰 bigram 的片語查詢（'大谷' <-> '谷翔' <-> '翔平'），結果等同子字串比對
+
+tsvector 與 tsquery 都以字面格式產生，不經過 PostgreSQL 的文字解析器，不受資料庫 locale 影響。
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+# tsvector 的位置上限（超過的位置會被 PostgreSQL 壓成同一個值，片語查詢無法比對）
+MAX_POSITION = 16383
+# 每個詞彙最多保留的位置數（PostgreSQL 的上限）
+MAX_POSITIONS_PER_LEXEME = 256
+
+# 斷開詞段的空白與標點符號（保留長音符號「ー」，它是詞的一部分）
+_SPLIT_RE = re.compile(r'[\s、。，．・「」『』（）()\[\]【】〈〉《》!！?？:：;；"\'“”‘’…\-―〜~/／,.]+')
+
+
+def normalize_search_text(text: Optional[str]) -> str:
+    """正規化搜尋文字（NFKC 統一全半形、小寫）"""
+    if not text:
+        return ""
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def search_terms(text: Optional[str]) -> List[str]:
+    """將文字以空白與標點切成詞段"""
+    return [term for term in _SPLIT_RE.split(normalize_search_text(text)) if term]
+
+
+def _term_tokens(term: str) -> List[str]:
+    """
+    詞段的 token：相鄰兩字的 bigram，最後再加上詞段的最後一個字
+
+    最後一個字讓單字查詢（前綴比對 'x':*）也能找到出現在詞段結尾的字。
+    """
+    if len(term) == 1:
+        return [term]
+    return [term[i:i + 2] for i in range(len(term) - 1)] + [term[-1]]
+
+
+def _quote(lexeme: str) -> str:
+    return "'" + lexeme.replace('\\', '\\\\').replace("'", "''") + "'"
+
+
+def search_vector(title: Optional[str], content: Optional[str]) -> Optional[str]:
+    """
+    產生文章的搜尋向量（tsvector 字面格式）
+
+    標題的 token 權重為 A，內文為 D（ts_rank 排序時標題命中較高）。
+    詞段之間空出一個位置，片語查詢不會跨詞段比對。
+    """
+    positions: Dict[str, List[str]] = {}
+    position = 1
+    for weight, text in (('A', title), ('', content)):
+        for term in search_terms(text):
+            for token in _term_tokens(term):
+                if position > MAX_POSITION:
+                    break
+                entries = positions.setdefault(token, [])
+                if len(entries) < MAX_POSITIONS_PER_LEXEME:
+                    entries.append(f"{position}{weight}")
+                position += 1
+            position += 1
+
+    if not positions:
+        return None
+    return ' '.join(f"{_quote(token)}:{','.join(entries)}" for token, entries in positions.items())
+
+
+def search_query(keyword: Optional[str]) -> Optional[str]:
+    """
+    將關鍵字轉為 tsquery 字面格式（以空白分隔的多個關鍵字須全部符合）
+
+    Returns:
+        str: tsquery；關鍵字正規化後沒有內容時回傳 None
+    """
+    clauses = []
+    for term in search_terms(keyword):
+        if len(term) == 1:
+            clauses.append(f"{_quote(term)}:*")
+        else:
+            clauses.append('(' + ' <-> '.join(_quote(term[i:i + 2]) for i in range(len(term) - 1)) + ')')
+    return ' & '.join(clauses) or None
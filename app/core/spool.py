@@ -0,0 +1,229 @@
+"""
+爬蟲輸出暫存區（spool）
+爬到的文章先寫入本機的附加式檔案，再批次寫入資料庫；資料庫無法使用時不會遺失爬取結果
+
+檔案格式：每筆紀錄為 8 bytes 標頭（長度、CRC32）+ zlib 壓縮的 JSON 文章列表。
+每個 segment 旁的 .offset 檔記錄已寫入資料庫的位置，重新執行時從該位置繼續。
+"""
+import fcntl
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.article_record import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('>II')
+SEGMENT_SUFFIX = '.spool'
+OFFSET_SUFFIX = '.offset'
+DRAIN_LOCK = 'drain.lock'
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, ArticleRecord):
+        return value.to_params()
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"無法序列化 {type(value).__name__}")
+
+
+def _decode_hook(obj: Dict) -> Any:
+    if '__datetime__' in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def encode_record(articles: List[Dict[str, Any]]) -> bytes:
+    """將文章列表編碼為一筆紀錄（標頭 + 壓縮內容）"""
+    payload = zlib.compress(json.dumps(articles, ensure_ascii=False, default=_encode_default).encode('utf-8'))
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path: str, offset: int = 0) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    從指定位置讀取紀錄
+
+    Yields:
+        tuple: (此紀錄結束的位置, 文章列表)；遇到寫入到一半或損毀的紀錄時停止
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, crc = HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            offset += HEADER.size + length
+            yield offset, json.loads(zlib.decompress(payload).decode('utf-8'), object_hook=_decode_hook)
+
+
+class ArticleSpool:
+    """
+    附加式文章暫存區
+
+    - 每個 Process 寫入自己的 segment（寫入期間持有檔案鎖），超過 segment_bytes 時換新檔
+    - drain() 同時只會有一個 Process 執行，寫入資料庫成功後才更新 .offset
+    - 已全部寫入且沒有 Process 在寫的 segment 會被刪除
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        fsync: Optional[bool] = None
+    ):
+        self.directory = directory or settings.SPOOL_DIR
+        self.segment_bytes = segment_bytes or settings.SPOOL_SEGMENT_BYTES
+        self.fsync = settings.SPOOL_FSYNC if fsync is None else fsync
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = None
+        self._path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def append(self, articles: List[Dict[str, Any]]) -> None:
+        """寫入一筆紀錄（回傳時已寫入磁碟）"""
+        if not articles:
+            return
+        record = encode_record(articles)
+        with self._lock:
+            if self._file is None or self._file.tell() >= self.segment_bytes:
+                self._open_segment()
+            self._file.write(record)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        name = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{time.monotonic_ns()}{SEGMENT_SUFFIX}"
+        self._path = os.path.join(self.directory, name)
+        self._file = open(self._path, 'ab')
+        # 持有鎖表示仍在寫入，drain 不會刪除此檔
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+            self._path = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+    def segments(self) -> List[str]:
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+
+    @staticmethod
+    def drained_offset(segment: str) -> int:
+        try:
+            with open(segment + OFFSET_SUFFIX) as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    @staticmethod
+    def mark_drained(segment: str, offset: int) -> None:
+        """記錄已寫入資料庫的位置（先寫暫存檔再取代，避免中斷時留下不完整的紀錄）"""
+        tmp_path = f"{segment}{OFFSET_SUFFIX}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, segment + OFFSET_SUFFIX)
+
+    def pending_count(self) -> int:
+        """尚未寫入資料庫的文章數量"""
+        return sum(
+            len(articles)
+            for segment in self.segments()
+            for _, articles in read_records(segment, self.drained_offset(segment))
+        )
+
+    def drain(self, write: Callable[[List[Dict[str, Any]]], Any], batch_size: int) -> int:
+        """
+        將暫存的文章批次寫入資料庫
+
+        Args:
+            write: 寫入函數（拋出例外時停止，尚未寫入的文章保留在暫存區）
+            batch_size: 每次寫入的文章數量上限（單筆紀錄不會被拆開）
+
+        Returns:
+            int: 寫入的文章數量
+        """
+        with open(os.path.join(self.directory, DRAIN_LOCK), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.debug("其他 Process 正在寫入暫存區的文章")
+                return 0
+
+            drained = 0
+            batch: List[Dict[str, Any]] = []
+            offsets: Dict[str, int] = {}
+
+            def flush() -> None:
+                nonlocal drained, batch
+                write(batch)
+                for segment, offset in offsets.items():
+                    self.mark_drained(segment, offset)
+                drained += len(batch)
+                batch = []
+                offsets.clear()
+
+            for segment in self.segments():
+                for offset, articles in read_records(segment, self.drained_offset(segment)):
+                    batch.extend(articles)
+                    offsets[segment] = offset
+                    if len(batch) >= batch_size:
+                        flush()
+            if batch:
+                flush()
+
+            for segment in self.segments():
+                self._remove_if_done(segment)
+            return drained
+
+    def _remove_if_done(self, segment: str) -> None:
+        """刪除已全部寫入、且沒有 Process 在寫的 segment"""
+        try:
+            with open(segment, 'rb') as f:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return
+                size = os.fstat(f.fileno()).st_size
+                offset = self.drained_offset(segment)
+                if offset < size:
+                    # 寫入中斷留下的不完整紀錄無法再讀取
+                    if any(True for _ in read_records(segment, offset)):
+                        return
+                    logger.warning(f"暫存檔尾端有 {size - offset} bytes 不完整的紀錄，已略過: {segment}")
+                os.remove(segment)
+        except FileNotFoundError:
+            return
+        try:
+            os.remove(segment + OFFSET_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+
+def get_spool() -> Optional[ArticleSpool]:
+    """依設定取得暫存區（SPOOL_ENABLED 關閉時回傳 None）"""
+    return ArticleSpool() if settings.SPOOL_ENABLED else None
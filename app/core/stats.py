@@ -0,0 +1,155 @@
+"""
+每日文章統計
+article_daily_stats 是 articles 依來源、分類、發布日期的彙總：
+- 每批文章寫入後，重新計算該批文章所屬的來源與日期（只讀取這些日期的文章）
+- 排程定期重新計算最近 STATS_REFRESH_DAYS 天，涵蓋重新爬取、標記重複、發布日期改變等其他寫入
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import Date, Select, and_, cast, delete, func, insert, literal_column, or_, select, true, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.article import Article
+from app.models.article_stats import ArticleDailyStats
+
+logger = logging.getLogger(__name__)
+
+# 重新計算時鎖定（pg_advisory_xact_lock），同時只有一個交易寫入統計，
+# 後執行的交易等待前一個提交後才讀取 articles，不會以較舊的資料覆蓋
+_REFRESH_LOCK_KEY = 5_020_001
+
+STATS_COLUMNS = (
+    'source', 'category', 'day', 'article_count', 'content_count',
+    'content_bytes', 'first_published_at', 'last_published_at',
+)
+
+# 彙總時可以分組的欄位
+GROUP_COLUMNS = ('source', 'category', 'day')
+
+
+def _aggregate(condition) -> Select:
+    """由 articles 計算統計（欄位順序同 STATS_COLUMNS）"""
+    category = func.coalesce(Article.category, literal_column("''"))
+    day = cast(Article.published_at, Date)
+    return select(
+        Article.source,
+        category,
+        day,
+        func.count(),
+        func.count(Article.content),
+        # octet_length 讀取 TOAST 的原始大小，不需要解壓縮內文
+        func.coalesce(func.sum(func.octet_length(Article.content)), 0),
+        func.min(Article.published_at),
+        func.max(Article.published_at),
+    ).where(condition).group_by(Article.source, category, day)
+
+
+def _replace(conn, article_condition, stats_condition) -> None:
+    conn.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+    conn.execute(delete(ArticleDailyStats).where(stats_condition))
+    conn.execute(insert(ArticleDailyStats).from_select(list(STATS_COLUMNS), _aggregate(article_condition)))
+
+
+def refresh_daily_stats(session: Session, keys: Iterable[Tuple[str, date]]) -> int:
+    """
+    重新計算指定來源與日期的統計（每批文章寫入後呼叫）
+
+    Args:
+        session: 資料庫 session
+        keys: (來源, 發布日期)
+
+    Returns:
+        int: 重新計算的 (來源, 日期) 數量
+    """
+    by_day: Dict[date, Set[str]] = {}
+    for source, day in keys:
+        by_day.setdefault(day, set()).add(source)
+    if not by_day:
+        return 0
+
+    # 依日期以發布時間的範圍查詢，可以使用索引並只讀取相關的分割
+    article_condition = or_(*(
+        and_(
+            Article.published_at >= datetime.combine(day, datetime.min.time()),
+            Article.published_at < datetime.combine(day + timedelta(days=1), datetime.min.time()),
+            Article.source.in_(sorted(sources)),
+        )
+        for day, sources in sorted(by_day.items())
+    ))
+    stats_keys = [(source, day) for day, sources in by_day.items() for source in sources]
+    try:
+        _replace(
+            session,
+            article_condition,
+            tuple_(ArticleDailyStats.source, ArticleDailyStats.day).in_(stats_keys)
+        )
+        session.commit()
+    except Exception as e:
+        logger.error(f"Error refreshing daily stats: {str(e)}")
+        session.rollback()
+        return 0
+    return len(stats_keys)
+
+
+def refresh_recent_daily_stats(session: Session, days: Optional[int] = None, now: Optional[datetime] = None) -> None:
+    """重新計算最近幾天的統計（預設 STATS_REFRESH_DAYS，由排程器呼叫）"""
+    days = days or settings.STATS_REFRESH_DAYS
+    since = (now or datetime.now()).date() - timedelta(days=days)
+    _replace(
+        session,
+        Article.published_at >= datetime.combine(since, datetime.min.time()),
+        ArticleDailyStats.day >= since
+    )
+    session.commit()
+    logger.info(f"已重新計算 {since} 之後的每日統計")
+
+
+def rebuild_daily_stats(conn: Connection) -> None:
+    """從 articles 重新計算全部的統計"""
+    _replace(conn, true(), true())
+
+
+def stats_query(
+    group_by: Iterable[str] = ('source', 'day'),
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None
+) -> Select:
+    """
+    每日統計的彙總查詢
+
+    Args:
+        group_by: 分組欄位（GROUP_COLUMNS 的子集合），例如 ('source', 'day') 為各來源每日的文章數，
+            ('category',) 為各分類的平均內文長度
+        source: 只統計指定來源
+        category: 只統計指定分類（空字串為沒有分類的文章）
+        since: 發布日期的起始日
+        until: 發布日期的結束日（包含）
+    """
+    groups = [getattr(ArticleDailyStats, name) for name in GROUP_COLUMNS if name in group_by]
+    content_count = func.sum(ArticleDailyStats.content_count)
+    content_bytes = func.sum(ArticleDailyStats.content_bytes)
+    query = select(
+        *groups,
+        func.sum(ArticleDailyStats.article_count).label('article_count'),
+        content_count.label('content_count'),
+        content_bytes.label('content_bytes'),
+        func.round(content_bytes / func.nullif(content_count, 0)).label('avg_content_bytes'),
+        func.min(ArticleDailyStats.first_published_at).label('first_published_at'),
+        func.max(ArticleDailyStats.last_published_at).label('last_published_at'),
+    )
+    if source:
+        query = query.where(ArticleDailyStats.source == source)
+    if category is not None:
+        query = query.where(ArticleDailyStats.category == category)
+    if since:
+        query = query.where(ArticleDailyStats.day >= since)
+    if until:
+        query = query.where(ArticleDailyStats.day <= until)
+    return query.group_by(*groups).order_by(*groups)
+
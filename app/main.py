@@ -1,19 +1,31 @@
 from fastapi import FastAPI, Request, Depends, HTTPException, BackgroundTasks, APIRouter, Form
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from app.core.database import engine, Base, get_db, SessionLocal
+from app.core.database import engine, Base, BulkSessionLocal, SessionLocal, dispose_async_engines, get_async_bulk_db, get_async_db
 from app.api.v1.api import api_router
 from app.models.article import Article
+from app.core.schema import ensure_schema
+from app.core.stats import refresh_recent_daily_stats
+from app.core.db_utils import article_list_options, article_search, backfill_search_vectors
+from app.core.counters import count_query, estimate_count, sources_query
+from app.core.db_writer import ArticleWriter, drain_spool
+from app.core.pagination import keyset_query, paginate
+from app.core.partitions import maintain_partitions
+from app.core.spool import get_spool
+from app.services.crawler.deadline import Deadline
+from app.services.crawler.driver_lifecycle import reap_orphan_browsers
+from app.services.crawler.recrawl import run_recrawl_process
 import logging
-from sqlalchemy import text, desc, or_, select
+from sqlalchemy import text, desc, select
 from app.core.config import settings
-from math import ceil
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from datetime import datetime, timedelta
 import subprocess
 from fastapi.responses import RedirectResponse, JSONResponse, FileResponse, StreamingResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from typing import Optional
 import asyncio
 from app.tests.test_crawler import test_crawler
@@ -145,13 +157,23 @@ async def crawl_today():
         logger.error(f"排程爬蟲任務失敗: {str(e)}")
 
 
+async def recrawl_recent():
+    """排程重新爬取近期文章（偵測發布後的修改）"""
+    try:
+        process = multiprocessing.Process(target=run_recrawl_process)
+        process.start()
+        logger.info(f"重新爬取任務已啟動: {datetime.now()}")
+    except Exception as e:
+        logger.error(f"重新爬取任務失敗: {str(e)}")
+
+
 def export_articles_job():
     """匯出資料到 Google Sheets"""
     if not settings.GOOGLE_SHEET_ID or not settings.GOOGLE_EXPORT_COLUMNS:
         logger.info("Google Sheets 匯出略過：相關設定未完成")
         return
 
-    session = SessionLocal()
+    session = BulkSessionLocal()
     try:
         exported_count = export_articles_to_sheet(session)
         logger.info(f"Google Sheets 匯出完成，共 {exported_count} 筆資料")
@@ -160,6 +182,26 @@ def export_articles_job():
     finally:
         session.close()
 
+def refresh_daily_stats_job():
+    """重新計算近期的每日統計（涵蓋重新爬取等批次寫入以外的修改）"""
+    session = SessionLocal()
+    try:
+        refresh_recent_daily_stats(session)
+    except Exception as e:
+        logger.exception(f"重新計算每日統計失敗: {str(e)}")
+    finally:
+        session.close()
+
+def backfill_search_vectors_job():
+    """為既有文章補上全文搜尋向量"""
+    session = SessionLocal()
+    try:
+        backfill_search_vectors(session)
+    except Exception as e:
+        logger.exception(f"補建搜尋向量失敗: {str(e)}")
+    finally:
+        session.close()
+
 # 設定排程任務
 def setup_scheduler():
     try:
@@ -210,6 +252,51 @@ def setup_scheduler():
             id='export_articles_daily',
             replace_existing=True
         )
+
+        # 每天 3:00 建立未來月份的文章分割並移除過期的分割 (台灣時間)
+        scheduler.add_job(
+            maintain_partitions,
+            CronTrigger(hour=3, minute=0, timezone=timezone('Asia/Taipei')),
+            id='maintain_partitions',
+            replace_existing=True,
+            max_instances=1
+        )
+
+        # 啟動後補建既有文章的搜尋向量（只執行一次）
+        scheduler.add_job(
+            backfill_search_vectors_job,
+            id='backfill_search_vectors',
+            replace_existing=True
+        )
+
+        # 定期補寫暫存區中的文章（資料庫曾無法使用時）
+        if settings.SPOOL_ENABLED:
+            scheduler.add_job(
+                drain_spool,
+                IntervalTrigger(minutes=settings.SPOOL_DRAIN_INTERVAL_MINUTES),
+                id='drain_spool',
+                replace_existing=True,
+                max_instances=1
+            )
+
+        # 定期重新計算近期的每日統計
+        scheduler.add_job(
+            refresh_daily_stats_job,
+            IntervalTrigger(minutes=settings.STATS_REFRESH_INTERVAL_MINUTES),
+            id='refresh_daily_stats',
+            replace_existing=True,
+            max_instances=1
+        )
+
+        # 定期重新爬取近期文章
+        if settings.RECRAWL_ENABLED:
+            scheduler.add_job(
+                recrawl_recent,
+                IntervalTrigger(minutes=settings.RECRAWL_INTERVAL_MINUTES),
+                id='recrawl_recent',
+                replace_existing=True,
+                max_instances=1
+            )
         
         # 動排程器
         scheduler.start()
@@ -225,47 +312,51 @@ def setup_scheduler():
 @app.get("/", name="index")
 async def index(
     request: Request, 
-    page: int = 1,
+    after: str = None,
+    before: str = None,
     source: str = None,
     category: str = None,
     start_date: str = None,
     end_date: str = None,
     keyword: str = None,
     error: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # 設定每頁顯示數量
     per_page = 20
     
-    # 建立基本查詢
-    query = db.query(Article)
+    # 建立基本查詢（只載入列表顯示的欄位，沒有摘要時載入內文開頭）
+    query = select(Article).options(*article_list_options(excerpt_length=100))
+
+    # 隱藏其他媒體轉載的重複文章
+    if settings.DEDUP_HIDE_DUPLICATES:
+        query = query.where(Article.duplicate_of_id.is_(None))
     
-    # 加入搜尋條件
-    if keyword:
-        query = query.filter(
-            or_(
-                Article.title.ilike(f"%{keyword}%"),
-                Article.content.ilike(f"%{keyword}%")
-            )
-        )
+    # 加入搜尋條件（全文搜尋索引）
+    search = article_search(keyword)
+    if search is not None:
+        query = query.where(search[0])
     
     if source:
-        query = query.filter(Article.source == source)
+        query = query.where(Article.source == source)
     
-    # 計算總數和頁數
-    total = query.count()
-    total_pages = ceil(total / per_page)
+    # 計算總數（從統計表讀取；全文搜尋時使用估計值）
+    total_estimated = search is not None
+    if total_estimated:
+        total = await estimate_count(db, query)
+    else:
+        total = await db.scalar(count_query(source=source))
     
-    # 取得分頁資料
-    articles = query\
-        .order_by(desc(Article.published_at))\
-        .offset((page - 1) * per_page)\
-        .limit(per_page)\
-        .all()
+    # 取得分頁資料（keyset 分頁）
+    try:
+        page_query = keyset_query(query, per_page, after=after, before=before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = (await db.execute(page_query)).scalars().all()
+    articles, next_cursor, previous_cursor = paginate(rows, per_page, after=after, before=before)
     
     # 取得所有來源選項
-    sources = db.query(Article.source).distinct().all()
-    sources = [source[0] for source in sources]
+    sources = (await db.execute(sources_query())).scalars().all()
     
     # 建立查詢參數字典
     params = {}
@@ -285,9 +376,10 @@ async def index(
         {
             "request": request,
             "articles": articles,
-            "current_page": page,
-            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+            "previous_cursor": previous_cursor,
             "total": total,
+            "total_estimated": total_estimated,
             "keyword": keyword,
             "source": source,
             "sources": sources,
@@ -300,20 +392,23 @@ async def index(
 async def article_detail(
     request: Request,
     id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # 取得文章詳細資料
-    article = db.query(Article).filter(Article.id == id).first()
+    article = await db.get(Article, id, options=[undefer(Article.content)])
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
     # 取得相關文章（同一來源的最新5篇其他文章）
-    related_articles = db.query(Article)\
-        .filter(Article.source == article.source)\
-        .filter(Article.id != article.id)\
-        .order_by(desc(Article.published_at))\
-        .limit(5)\
-        .all()
+    result = await db.execute(
+        select(Article)
+        .options(*article_list_options())
+        .where(Article.source == article.source)
+        .where(Article.id != article.id)
+        .order_by(desc(Article.published_at))
+        .limit(5)
+    )
+    related_articles = result.scalars().all()
     
     return templates.TemplateResponse(
         "detail.html",
@@ -332,6 +427,8 @@ async def startup_event():
     try:
         # 嘗試創建所有資料表
         Base.metadata.create_all(bind=engine)
+        # 補上既有資料表缺少的欄位與索引
+        ensure_schema(engine)
         # 測試資料庫連接
         with engine.connect() as conn:
             result = conn.execute(text("SELECT 1"))
@@ -347,6 +444,7 @@ async def startup_event():
 async def shutdown_event():
     scheduler.shutdown()
     logger.info("排程器已關閉")
+    await dispose_async_engines()
 
 @app.get("/health")
 def health_check():
@@ -401,6 +499,11 @@ async def crawl_last_week(background_tasks: BackgroundTasks):
 # 建立一個新的 Process 來執行爬蟲
 def run_crawler_process(start_date, end_date, parallel=True):
     """在新的 Process 中執行爬蟲（支援並行爬取）"""
+    # 整次執行的時間預算，避免拖到下一個排程時段
+    run_deadline = Deadline(settings.CRAWLER_RUN_TIME_BUDGET_SECONDS, name='排程爬蟲')
+    # 所有爬蟲共用一個寫入器（只使用一個資料庫連線）
+    writer = ArticleWriter(spool=get_spool())
+
     async def run_single_crawler(source: str):
         """執行單個爬蟲（帶異常處理）"""
         try:
@@ -408,7 +511,9 @@ def run_crawler_process(start_date, end_date, parallel=True):
             count = await test_crawler(
                 crawler_type=source,
                 start_date=start_date,
-                end_date=end_date
+                end_date=end_date,
+                deadline=run_deadline,
+                writer=writer
             )
             logger.info(f"✅ {source} 爬蟲完成，共爬取 {count} 篇文章")
             return {source: {'status': 'success', 'count': count}}
@@ -450,7 +555,14 @@ def run_crawler_process(start_date, end_date, parallel=True):
 
         return results
 
-    asyncio.run(run())
+    # 清除上次執行當機留下的瀏覽器 Process
+    reap_orphan_browsers()
+    writer.start()
+    try:
+        asyncio.run(run())
+    finally:
+        writer.close()
+        reap_orphan_browsers()
 
 @app.post("/api/crawl")
 async def crawl_articles(
@@ -529,18 +641,22 @@ async def test_scheduler():
         )
 
 @app.get("/export/latest")
-async def export_latest(source: str = None, db: Session = Depends(get_db)):
+async def export_latest(source: str = None, db: AsyncSession = Depends(get_async_bulk_db)):
 	"""匯出最新1000筆文章為Excel，可以指定來源"""
 	try:
 		# 建立查詢
-		query = db.query(Article).order_by(desc(Article.published_at))
+		query = select(Article).options(undefer(Article.content)).order_by(desc(Article.published_at))
+
+		# 不匯出重複文章
+		if settings.DEDUP_HIDE_DUPLICATES:
+			query = query.where(Article.duplicate_of_id.is_(None))
 		
 		# 如果指定了來源且不是 'all'，則進行過濾
 		if source and source != 'all':
-			query = query.filter(Article.source == source)
+			query = query.where(Article.source == source)
 		
 		# 限制最多1000筆
-		articles = query.limit(1000).all()
+		articles = (await db.execute(query.limit(1000))).scalars().all()
 		
 		# 準備資料
 		data = []
@@ -594,12 +710,10 @@ async def export_latest(source: str = None, db: Session = Depends(get_db)):
 		)
 
 @app.get("/export")
-async def export_page(request: Request, source: str = None):
+async def export_page(request: Request, source: str = None, db: AsyncSession = Depends(get_async_db)):
 	"""匯出資料頁面，可以預設指定來源"""
 	# 取得所有可用的新聞來源
-	db = next(get_db())
-	sources = db.query(Article.source).distinct().all()
-	sources = [s[0] for s in sources]
+	sources = (await db.execute(sources_query())).scalars().all()
 	
 	return templates.TemplateResponse(
 		"export.html",
@@ -617,14 +731,17 @@ async def export_articles(
 	end_date: str = Form(...),
 	keyword: str = Form(None),
 	source: str = Form(None),  # 添加來源參數
-	file_format: str = Form("csv")
+	file_format: str = Form("csv"),
+	db: AsyncSession = Depends(get_async_bulk_db)
 ):
 	"""匯出文章資料"""
 	try:
-		db = next(get_db())
-		
 		# 建立查詢
-		query = select(Article).order_by(Article.published_at.desc())
+		query = select(Article).options(undefer(Article.content)).order_by(Article.published_at.desc())
+
+		# 不匯出重複文章
+		if settings.DEDUP_HIDE_DUPLICATES:
+			query = query.where(Article.duplicate_of_id.is_(None))
 		
 		# 如果有日期範圍
 		if start_date and end_date:
@@ -641,7 +758,7 @@ async def export_articles(
 			query = query.where(Article.source == source)
 		
 		# 執行查詢
-		result = db.execute(query)
+		result = await db.execute(query)
 		articles = result.scalars().all()
 		
 		if not articles:
@@ -1,35 +1,73 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, query_expression
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
 class Article(Base):
+    """
+    文章
+
+    依 published_at 以月份做範圍分割（見 app/core/partitions.py）。分割資料表的主鍵與唯一索引必須包含分割鍵，
+    資料表的主鍵為 (id, published_at)，ORM 仍以 id 識別文章；網址的唯一性由 article_urls 保證。
+    """
     __tablename__ = "articles"
 
-    id = Column(Integer, primary_key=True, index=True)
-    url = Column(String(255), unique=True, nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    url = Column(String(255), nullable=False, index=True)
     source = Column(String(50), nullable=False, index=True)
     category = Column(String(100))
     reporter = Column(String(100))
     title = Column(String(255), nullable=False)
     description = Column(Text)
     image_url = Column(Text)
-    content = Column(Text, nullable=True)
-    published_at = Column(DateTime, nullable=False, index=True)
+    # 內文只在詳細頁與匯出時載入（undefer），列表查詢不讀取
+    content = deferred(Column(Text, nullable=True))
+    published_at = Column(DateTime, primary_key=True, nullable=False, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    # 重複文章偵測（見 app/core/fingerprint.py）
+    title_fingerprint = Column(BigInteger, index=True)
+    content_simhash = Column(BigInteger)
+    simhash_band_0 = Column(Integer)
+    simhash_band_1 = Column(Integer)
+    simhash_band_2 = Column(Integer)
+    simhash_band_3 = Column(Integer)
+    duplicate_of_id = Column(Integer, index=True)  # 近似重複時指向最早的原始文章
+    content_hash = Column(String(32))  # 標題與內文的雜湊，用於偵測修改
+
+    # 全文搜尋（見 app/core/search.py），一般查詢不需要載入
+    search_vector = deferred(Column(TSVECTOR))
+
+    # 列表沒有摘要時顯示的內文開頭（不是資料表欄位，見 db_utils.article_list_options）
+    excerpt = query_expression()
+
     # 複合索引
     __table_args__ = (
         # 標題 + 來源的複合索引，用於搜尋
         Index('idx_title_source', 'title', 'source'),
         # 發布日期 + 來源的複合索引，用於排序和過濾
         Index('idx_published_source', 'published_at', 'source'),
+        # 列表的 keyset 分頁（反向掃描即為 published_at DESC, id DESC）
+        Index('idx_published_id', 'published_at', 'id'),
+        Index('idx_source_published_id', 'source', 'published_at', 'id'),
         # 分類索引，用於按分類篩選
         Index('idx_category', 'category'),
         # 創建時間索引，用於管理和清理
         Index('idx_created_at', 'created_at'),
+        # SimHash 分段索引，用於 LSH 查詢近似重複文章
+        Index('idx_simhash_band_0', 'simhash_band_0'),
+        Index('idx_simhash_band_1', 'simhash_band_1'),
+        Index('idx_simhash_band_2', 'simhash_band_2'),
+        Index('idx_simhash_band_3', 'simhash_band_3'),
+        # 全文搜尋的 bigram 索引
+        Index('idx_search_vector', 'search_vector', postgresql_using='gin'),
+        {'postgresql_partition_by': 'RANGE (published_at)'},
     )
 
+    __mapper_args__ = {'primary_key': [id]}
+
     def __repr__(self):
         return f"<Article {self.title}>"
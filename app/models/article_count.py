@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Date
+from app.core.database import Base
+
+
+class ArticleCount(Base):
+    """
+    文章數量統計（依來源、分類、發布日期）
+
+    由 articles 資料表的觸發器維護（見 app/core/schema.py），列表頁的總數與來源選單從這裡讀取，
+    不需要每次掃描整個 articles 資料表。
+    """
+    __tablename__ = "article_counts"
+
+    source = Column(String(50), primary_key=True)
+    category = Column(String(100), primary_key=True)  # 沒有分類時為空字串
+    day = Column(Date, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    duplicate_count = Column(Integer, nullable=False, default=0)  # 其中被標記為重複的文章
+
+    def __repr__(self):
+        return f"<ArticleCount {self.source} {self.category} {self.day}: {self.article_count}>"
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ArticleDailyStats(Base):
+    """
+    每日文章統計（依來源、分類、發布日期）
+
+    每批文章寫入後重新計算受影響的來源與日期（見 app/core/stats.py），
+    儀表板與監控從這裡讀取，不需要掃描 articles 資料表。
+    """
+    __tablename__ = "article_daily_stats"
+
+    source = Column(String(50), primary_key=True)
+    category = Column(String(100), primary_key=True)  # 沒有分類時為空字串
+    day = Column(Date, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    content_count = Column(Integer, nullable=False, default=0)  # 其中有內文的文章
+    content_bytes = Column(BigInteger, nullable=False, default=0)  # 內文的位元組數合計
+    first_published_at = Column(DateTime, nullable=False)
+    last_published_at = Column(DateTime, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        return f"<ArticleDailyStats {self.source} {self.category} {self.day}: {self.article_count}>"
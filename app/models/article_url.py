@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Index
+from app.core.database import Base
+
+
+class ArticleUrl(Base):
+    """
+    文章網址登記表
+
+    articles 依月份分割後，唯一索引必須包含分割鍵（published_at），無法保證網址在所有分割中唯一；
+    改由這張表的主鍵保證，並記錄文章所在的發布時間。由 articles 的觸發器維護（見 app/core/schema.py）。
+    """
+    __tablename__ = "article_urls"
+
+    url = Column(String(255), primary_key=True)
+    published_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # 刪除過期分割時清除對應的網址
+        Index('idx_article_urls_published_at', 'published_at'),
+    )
+
+    def __repr__(self):
+        return f"<ArticleUrl {self.url}>"
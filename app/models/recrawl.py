@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class RecrawlEntry(Base):
+    """
+    重新爬取佇列
+
+    近期文章依發布後經過的時間定期重新抓取，偵測發布後的修改。
+    """
+    __tablename__ = "recrawl_queue"
+
+    article_id = Column(Integer, primary_key=True)
+    url = Column(String(255), nullable=False)
+    source = Column(String(50), nullable=False)
+    published_at = Column(DateTime, nullable=False)
+    next_check_at = Column(DateTime, nullable=False)
+    check_count = Column(Integer, nullable=False, default=0)
+    change_count = Column(Integer, nullable=False, default=0)
+    last_checked_at = Column(DateTime)
+    last_changed_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        # 取出到期項目
+        Index('idx_recrawl_next_check', 'next_check_at'),
+    )
+
+    def __repr__(self):
+        return f"<RecrawlEntry {self.article_id} next={self.next_check_at}>"
@@ -0,0 +1,106 @@
+"""
+爬蟲流程中的文章紀錄
+從列表頁解析到寫入資料庫都使用同一個物件：以 __slots__ 儲存欄位，不為每篇文章建立 dict，
+並支援 dict 的存取方式（article['url']、article.get('published_at')），既有程式不需要修改
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping
+
+from app.core.fingerprint import SIMHASH_BANDS
+
+# 對應 articles 資料表的欄位
+COLUMN_FIELDS = (
+    'url',
+    'title',
+    'content',
+    'description',
+    'published_at',
+    'image_url',
+    'category',
+    'reporter',
+    'source',
+    'duplicate_of_id',
+    'title_fingerprint',
+    'content_simhash',
+    *(f'simhash_band_{i}' for i in range(SIMHASH_BANDS)),
+    'content_hash',
+    'search_vector',
+)
+
+# 只在爬蟲流程中使用的欄位（不寫入資料庫）
+PIPELINE_FIELDS = (
+    'news_source',
+    'section',
+    'published_date',
+    'earliest_date',
+)
+
+FIELD_NAMES = frozenset(COLUMN_FIELDS + PIPELINE_FIELDS)
+
+_MISSING = object()
+
+
+class ArticleRecord(MutableMapping):
+    """
+    精簡的文章紀錄
+
+    沒有設定的欄位視為不存在（與 dict 相同：'content' in record 為 False，get 回傳預設值）。
+    """
+
+    __slots__ = COLUMN_FIELDS + PIPELINE_FIELDS
+
+    def __init__(self, **fields: Any):
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def fill(cls, base: Mapping[str, Any], **fields: Any) -> 'ArticleRecord':
+        """
+        以解析結果更新文章紀錄
+
+        base 是 ArticleRecord 時直接更新（列表頁的紀錄就是最後寫入資料庫的紀錄），
+        否則建立只含 fields 的新紀錄。
+        """
+        record = base if isinstance(base, cls) else cls()
+        for name, value in fields.items():
+            record[name] = value
+        return record
+
+    def to_params(self) -> Dict[str, Any]:
+        """寫入資料庫的參數（只含資料表欄位）"""
+        params = {}
+        for name in COLUMN_FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                params[name] = value
+        return params
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELD_NAMES:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in FIELD_NAMES:
+            raise KeyError(f"ArticleRecord 沒有欄位 {key}")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.__slots__:
+            if getattr(self, name, _MISSING) is not _MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"<ArticleRecord {getattr(self, 'url', None)}>"
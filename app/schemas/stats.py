@@ -0,0 +1,18 @@
+from datetime import date, datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class DailyStats(BaseModel):
+    """每日統計的彙總（未分組的欄位為 None）"""
+    source: Optional[str] = None
+    category: Optional[str] = None
+    day: Optional[date] = None
+    article_count: int
+    content_count: int
+    content_bytes: int
+    avg_content_bytes: Optional[int] = None
+    first_published_at: datetime
+    last_published_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -6,12 +6,28 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from app.core.config import settings
+from app.schemas.article_record import ArticleRecord
+import asyncio
 import logging
 import time
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from selenium.common.exceptions import TimeoutException
 import random
+from app.services.crawler.content_cleaner import ContentCleaner, get_cleaner, get_source_cleaner
+from app.services.crawler.date_parser import DateParser, get_date_parser
+from app.services.crawler.discovery import DiscoveryStrategy, get_discovery
+from app.services.crawler.deadline import Deadline, DeadlineExceeded, stop_at_deadline
+from app.services.crawler.driver_lifecycle import (
+    BrowserCrashed,
+    driver_pid,
+    is_crash_error,
+    is_driver_alive,
+    kill_process_tree,
+    process_tree_rss_mb,
+    reap_zombies,
+)
+from app.services.crawler.prefetch import get_host_limiter
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -25,8 +41,31 @@ logger = logging.getLogger(__name__)
 class BaseCrawler(ABC):
     def __init__(self):
         self.driver = None
+        self.browser_backend = settings.CRAWLER_BROWSER_BACKEND
+        self.browser_session = None  # Playwright 後端的 context 與分頁
+        self.page_load_timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT
+        self.pages_loaded = 0  # 目前 driver 已載入的頁數
         self.source_name = ""
         self.needs_javascript = True  # 預設需要 JavaScript，子類可以覆寫
+        self.ad_texts: List[str] = []  # 來源專屬的廣告文字，子類可以覆寫
+        self.discovery_strategy: Optional[DiscoveryStrategy] = None  # 文章探索策略，None 表示依設定決定
+
+    @property
+    def content_cleaner(self) -> ContentCleaner:
+        """此來源的內容清理器（依廣告文字組合快取）"""
+        return get_source_cleaner(self.source_name, self.ad_texts)
+
+    @property
+    def discovery(self) -> DiscoveryStrategy:
+        """此來源的文章探索策略（有設定 feed 時優先使用 feed）"""
+        if self.discovery_strategy is None:
+            self.discovery_strategy = get_discovery(self.source_name)
+        return self.discovery_strategy
+
+    @property
+    def date_parser(self) -> DateParser:
+        """此來源的日期解析器（記住上次成功的格式）"""
+        return get_date_parser(self.source_name)
     
     def setup_driver(self):
         """設置 Chrome Driver"""
@@ -81,8 +120,10 @@ class BaseCrawler(ABC):
             )
             
             # 設定較短的超時時間
-            self.driver.set_page_load_timeout(20)  # 縮短到 20 秒
-            self.driver.set_script_timeout(20)
+            self.pages_loaded = 0
+            self.page_load_timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT
+            self.driver.set_page_load_timeout(self.page_load_timeout)
+            self.driver.set_script_timeout(settings.CRAWLER_PAGE_LOAD_TIMEOUT)
             
             logger.info(f"{self.source_name} crawler driver setup completed")
             
@@ -91,38 +132,151 @@ class BaseCrawler(ABC):
             raise
     
     def cleanup(self):
-        """清理資源"""
+        """清理資源（quit 失敗或瀏覽器已當機時直接結束整個 Process 樹）"""
         if self.driver:
+            pid = driver_pid(self.driver)
             try:
                 self.driver.quit()
                 logger.info(f"{self.source_name} crawler cleanup completed")
             except Exception as e:
-                # 忽略關閉時的連接錯誤
-                if "Connection refused" not in str(e):
-                    logger.error(f"Error during cleanup: {str(e)}", exc_info=True)
+                # 瀏覽器已當機時 quit 會連線失敗，由下方結束殘留的 Process
+                logger.warning(f"{self.source_name} driver quit 失敗: {str(e)}")
             finally:
                 self.driver = None
+                killed = kill_process_tree(pid)
+                if killed:
+                    logger.warning(f"{self.source_name} 結束 {killed} 個殘留的瀏覽器 Process")
+                reap_zombies()
+
+    def recycle_driver(self, reason: str) -> None:
+        """重新建立 driver"""
+        logger.info(f"{self.source_name} 重新建立 driver：{reason}")
+        self.cleanup()
+        self.setup_driver()
+
+    def ensure_driver(self) -> None:
+        """
+        載入頁面前確認 driver 可用
+
+        chromedriver 已結束、載入頁數達到 CRAWLER_DRIVER_MAX_PAGES，
+        或瀏覽器 Process 樹的記憶體超過 CRAWLER_DRIVER_MAX_RSS_MB 時重新建立。
+        """
+        if self.driver is None:
+            self.setup_driver()
+            return
+        if not is_driver_alive(self.driver):
+            self.recycle_driver("chromedriver 已結束")
+            return
+        if self.pages_loaded >= settings.CRAWLER_DRIVER_MAX_PAGES:
+            self.recycle_driver(f"已載入 {self.pages_loaded} 頁")
+            return
+        rss_mb = process_tree_rss_mb(driver_pid(self.driver))
+        if rss_mb > settings.CRAWLER_DRIVER_MAX_RSS_MB:
+            self.recycle_driver(f"記憶體 {rss_mb:.0f} MB")
     
+    async def open_browser(self) -> None:
+        """依 CRAWLER_BROWSER_BACKEND 開啟瀏覽器（selenium 或 playwright）"""
+        if self.browser_backend == 'playwright':
+            from app.services.crawler.playwright_backend import PlaywrightSession
+            self.browser_session = await PlaywrightSession(self.source_name, self.needs_javascript).open()
+        else:
+            self.setup_driver()
+
+    async def close_browser(self) -> None:
+        """關閉瀏覽器"""
+        if self.browser_session is not None:
+            session, self.browser_session = self.browser_session, None
+            await session.close()
+        self.cleanup()
+
+    async def fetch_page(
+        self,
+        url: str,
+        deadline: Optional[Deadline] = None,
+        wait_selector: Optional[str] = None,
+        settle: Tuple[float, float] = (0, 0)
+    ) -> str:
+        """
+        載入頁面並回傳 HTML
+
+        Args:
+            url: 網址
+            deadline: 時間預算
+            wait_selector: 頁面內容載入完成的標記元素（Playwright 等到元素出現即可）
+            settle: Selenium 載入後固定等待的秒數範圍；Playwright 則作為等待元素的上限
+        """
+        if self.browser_session is not None:
+            return await self.browser_session.fetch(
+                url,
+                deadline=deadline,
+                wait_selector=wait_selector,
+                settle_seconds=settle[1]
+            )
+
+        self.wait_and_get(url, deadline=deadline)
+        self._sleep(random.uniform(*settle), deadline)
+        return self.driver.page_source
+
+    @staticmethod
+    def _sleep(seconds: float, deadline: Optional[Deadline]) -> None:
+        """等待，但不超過時間預算"""
+        if deadline is None:
+            time.sleep(seconds)
+        else:
+            deadline.sleep(seconds)
+
+    @staticmethod
+    async def _async_sleep(seconds: float, deadline: Optional[Deadline]) -> None:
+        """等待但不阻塞事件迴圈（Playwright 後端的爬蟲可以同時進行），不超過時間預算"""
+        if deadline is not None:
+            seconds = deadline.cap(seconds)
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def _limit_page_load_timeout(self, deadline: Optional[Deadline]) -> None:
+        """頁面載入逾時不超過剩餘的時間預算（只在數值改變時呼叫 WebDriver）"""
+        timeout = max(1, int(deadline.cap(settings.CRAWLER_PAGE_LOAD_TIMEOUT))) if deadline else settings.CRAWLER_PAGE_LOAD_TIMEOUT
+        if timeout != self.page_load_timeout:
+            self.driver.set_page_load_timeout(timeout)
+            self.page_load_timeout = timeout
+
     @retry(
-        stop=stop_after_attempt(3),
+        stop=stop_after_attempt(3) | stop_at_deadline,
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((TimeoutException, ConnectionError)),
+        retry=retry_if_exception_type((TimeoutException, ConnectionError, BrowserCrashed)),
         before_sleep=before_sleep_log(logger, logging.WARNING)
     )
-    def wait_and_get(self, url: str) -> None:
-        """等待頁面載入完成（帶重試機制）"""
+    def wait_and_get(self, url: str, deadline: Optional[Deadline] = None) -> None:
+        """
+        等待頁面載入完成（帶重試機制）
+
+        有 deadline 時，延遲與逾時都不會超過剩餘時間，時間用完時拋出 DeadlineExceeded（不重試）
+        瀏覽器當機時重新建立 driver 後重試
+        """
         try:
+            if deadline:
+                deadline.check(url)
+            self.ensure_driver()
+
             # 加入隨機延遲
             delay = random.uniform(
                 settings.CRAWLER_DELAY_MIN,
                 settings.CRAWLER_DELAY_MAX
             )
-            time.sleep(delay)
+            if deadline:
+                deadline.sleep(delay)
+                get_host_limiter().wait(url, deadline)
+                deadline.check(url)
+                self._limit_page_load_timeout(deadline)
+            else:
+                time.sleep(delay)
+                get_host_limiter().wait(url)
 
+            self.pages_loaded += 1
             self.driver.get(url)
 
             # 等待頁面主要元素載入
-            WebDriverWait(self.driver, 5).until(
+            WebDriverWait(self.driver, deadline.cap(5) if deadline else 5).until(
                 lambda d: d.execute_script('return document.readyState') == 'complete'
             )
 
@@ -137,7 +291,14 @@ class BaseCrawler(ABC):
                 pass
             raise
 
+        except DeadlineExceeded:
+            raise
+
         except Exception as e:
+            if self.driver is not None and (is_crash_error(e) or not is_driver_alive(self.driver)):
+                logger.warning(f"瀏覽器 session 已失效 {url}: {str(e)}")
+                self.recycle_driver("session 已失效")
+                raise BrowserCrashed(str(e)) from e
             logger.error(f"Error loading page {url}: {str(e)}")
             raise
     
@@ -157,10 +318,9 @@ class BaseCrawler(ABC):
             return False
         return True
 
-    @staticmethod
-    def parse_flexible_date(date_text: str) -> Optional[datetime]:
+    def parse_flexible_date(self, date_text: str) -> Optional[datetime]:
         """
-        統一的日期解析邏輯，支援多種日期格式
+        統一的日期解析邏輯，支援多種日期格式（使用此來源的解析器，優先嘗試上次成功的格式）
 
         Args:
             date_text: 日期文字
@@ -168,40 +328,46 @@ class BaseCrawler(ABC):
         Returns:
             datetime 物件或 None
         """
-        if not date_text:
-            return None
-
-        # 清理日期文字
-        date_text = date_text.strip()
-
-        # 移除可能的干擾文字
-        for remove_text in ["|", "Updated", "發布", "更新"]:
-            if remove_text in date_text:
-                date_text = date_text.split(remove_text)[0].strip()
-
-        # 嘗試多種日期格式
-        date_formats = [
-            '%Y-%m-%d %H:%M:%S',  # 2025-01-01 12:00:00
-            '%Y-%m-%d %H:%M',     # 2025-01-01 12:00
-            '%Y-%m-%d',           # 2025-01-01
-            '%Y/%m/%d %H:%M:%S',  # 2025/01/01 12:00:00
-            '%Y/%m/%d %H:%M',     # 2025/01/01 12:00
-            '%Y/%m/%d',           # 2025/01/01
-            '%d %b %Y',           # 01 Jan 2025
-            '%B %d, %Y',          # January 01, 2025
-            '%b %d, %Y',          # Jan 01, 2025
-            '%d/%m/%Y',           # 01/01/2025
-            '%m/%d/%Y',           # 01/01/2025
-        ]
-
-        for date_format in date_formats:
-            try:
-                return datetime.strptime(date_text, date_format)
-            except ValueError:
-                continue
+        return self.date_parser.parse(date_text)
+
+    def find_known_duplicates(self, articles: List[Dict]) -> Dict[str, Dict]:
+        """
+        在抓取內文前，依標題指紋找出資料庫中已有的同標題文章
+
+        Returns:
+            dict: {列表頁 URL: 原始文章資訊}，查詢失敗時回傳空字典（照常抓取）
+        """
+        if not settings.DEDUP_ENABLED or not settings.DEDUP_SKIP_BY_TITLE or not articles:
+            return {}
+
+        from app.core.database import SessionLocal
+        from app.core.db_utils import find_title_duplicates
 
-        logger.warning(f"無法解析日期: {date_text}")
-        return None
+        session = SessionLocal()
+        try:
+            return find_title_duplicates(session, articles)
+        except Exception as e:
+            logger.warning(f"查詢重複標題失敗，照常抓取內文: {str(e)}")
+            return {}
+        finally:
+            session.close()
+
+    def build_duplicate_article(self, article_info: Dict, original: Dict) -> Dict:
+        """為已知重複的文章建立不含內文的資料（指向原始文章）"""
+        return ArticleRecord.fill(
+            article_info,
+            url=article_info.get('url'),
+            title=article_info.get('title'),
+            content=None,
+            description=original.get('description'),
+            published_at=article_info.get('published_at') or original.get('published_at'),
+            image_url=article_info.get('image_url') or original.get('image_url'),
+            category=getattr(self, 'category_name', None),
+            reporter=None,
+            source=self.source_name,
+            news_source=article_info.get('news_source', ''),
+            duplicate_of_id=original['id'],
+        )
 
     @staticmethod
     def clean_content(content: str, ad_texts: List[str] = None) -> str:
@@ -215,52 +381,15 @@ class BaseCrawler(ABC):
         Returns:
             清理後的內容
         """
-        import re
-
-        if not content:
-            return ""
-
-        # 預設廣告文字
-        default_ads = [
-            "不用抽 不用搶 現在用APP看新聞 保證天天中獎",
-            "點我下載APP",
-            "按我看活動辦法",
-            "請繼續往下閱讀...",
-            "Subscribe to our Telegram channel",
-            "Click to subscribe",
-            "Follow us on",
-            "For the latest property news",
-        ]
-
-        ad_texts = ad_texts or []
-        all_ads = default_ads + ad_texts
-
-        # 移除廣告文字
-        for ad in all_ads:
-            content = content.replace(ad, "")
-
-        # 移除多餘的空白行
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [line for line in lines if line]
-
-        # 移除重複的行
-        lines = list(dict.fromkeys(lines))
-
-        # 重新組合內容
-        content = '\n'.join(lines)
-
-        # 移除連續的空格
-        content = re.sub(r'\s+', ' ', content).strip()
-
-        return content
+        return get_cleaner(ad_texts).clean(content)
     
     @abstractmethod
-    async def crawl_list(self, page: int = 1) -> list:
+    async def crawl_list(self, page: int = 1, deadline: Optional[Deadline] = None) -> list:
         """爬取文章列表"""
         pass
     
     @abstractmethod
-    async def crawl_article(self, url: str) -> dict:
+    async def crawl_article(self, url: str, deadline: Optional[Deadline] = None) -> dict:
         """爬取單篇文章"""
         pass
     
@@ -1,6 +1,12 @@
 from .base import BaseCrawler
+from .deadline import Deadline, DeadlineExceeded
+from .pickup_dates import PickupDateResolver, is_outside_range, lookup_dates
+from .prefetch import ArticlePrefetcher
+from app.core.config import settings
+from app.schemas.article_record import ArticleRecord
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
+import asyncio
 import logging
 from datetime import datetime
 import time
@@ -10,6 +16,10 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# 頁面內容載入完成的標記（Playwright 後端等到出現即可解析）
+LIST_READY_SELECTOR = '.sn-modTimeLine, .sn-modListPickupAdvanced, .io-modPickup'
+ARTICLE_READY_SELECTOR = 'article'
+
 class BaseballCrawler(BaseCrawler):
     """
     通用棒球新聞爬蟲
@@ -36,12 +46,32 @@ class BaseballCrawler(BaseCrawler):
         self.category_name = category_name
         self.needs_javascript = True  # Yahoo 網站需要 JavaScript
 
-    async def crawl_list(self, page: int = 1) -> List[Dict]:
+    async def crawl_list(self, page: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        取得文章列表（依探索策略使用 feed 或列表頁）
+
+        Args:
+            page: 頁碼
+            deadline: 時間預算（用完時拋出 DeadlineExceeded）
+
+        Returns:
+            文章列表
+        """
+        try:
+            return await self.discovery.discover(self, page, deadline=deadline)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"取得文章列表失敗: {str(e)}")
+            return []
+
+    async def crawl_rendered_list(self, page: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
         """
         爬取列表頁（包含「ピックアップ」和「新着記事」兩個區域）
 
         Args:
             page: 頁碼（目前只爬首頁，page 參數保留供未來擴展）
+            deadline: 時間預算（用完時拋出 DeadlineExceeded）
 
         Returns:
             文章列表
@@ -50,14 +80,9 @@ class BaseballCrawler(BaseCrawler):
             list_url = self.base_url
             logger.info(f"開始爬取 {self.category_name} 列表頁: {list_url}")
 
-            # 載入頁面
-            self.wait_and_get(list_url)
-
-            # 等待內容載入
-            time.sleep(random.uniform(3, 5))
-
-            # 取得頁面 HTML
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            # 載入頁面並等待內容載入
+            html = await self.fetch_page(list_url, deadline=deadline, wait_selector=LIST_READY_SELECTOR, settle=(3, 5))
+            soup = BeautifulSoup(html, 'html.parser')
 
             articles = []
 
@@ -74,6 +99,8 @@ class BaseballCrawler(BaseCrawler):
             logger.info(f"列表頁共找到 {len(articles)} 篇文章")
             return articles
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"爬取列表頁失敗: {str(e)}")
             return []
@@ -146,14 +173,14 @@ class BaseballCrawler(BaseCrawler):
                         logger.warning(f"文章資訊不完整，跳過: title={title}, url={url}")
                         continue
 
-                    articles.append({
-                        'title': title,
-                        'url': url,
-                        'image_url': image_url,
-                        'news_source': news_source,
-                        'category': self.category_name,
-                        'section': 'ピックアップ'
-                    })
+                    articles.append(ArticleRecord(
+                        title=title,
+                        url=url,
+                        image_url=image_url,
+                        news_source=news_source,
+                        category=self.category_name,
+                        section='ピックアップ'
+                    ))
 
                     logger.debug(f"[ピックアップ] {title[:30]}... ({news_source})")
 
@@ -179,6 +206,7 @@ class BaseballCrawler(BaseCrawler):
 
             # 找到所有文章項目
             items = timeline_section.select('.sn-timeLine__item')
+            time_texts = []
 
             for item in items:
                 try:
@@ -234,24 +262,21 @@ class BaseballCrawler(BaseCrawler):
                     time_elem = item.select_one('.sn-timeLine__itemTime')
                     time_text = time_elem.text.strip() if time_elem else ''
 
-                    # 解析時間
-                    published_at = None
-                    if time_text:
-                        published_at = self._parse_japanese_datetime(time_text)
-
                     if not title or not url:
                         logger.warning(f"文章資訊不完整，跳過: title={title}, url={url}")
                         continue
 
-                    articles.append({
-                        'title': title,
-                        'url': url,
-                        'image_url': image_url,
-                        'news_source': news_source,
-                        'published_at': published_at,
-                        'category': self.category_name,
-                        'section': '新着記事'
-                    })
+                    # 時間在整頁解析完後批次處理
+                    time_texts.append(time_text)
+                    articles.append(ArticleRecord(
+                        title=title,
+                        url=url,
+                        image_url=image_url,
+                        news_source=news_source,
+                        published_at=None,
+                        category=self.category_name,
+                        section='新着記事'
+                    ))
 
                     logger.debug(f"[新着記事] {title[:30]}... ({news_source}, {time_text})")
 
@@ -259,6 +284,10 @@ class BaseballCrawler(BaseCrawler):
                     logger.error(f"解析 新着記事 文章項目失敗: {str(e)}")
                     continue
 
+            # 批次解析時間（同一頁使用相同的參考時間判斷跨年）
+            for article, published_at in zip(articles, self.date_parser.parse_many(time_texts)):
+                article['published_at'] = published_at
+
         except Exception as e:
             logger.error(f"爬取「新着記事」區域失敗: {str(e)}")
 
@@ -271,58 +300,21 @@ class BaseballCrawler(BaseCrawler):
         1. 「11/3(月) 12:00」→ datetime(2025, 11, 3, 12, 0)
         2. 「2025/11/4 11:56」→ datetime(2025, 11, 4, 11, 56)
         """
-        try:
-            # 移除星期幾（例如：(月)、(火)）
-            time_text = re.sub(r'\([^)]+\)', '', time_text).strip()
-
-            current_year = datetime.now().year
-
-            # 嘗試解析
-            if ' ' in time_text:
-                date_part, time_part = time_text.split(' ', 1)
-                date_components = date_part.split('/')
-
-                # 判斷格式：YYYY/MM/DD 或 MM/DD
-                if len(date_components) == 3:
-                    # 格式：2025/11/4 11:56
-                    year, month, day = map(int, date_components)
-                elif len(date_components) == 2:
-                    # 格式：11/4 11:56
-                    year = current_year
-                    month, day = map(int, date_components)
-                else:
-                    logger.warning(f"無法識別的日期格式: {date_part}")
-                    return None
-
-                hour, minute = map(int, time_part.split(':'))
-                return datetime(year, month, day, hour, minute)
-            else:
-                # 只有日期，沒有時間
-                date_components = time_text.split('/')
-
-                if len(date_components) == 3:
-                    # 格式：2025/11/4
-                    year, month, day = map(int, date_components)
-                elif len(date_components) == 2:
-                    # 格式：11/4
-                    year = current_year
-                    month, day = map(int, date_components)
-                else:
-                    logger.warning(f"無法識別的日期格式: {time_text}")
-                    return None
-
-                return datetime(year, month, day)
-
-        except Exception as e:
-            logger.warning(f"無法解析日期: {time_text}, 錯誤: {str(e)}")
-            return None
-
-    async def crawl_article(self, article_info: Dict) -> Optional[Dict]:
+        return self.date_parser.parse_japanese(time_text)
+
+    async def crawl_article(
+        self,
+        article_info: Dict,
+        deadline: Optional[Deadline] = None,
+        html: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         爬取文章內容
 
         Args:
             article_info: 從 crawl_list 返回的文章資訊
+            deadline: 時間預算（用完時拋出 DeadlineExceeded）
+            html: 預先抓取的頁面 HTML（有的話先嘗試解析，失敗再用瀏覽器載入）
 
         Returns:
             完整文章資料
@@ -330,16 +322,19 @@ class BaseballCrawler(BaseCrawler):
         url = article_info.get('url')
 
         try:
-            logger.info(f"開始爬取文章: {url}")
-
-            # 載入文章頁面
-            self.wait_and_get(url)
+            if html:
+                # 預先抓取的是未執行 JavaScript 的 HTML，只採用 JSON 資料
+                article_data = self._extract_from_json(BeautifulSoup(html, 'html.parser'), article_info)
+                if article_data:
+                    logger.info(f"成功爬取文章（預先抓取）: {article_data['title'][:30]}... ({len(article_data.get('content', ''))} 字)")
+                    return article_data
+                logger.debug(f"預先抓取的頁面無法解析，改用瀏覽器: {url}")
 
-            # 等待內容載入
-            time.sleep(random.uniform(2, 3))
+            logger.info(f"開始爬取文章: {url}")
 
-            # 取得頁面 HTML
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            # 載入文章頁面並等待內容載入
+            page_html = await self.fetch_page(url, deadline=deadline, wait_selector=ARTICLE_READY_SELECTOR, settle=(2, 3))
+            soup = BeautifulSoup(page_html, 'html.parser')
 
             # 嘗試從 JSON 資料中提取內容（Yahoo News 使用此方式）
             article_data = self._extract_from_json(soup, article_info)
@@ -358,6 +353,8 @@ class BaseballCrawler(BaseCrawler):
             logger.warning(f"無法提取文章內容: {url}")
             return None
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"爬取文章失敗 {url}: {str(e)}")
             return None
@@ -443,7 +440,7 @@ class BaseballCrawler(BaseCrawler):
                     content = '\n\n'.join(content_parts)
 
                     # 清理內容
-                    content = self.clean_content(content)
+                    content = self.content_cleaner.clean(content)
 
                     if not content:
                         logger.warning("從 JSON 提取的內容為空")
@@ -456,18 +453,19 @@ class BaseballCrawler(BaseCrawler):
                     # 提取描述
                     description = content[:200] + '...' if len(content) > 200 else content
 
-                    return {
-                        'url': article_info.get('url'),
-                        'title': title,
-                        'content': content,
-                        'description': description,
-                        'published_at': published_at,
-                        'image_url': image_url,
-                        'category': self.category_name,
-                        'reporter': None,
-                        'source': self.source_name,
-                        'news_source': news_source
-                    }
+                    return ArticleRecord.fill(
+                        article_info,
+                        url=article_info.get('url'),
+                        title=title,
+                        content=content,
+                        description=description,
+                        published_at=published_at,
+                        image_url=image_url,
+                        category=self.category_name,
+                        reporter=None,
+                        source=self.source_name,
+                        news_source=news_source
+                    )
 
         except Exception as e:
             logger.warning(f"從 JSON 提取文章內容失敗: {str(e)}")
@@ -545,7 +543,7 @@ class BaseballCrawler(BaseCrawler):
                 return None
 
             content = '\n\n'.join([p.text.strip() for p in paragraphs if p.text.strip()])
-            content = self.clean_content(content)
+            content = self.content_cleaner.clean(content)
 
             if not content:
                 return None
@@ -555,25 +553,26 @@ class BaseballCrawler(BaseCrawler):
 
             description = content[:200] + '...' if len(content) > 200 else content
 
-            return {
-                'url': article_info.get('url'),
-                'title': title,
-                'content': content,
-                'description': description,
-                'published_at': published_at,
-                'image_url': image_url,
-                'category': self.category_name,
-                'reporter': None,
-                'source': self.source_name,
-                'news_source': news_source
-            }
+            return ArticleRecord.fill(
+                article_info,
+                url=article_info.get('url'),
+                title=title,
+                content=content,
+                description=description,
+                published_at=published_at,
+                image_url=image_url,
+                category=self.category_name,
+                reporter=None,
+                source=self.source_name,
+                news_source=news_source
+            )
 
         except Exception as e:
             logger.warning(f"從 HTML 提取文章內容失敗: {str(e)}")
 
         return None
 
-    async def crawl(self, start_date=None, end_date=None, max_pages=1):
+    async def crawl(self, start_date=None, end_date=None, max_pages=1, deadline: Optional[Deadline] = None):
         """
         執行爬蟲主流程
 
@@ -581,12 +580,16 @@ class BaseballCrawler(BaseCrawler):
             start_date: 起始日期 (YYYY-MM-DD)
             end_date: 結束日期 (YYYY-MM-DD)
             max_pages: 最大爬取頁數（目前只爬首頁）
+            deadline: 整次排程的時間預算，會與來源的時間預算取較早者
 
         Returns:
-            文章列表
+            文章列表（時間預算用完時回傳已爬取的部分）
         """
+        deadline = Deadline.for_source(self.source_name, parent=deadline)
+        all_articles = []
+
         try:
-            self.setup_driver()
+            await self.open_browser()
 
             # 轉換日期格式
             if isinstance(start_date, str):
@@ -599,41 +602,87 @@ class BaseballCrawler(BaseCrawler):
             else:
                 end_date_obj = end_date
 
-            all_articles = []
-
             logger.info(f"開始爬取 {self.category_name} 新聞 (日期範圍: {start_date} ~ {end_date})")
 
             # 爬取列表頁
-            articles_list = await self.crawl_list(page=1)
+            articles_list = await self.crawl_list(page=1, deadline=deadline)
 
             if not articles_list:
                 logger.info("沒有找到文章")
                 return all_articles
 
-            # 爬取每篇文章的詳細內容
-            for article_info in articles_list:
-                # 日期過濾
-                article_date = article_info.get('published_at')
-
-                if article_date and start_date_obj and end_date_obj:
-                    article_date = article_date.date()
+            # 已轉載過的相同標題文章不需要再抓取內文
+            # （資料庫與 HTTP 查詢是同步的，在執行緒中進行以免阻塞其他爬蟲）
+            known_duplicates = await asyncio.to_thread(self.find_known_duplicates, articles_list)
+
+            # ピックアップ文章沒有發布時間，先以網址、資料庫等方式判斷日期
+            date_resolver = PickupDateResolver(db_lookup=lookup_dates, deadline=deadline)
+            try:
+                undated = await asyncio.to_thread(date_resolver.resolve, articles_list, start_date_obj, end_date_obj)
+                if undated:
+                    logger.info(f"{len(undated)} 篇文章無法預先判斷日期，將抓取內文")
+
+                # 先篩選出需要抓取內文的文章
+                to_fetch = []
+                for article_info in articles_list:
+                    original = known_duplicates.get(article_info.get('url'))
+
+                    # 日期過濾
+                    date_info = article_info
+                    if not article_info.get('published_at') and original:
+                        date_info = {**article_info, 'published_at': original['published_at']}
+
+                    if is_outside_range(date_info, start_date_obj, end_date_obj):
+                        logger.debug(f"文章日期不在範圍內，跳過: {article_info.get('url')}")
+                        continue
 
-                    if article_date < start_date_obj or article_date > end_date_obj:
-                        logger.debug(f"文章日期 {article_date} 不在範圍內，跳過")
+                    if original:
+                        all_articles.append(self.build_duplicate_article(article_info, original))
+                        logger.info(f"標題與文章 {original['id']} 相同，略過內文: {article_info.get('url')}")
                         continue
 
-                # 爬取文章詳細內容
-                article_data = await self.crawl_article(article_info)
+                    to_fetch.append(article_info)
 
-                if article_data:
-                    all_articles.append(article_data)
-                    logger.info(f"已爬取 {len(all_articles)} 篇文章")
-
-                # 防止請求過快
-                time.sleep(random.uniform(1, 2))
+                # 爬取每篇文章的詳細內容（可預先抓取接下來的文章）
+                depth = settings.CRAWLER_PREFETCH_DEPTH
+                prefetcher = ArticlePrefetcher(depth, deadline=deadline) if depth > 0 else None
+                try:
+                    for index, article_info in enumerate(to_fetch):
+                        deadline.check(article_info.get('url', ''))
+
+                        # 查詢日期時已下載的頁面不需要重新下載，也不需要預先抓取
+                        if prefetcher:
+                            prefetcher.schedule(
+                                info.get('url') for info in to_fetch[index:index + depth + 1]
+                                if not date_resolver.has_html(info.get('url'))
+                            )
+                        html = date_resolver.pop_html(article_info.get('url'))
+                        if prefetcher and not html:
+                            html = await prefetcher.get(article_info.get('url'))
+
+                        article_data = await self.crawl_article(article_info, deadline=deadline, html=html)
+
+                        if article_data:
+                            all_articles.append(article_data)
+                            logger.info(f"已爬取 {len(all_articles)} 篇文章")
+
+                        # 防止請求過快（預先抓取的請求由主機頻率限制器控制）
+                        if not html:
+                            await self._async_sleep(random.uniform(1, 2), deadline)
+                finally:
+                    if prefetcher:
+                        prefetcher.close()
+            finally:
+                date_resolver.close()
 
             logger.info(f"{self.category_name} 爬蟲完成，共爬取 {len(all_articles)} 篇文章")
             return all_articles
 
+        except DeadlineExceeded as e:
+            logger.warning(f"{str(e)}，停止爬取並保留已爬取的 {len(all_articles)} 篇文章")
+            return all_articles
+
         finally:
-            self.cleanup()
+            await self.close_browser()
+
+
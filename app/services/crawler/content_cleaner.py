@@ -0,0 +1,149 @@
+"""
+內容清理引擎
+預先編譯廣告文字比對規則，每個來源只建立一次
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# 預設廣告文字
+DEFAULT_AD_TEXTS: Tuple[str, ...] = (
+    "不用抽 不用搶 現在用APP看新聞 保證天天中獎",
+    "點我下載APP",
+    "按我看活動辦法",
+    "請繼續往下閱讀...",
+    "Subscribe to our Telegram channel",
+    "Click to subscribe",
+    "Follow us on",
+    "For the latest property news",
+)
+
+
+def _texts_interact(texts: Sequence[str]) -> bool:
+    """
+    檢查廣告文字之間是否互相重疊（包含或前後綴相接，含自身）
+
+    互不重疊時，一次性的多重比對與逐一 str.replace 的結果相同。
+    """
+    for i, a in enumerate(texts):
+        for j, b in enumerate(texts):
+            if i != j and a in b:
+                return True
+            # a 的後綴等於 b 的前綴
+            for size in range(1, min(len(a), len(b))):
+                if a[-size:] == b[:size]:
+                    return True
+    return False
+
+
+def clean_content_reference(content: str, ad_texts: List[str] = None) -> str:
+    """
+    原始的內容清理實作
+
+    保留作為 ContentCleaner 的比對基準，請勿在爬取流程中使用。
+    """
+    if not content:
+        return ""
+
+    ad_texts = ad_texts or []
+    all_ads = list(DEFAULT_AD_TEXTS) + ad_texts
+
+    # 移除廣告文字
+    for ad in all_ads:
+        content = content.replace(ad, "")
+
+    # 移除多餘的空白行
+    lines = [line.strip() for line in content.split('\n')]
+    lines = [line for line in lines if line]
+
+    # 移除重複的行
+    lines = list(dict.fromkeys(lines))
+
+    # 重新組合內容
+    content = '\n'.join(lines)
+
+    # 移除連續的空格
+    content = re.sub(r'\s+', ' ', content).strip()
+
+    return content
+
+
+class ContentCleaner:
+    """
+    預先編譯的內容清理器
+
+    - 所有廣告文字合併成單一正規表示式，一次掃描全部移除
+    - 單次走訪完成空白行移除、重複行移除與空白正規化
+    - 輸出與 clean_content_reference 完全相同
+    """
+
+    def __init__(self, ad_texts: Iterable[str] = ()):
+        # 保留原本的順序與重複項目，逐一取代時結果才會一致
+        self.ad_texts: Tuple[str, ...] = DEFAULT_AD_TEXTS + tuple(ad for ad in ad_texts if ad)
+
+        # 廣告文字互相重疊時，逐一取代的順序會影響結果，改用原始的逐一取代
+        self._sequential = _texts_interact(self.ad_texts)
+        self._pattern = re.compile('|'.join(re.escape(ad) for ad in self.ad_texts))
+
+    def remove_ads(self, content: str) -> str:
+        """移除廣告文字"""
+        if self._sequential:
+            for ad in self.ad_texts:
+                content = content.replace(ad, "")
+            return content
+
+        removed = self._pattern.sub("", content)
+        # 移除後前後文字接合成新的廣告文字時，依原本順序逐一取代
+        if removed is not content and self._pattern.search(removed):
+            for ad in self.ad_texts:
+                content = content.replace(ad, "")
+            return content
+        return removed
+
+    def clean(self, content: str) -> str:
+        """清理單篇內容"""
+        if not content:
+            return ""
+
+        content = self.remove_ads(content)
+
+        # 單次走訪：去除空白行與重複行
+        seen = set()
+        lines = []
+        for line in content.split('\n'):
+            line = line.strip()
+            if line and line not in seen:
+                seen.add(line)
+                lines.append(line)
+
+        # 行與行之間以及行內的連續空白都會合併成單一空格
+        return ' '.join(' '.join(lines).split())
+
+    def clean_many(self, contents: Iterable[Optional[str]]) -> List[str]:
+        """批次清理內容（用於重新處理已儲存的文章）"""
+        clean = self.clean
+        return [clean(content) for content in contents]
+
+
+@lru_cache(maxsize=64)
+def _cached_cleaner(ad_texts: Tuple[str, ...]) -> ContentCleaner:
+    return ContentCleaner(ad_texts)
+
+
+def get_cleaner(ad_texts: Optional[Iterable[str]] = None) -> ContentCleaner:
+    """取得對應廣告文字組合的清理器（相同組合共用同一個實例）"""
+    return _cached_cleaner(tuple(ad_texts or ()))
+
+
+def get_source_cleaner(source_name: str, extra_ad_texts: Optional[Iterable[str]] = None) -> ContentCleaner:
+    """
+    取得指定來源的清理器
+
+    廣告文字 = 預設廣告文字 + NEWS_SOURCES[來源]['ad_texts'] + extra_ad_texts
+    """
+    source_info = settings.NEWS_SOURCES.get(source_name, {})
+    ad_texts = list(source_info.get('ad_texts', []))
+    ad_texts.extend(extra_ad_texts or [])
+    return get_cleaner(ad_texts)
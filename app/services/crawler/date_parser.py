@@ -0,0 +1,180 @@
+"""
+日期解析元件
+以預先編譯的正規表示式處理常見的 Yahoo 日期格式，並記住各來源上次成功的格式
+"""
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 列表頁與文章頁的日文日期：「11/3(月) 12:00」、「2025/11/4 11:56」、「2025/11/4」
+JAPANESE_DATE_RE = re.compile(
+    r'^(?:(\d{4})/)?(\d{1,2})/(\d{1,2})'
+    r'(?:\s*\([^)]*\)\s*|\s+|$)'
+    r'(?:(\d{1,2}):(\d{2})(?::(\d{2}))?)?$'
+)
+
+# 數字日期：「2025-01-01 12:00:00」、「2025/01/01 12:00」、「2025-01-01」
+NUMERIC_DATE_RE = re.compile(
+    r'^(\d{4})([-/])(\d{1,2})\2(\d{1,2})'
+    r'(?: (\d{1,2}):(\d{2})(?::(\d{2}))?)?$'
+)
+
+# 通用日期格式（依序嘗試）
+DATE_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',  # 2025-01-01 12:00:00
+    '%Y-%m-%d %H:%M',     # 2025-01-01 12:00
+    '%Y-%m-%d',           # 2025-01-01
+    '%Y/%m/%d %H:%M:%S',  # 2025/01/01 12:00:00
+    '%Y/%m/%d %H:%M',     # 2025/01/01 12:00
+    '%Y/%m/%d',           # 2025/01/01
+    '%d %b %Y',           # 01 Jan 2025
+    '%B %d, %Y',          # January 01, 2025
+    '%b %d, %Y',          # Jan 01, 2025
+    '%d/%m/%Y',           # 01/01/2025
+    '%m/%d/%Y',           # 01/01/2025
+]
+
+# 與較前面的格式可能解析出不同結果的格式，不列入快取，維持原本的優先順序
+AMBIGUOUS_FORMATS = {'%m/%d/%Y'}
+
+# 沒有年份的日期允許比參考時間晚多少（日本與台灣時差及排程誤差）
+FUTURE_TOLERANCE = timedelta(days=1)
+
+# 日期文字中可能夾帶的干擾文字
+NOISE_MARKERS = ["|", "Updated", "發布", "更新"]
+
+
+def resolve_year(month: int, day: int, reference: datetime,
+                 hour: int = 0, minute: int = 0, second: int = 0) -> Optional[datetime]:
+    """
+    為沒有年份的日期選擇年份
+
+    新聞列表只會出現過去的文章，選擇不晚於 reference（容許時差）的最近日期。
+    例如 1 月初看到「12/31」會判斷為去年；台灣時間 12/31 23:00 看到日本時間「1/1 0:10」會判斷為明年。
+    """
+    latest_allowed = reference + FUTURE_TOLERANCE
+    # 只有 12 月看到 1 月的日期時才可能是明年
+    year = reference.year + 1 if reference.month == 12 and month == 1 else reference.year
+    for year in (year, year - 1, year - 2, year - 3, year - 4):
+        try:
+            candidate = datetime(year, month, day, hour, minute, second)
+        except ValueError:
+            # 例如非閏年的 2/29，繼續往前找
+            continue
+        if candidate <= latest_allowed:
+            return candidate
+    return None
+
+
+class DateParser:
+    """
+    日期解析器
+
+    - 常見的 Yahoo 日期格式走預先編譯的正規表示式，不需要逐一嘗試 strptime
+    - 其他格式依序嘗試 DATE_FORMATS，並優先使用該來源上次成功的格式
+    - 沒有年份的日期會依照參考時間處理跨年
+    """
+
+    def __init__(self, source_name: str = ''):
+        self.source_name = source_name
+        self.last_format: Optional[str] = None
+
+    def parse_japanese(self, time_text: str, reference: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        解析日文日期時間格式
+        1. 「11/3(月) 12:00」→ datetime(2025, 11, 3, 12, 0)
+        2. 「2025/11/4 11:56」→ datetime(2025, 11, 4, 11, 56)
+        """
+        if not time_text:
+            return None
+
+        match = JAPANESE_DATE_RE.match(time_text.strip())
+        if not match:
+            # 非常見格式時改用通用日期解析
+            return self.parse(time_text)
+
+        year, month, day, hour, minute, second = match.groups()
+        try:
+            if hour is None:
+                hour = minute = second = 0
+            else:
+                hour, minute, second = int(hour), int(minute), int(second or 0)
+            if year:
+                return datetime(int(year), int(month), int(day), hour, minute, second)
+            return resolve_year(int(month), int(day), reference or datetime.now(), hour, minute, second)
+        except ValueError as e:
+            logger.warning(f"無法解析日期: {time_text}, 錯誤: {str(e)}")
+            return None
+
+    def parse(self, date_text: str) -> Optional[datetime]:
+        """
+        統一的日期解析邏輯，支援多種日期格式
+
+        Args:
+            date_text: 日期文字
+
+        Returns:
+            datetime 物件或 None
+        """
+        if not date_text:
+            return None
+
+        # 清理日期文字
+        date_text = date_text.strip()
+
+        # 移除可能的干擾文字
+        for remove_text in NOISE_MARKERS:
+            if remove_text in date_text:
+                date_text = date_text.split(remove_text)[0].strip()
+
+        # 快速路徑：數字日期
+        match = NUMERIC_DATE_RE.match(date_text)
+        if match:
+            year, _, month, day, hour, minute, second = match.groups()
+            time_args = [int(v) for v in (hour, minute, second) if v is not None]
+            try:
+                return datetime(int(year), int(month), int(day), *time_args)
+            except ValueError:
+                pass
+
+        # 先試上次成功的格式，再依序嘗試其他格式
+        formats = DATE_FORMATS
+        last_format = self.last_format
+        if last_format:
+            formats = [last_format] + [f for f in DATE_FORMATS if f != last_format]
+
+        for date_format in formats:
+            try:
+                parsed = datetime.strptime(date_text, date_format)
+            except ValueError:
+                continue
+            if date_format not in AMBIGUOUS_FORMATS:
+                self.last_format = date_format
+            return parsed
+
+        logger.warning(f"無法解析日期: {date_text}")
+        return None
+
+    def parse_many(self, time_texts: Iterable[Optional[str]], reference: Optional[datetime] = None) -> List[Optional[datetime]]:
+        """
+        批次解析整個列表頁的日期
+
+        同一頁使用同一個參考時間，跨年判斷在整頁內保持一致。
+        """
+        reference = reference or datetime.now()
+        parse = self.parse_japanese
+        return [parse(text, reference) if text else None for text in time_texts]
+
+
+_parsers: Dict[str, DateParser] = {}
+
+
+def get_date_parser(source_name: str = '') -> DateParser:
+    """取得指定來源的日期解析器（每個來源共用一個實例）"""
+    parser = _parsers.get(source_name)
+    if parser is None:
+        parser = _parsers.setdefault(source_name, DateParser(source_name))
+    return parser
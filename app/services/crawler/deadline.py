@@ -0,0 +1,82 @@
+"""
+爬蟲時間預算
+每個來源有各自的截止時間，從 crawl 一路傳到 wait_and_get，時間用完就停止並保留已爬到的文章
+"""
+import logging
+import time
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """爬蟲時間預算已用完"""
+    pass
+
+
+class Deadline:
+    """
+    截止時間（以 time.monotonic 計算，不受系統時間調整影響）
+
+    seconds 為 None 或 <= 0 時表示不限時間。
+    """
+
+    def __init__(self, seconds: Optional[float] = None, name: str = ''):
+        self.name = name
+        self.expires_at: Optional[float] = time.monotonic() + seconds if seconds and seconds > 0 else None
+
+    @classmethod
+    def for_source(cls, source_name: str, parent: Optional['Deadline'] = None) -> 'Deadline':
+        """
+        依設定建立來源的截止時間
+
+        CRAWLER_SOURCE_TIME_BUDGETS 有設定時優先使用，否則使用 CRAWLER_TIME_BUDGET_SECONDS。
+        有整體排程的截止時間（parent）時取較早者。
+        """
+        seconds = settings.CRAWLER_SOURCE_TIME_BUDGETS.get(source_name, settings.CRAWLER_TIME_BUDGET_SECONDS)
+        deadline = cls(seconds, name=source_name)
+        if parent is not None and parent.expires_at is not None:
+            if deadline.expires_at is None or parent.expires_at < deadline.expires_at:
+                deadline.expires_at = parent.expires_at
+        return deadline
+
+    def remaining(self) -> Optional[float]:
+        """剩餘秒數，不限時間時回傳 None"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, action: str = '') -> None:
+        """時間用完時拋出 DeadlineExceeded"""
+        if self.expired:
+            raise DeadlineExceeded(f"{self.name or 'crawler'} 時間預算已用完{f'（{action}）' if action else ''}")
+
+    def cap(self, seconds: float) -> float:
+        """將等待時間限制在剩餘時間內"""
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def sleep(self, seconds: float) -> None:
+        """等待，但不超過截止時間"""
+        seconds = self.cap(seconds)
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def stop_at_deadline(retry_state) -> bool:
+    """
+    tenacity 停止條件：從呼叫參數取得 deadline，時間用完或下次重試前的等待會超過截止時間時停止重試
+    """
+    deadline = retry_state.kwargs.get('deadline')
+    if deadline is None:
+        return False
+    remaining = deadline.remaining()
+    if remaining is None:
+        return False
+    return remaining <= getattr(retry_state, 'upcoming_sleep', 0)
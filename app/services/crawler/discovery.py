@@ -0,0 +1,226 @@
+"""
+文章探索策略
+決定如何取得來源的文章列表：瀏覽器渲染的列表頁，或是輕量的 RSS/Atom feed
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit, urlunsplit
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import pytz
+import requests
+
+from app.core.config import settings
+from app.schemas.article_record import ArticleRecord
+from app.services.crawler.deadline import Deadline, DeadlineExceeded
+from app.services.crawler.prefetch import get_host_limiter
+
+if TYPE_CHECKING:
+    from app.services.crawler.base import BaseCrawler
+
+logger = logging.getLogger(__name__)
+
+JST = pytz.timezone('Asia/Tokyo')
+
+FEED_SECTION = 'フィード'
+FEED_CHUNK_SIZE = 16 * 1024
+
+
+class DiscoveryStrategy(ABC):
+    """文章探索策略：回傳與 _crawl_timeline_section 相同格式的文章資訊"""
+
+    name = ''
+
+    @abstractmethod
+    async def discover(self, crawler: 'BaseCrawler', page: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
+        pass
+
+
+class RenderedListDiscovery(DiscoveryStrategy):
+    """以瀏覽器載入列表頁（原本的方式）"""
+
+    name = 'rendered'
+
+    async def discover(self, crawler: 'BaseCrawler', page: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
+        return await crawler.crawl_rendered_list(page, deadline=deadline)
+
+
+def _local_name(tag: str) -> str:
+    """去除 XML 命名空間：{http://www.w3.org/2005/Atom}entry → entry"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _strip_query(url: str) -> str:
+    """移除 ?source=rss 等追蹤參數，與列表頁的網址一致"""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+
+
+def _parse_feed_date(text: Optional[str]) -> Optional[datetime]:
+    """解析 RSS（RFC 822）或 Atom（ISO 8601）日期，轉成日本時間（不含時區）"""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(JST).replace(tzinfo=None)
+    return parsed
+
+
+def _item_to_article(item: Element, category: str) -> Optional[Dict]:
+    """將 RSS item / Atom entry 轉成文章資訊"""
+    title = url = image_url = news_source = ''
+    published_at = None
+
+    for child in item:
+        name = _local_name(child.tag)
+        text = (child.text or '').strip()
+        if name == 'title':
+            title = text
+        elif name == 'link':
+            # Atom 的 link 在 href 屬性
+            href = child.get('href')
+            if href and child.get('rel', 'alternate') == 'alternate':
+                url = href
+            elif text:
+                url = text
+        elif name == 'guid' and not url and text.startswith('http'):
+            url = text
+        elif name in ('pubDate', 'published', 'updated', 'date') and not published_at:
+            published_at = _parse_feed_date(text)
+        elif name in ('enclosure', 'thumbnail', 'content') and not image_url:
+            media_url = child.get('url', '')
+            if media_url and (name != 'enclosure' or child.get('type', 'image').startswith('image')):
+                image_url = media_url
+        elif name in ('source', 'creator', 'author') and not news_source:
+            news_source = text or ''.join(child.itertext()).strip()
+
+    if not title or not url:
+        return None
+
+    return ArticleRecord(
+        title=title,
+        url=_strip_query(url),
+        image_url=image_url,
+        published_at=published_at,
+        news_source=news_source,
+        category=category,
+        section=FEED_SECTION,
+    )
+
+
+def parse_feed(chunks: Iterable[bytes], category: str = '') -> List[Dict]:
+    """
+    以串流方式解析 RSS/Atom feed
+
+    每解析完一個 item/entry 就轉換並釋放，不需要把整份文件建成樹狀結構。
+    """
+    parser = XMLPullParser(events=('end',))
+    articles = []
+    seen = set()
+
+    def drain():
+        for _, elem in parser.read_events():
+            if _local_name(elem.tag) in ('item', 'entry'):
+                article = _item_to_article(elem, category)
+                if article and article['url'] not in seen:
+                    seen.add(article['url'])
+                    articles.append(article)
+                elem.clear()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        drain()
+    parser.close()
+    drain()
+    return articles
+
+
+class FeedDiscovery(DiscoveryStrategy):
+    """以一次 HTTP 請求取得 RSS/Atom feed"""
+
+    name = 'feed'
+
+    def __init__(self, feed_url: str, session: Optional[requests.Session] = None):
+        self.feed_url = feed_url
+        self.session = session
+
+    async def discover(self, crawler: 'BaseCrawler', page: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
+        if deadline:
+            deadline.check(self.feed_url)
+
+        # 頻率限制的等待、下載與解析都是同步的，在執行緒中進行以免阻塞事件迴圈
+        articles = await asyncio.to_thread(self._fetch, getattr(crawler, 'category_name', ''), deadline)
+
+        logger.info(f"{crawler.source_name} feed 找到 {len(articles)} 篇文章: {self.feed_url}")
+        return articles
+
+    def _fetch(self, category: str, deadline: Optional[Deadline]) -> List[Dict]:
+        """下載並解析 feed"""
+        get_host_limiter().wait(self.feed_url, deadline)
+
+        timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT
+        if deadline:
+            timeout = max(1, deadline.cap(timeout))
+
+        session = self.session or requests.Session()
+        try:
+            with session.get(
+                self.feed_url,
+                timeout=timeout,
+                stream=True,
+                headers={'User-Agent': settings.CRAWLER_USER_AGENT}
+            ) as response:
+                response.raise_for_status()
+                return parse_feed(response.iter_content(chunk_size=FEED_CHUNK_SIZE), category)
+        finally:
+            if self.session is None:
+                session.close()
+
+
+class FallbackDiscovery(DiscoveryStrategy):
+    """依序嘗試多個策略，失敗或沒有文章時改用下一個"""
+
+    def __init__(self, strategies: List[DiscoveryStrategy]):
+        self.strategies = strategies
+        self.name = '+'.join(strategy.name for strategy in strategies)
+
+    async def discover(self, crawler: 'BaseCrawler', page: int = 1, deadline: Optional[Deadline] = None) -> List[Dict]:
+        for index, strategy in enumerate(self.strategies):
+            is_last = index == len(self.strategies) - 1
+            try:
+                articles = await strategy.discover(crawler, page, deadline=deadline)
+            except DeadlineExceeded:
+                raise
+            except (requests.RequestException, ParseError) as e:
+                if is_last:
+                    raise
+                logger.warning(f"{crawler.source_name} {strategy.name} 探索失敗，改用下一個方式: {str(e)}")
+                continue
+            if articles or is_last:
+                return articles
+            logger.warning(f"{crawler.source_name} {strategy.name} 沒有找到文章，改用下一個方式")
+        return []
+
+
+def get_feed_url(source_name: str) -> Optional[str]:
+    """來源的 feed 網址：CRAWLER_FEED_URLS 優先，其次為 NEWS_SOURCES[來源]['feed_url']"""
+    return settings.CRAWLER_FEED_URLS.get(source_name) or settings.NEWS_SOURCES.get(source_name, {}).get('feed_url')
+
+
+def get_discovery(source_name: str) -> DiscoveryStrategy:
+    """取得來源的探索策略：有設定 feed 時優先使用 feed，失敗時改用列表頁"""
+    feed_url = get_feed_url(source_name) if settings.CRAWLER_FEED_DISCOVERY else None
+    if feed_url:
+        return FallbackDiscovery([FeedDiscovery(feed_url), RenderedListDiscovery()])
+    return RenderedListDiscovery()
@@ -0,0 +1,159 @@
+"""
+Chromium driver 生命週期管理
+長時間使用的 Chromium 會累積記憶體，當機的 session 也會留下孤兒 chromium / chromedriver Process：
+
+- 依載入頁數與 Process 樹的記憶體決定是否重新建立 driver
+- 偵測已失效的 session
+- 結束 driver 時一併結束整個 Process 樹，並回收殭屍 Process
+"""
+import logging
+import os
+from typing import Iterable, List, Optional
+
+import psutil
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+logger = logging.getLogger(__name__)
+
+BROWSER_PROCESS_NAMES = {'chromium', 'chromium-browser', 'chrome', 'chromedriver', 'chrome_crashpad_handler'}
+
+# WebDriver 錯誤訊息中表示瀏覽器已當機或 session 已失效的字串
+CRASH_MARKERS = (
+    'invalid session id',
+    'session deleted',
+    'chrome not reachable',
+    'disconnected',
+    'no such window',
+    'tab crashed',
+)
+
+
+class BrowserCrashed(Exception):
+    """瀏覽器 session 已失效（driver 已重新建立，可以重試）"""
+    pass
+
+
+def is_crash_error(error: Exception) -> bool:
+    """判斷 WebDriver 錯誤是否表示瀏覽器已當機"""
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or str(error)).lower()
+        return any(marker in message for marker in CRASH_MARKERS)
+    return isinstance(error, ConnectionError)
+
+
+def driver_pid(driver) -> Optional[int]:
+    """chromedriver 的 Process ID（無法取得時回傳 None）"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def is_driver_alive(driver) -> bool:
+    """chromedriver Process 是否仍在執行（無法判斷時視為執行中）"""
+    try:
+        return driver.service.process.poll() is None
+    except AttributeError:
+        return True
+
+
+def _process_tree(pid: int) -> List[psutil.Process]:
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def process_tree_rss_mb(pid: Optional[int]) -> float:
+    """Process 與所有子 Process 的常駐記憶體（MB）"""
+    if pid is None:
+        return 0.0
+    total = 0
+    for process in _process_tree(pid):
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def kill_process_tree(pid: Optional[int], timeout: float = 3) -> int:
+    """
+    結束 Process 與所有子 Process（先 terminate，逾時再 kill）
+
+    Returns:
+        int: 結束的 Process 數量
+    """
+    if pid is None:
+        return 0
+    processes = [p for p in _process_tree(pid) if p.is_running()]
+    return _terminate(processes, timeout)
+
+
+def _terminate(processes: Iterable[psutil.Process], timeout: float) -> int:
+    processes = list(processes)
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.Error:
+            continue
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            continue
+    if alive:
+        psutil.wait_procs(alive, timeout=timeout)
+    return len(processes)
+
+
+def _is_browser(process: psutil.Process) -> bool:
+    try:
+        return process.name() in BROWSER_PROCESS_NAMES
+    except psutil.Error:
+        return False
+
+
+def reap_zombies() -> int:
+    """回收目前 Process 底下已結束的瀏覽器子 Process（不影響 multiprocessing 的子 Process）"""
+    reaped = 0
+    for child in psutil.Process().children():
+        try:
+            if child.status() != psutil.STATUS_ZOMBIE or not _is_browser(child):
+                continue
+            os.waitpid(child.pid, os.WNOHANG)
+            reaped += 1
+        except (psutil.Error, ChildProcessError):
+            continue
+    return reaped
+
+
+def reap_orphan_browsers(timeout: float = 3) -> int:
+    """
+    結束孤兒瀏覽器 Process 並回收殭屍 Process
+
+    chromedriver 當機後，chromium 會被轉給 PID 1（或目前 Process 為 PID 1 時直接成為子 Process），
+    只有父 Process 為 PID 1 的瀏覽器 Process 才會被結束，其他爬蟲 Process 使用中的瀏覽器不受影響。
+    """
+    own_pid = os.getpid()
+    orphans = []
+    for process in psutil.process_iter(['name', 'ppid', 'status']):
+        info = process.info
+        if info['name'] not in BROWSER_PROCESS_NAMES or info['status'] == psutil.STATUS_ZOMBIE:
+            continue
+        if info['ppid'] != 1:
+            continue
+        # 目前 Process 為 PID 1（容器內沒有 init）時，只處理已經沒有父 chromedriver 的 chromium
+        if own_pid == 1 and info['name'] == 'chromedriver':
+            continue
+        orphans.append(process)
+
+    killed = _terminate(orphans, timeout) if orphans else 0
+    reaped = reap_zombies()
+    if killed or reaped:
+        logger.warning(f"已結束 {killed} 個孤兒瀏覽器 Process，回收 {reaped} 個殭屍 Process")
+    return killed
@@ -0,0 +1,241 @@
+"""
+ピックアップ文章的日期判斷
+ピックアップ區域沒有發布時間，在抓取內文前先用較便宜的方式判斷日期，只抓取日期範圍內的文章
+"""
+import logging
+import re
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pytz
+import requests
+
+from app.core.config import settings
+from app.services.crawler.deadline import Deadline
+from app.services.crawler.prefetch import get_host_limiter
+
+logger = logging.getLogger(__name__)
+
+JST = pytz.timezone('Asia/Tokyo')
+
+# 網址或檔名中的日期：「/detail/20251104-00000-spnannex」、「/column/detail/202511040001-spnavi」
+URL_DATE_RE = re.compile(r'(?<!\d)(20\d{2})(\d{2})(\d{2})(?:\d{2,6})?(?!\d)')
+
+# 文章頁面中的發布時間
+META_DATE_RES = [
+    re.compile(r'<meta[^>]+property="article:published_time"[^>]+content="([^"]+)"'),
+    re.compile(r'"datePublished"\s*:\s*"([^"]+)"'),
+]
+CREATE_DATE_RE = re.compile(r'"createDate"\s*:\s*\{[^}]*?"date"\s*:\s*"([^"]+)"[^}]*?"time"\s*:\s*"([^"]+)"')
+
+# 頁面內容查詢結果快取（同一個 Process 內的排程共用）
+METADATA_CACHE_SIZE = 2048
+_metadata_cache: 'OrderedDict[str, Optional[datetime]]' = OrderedDict()
+
+
+def date_from_url(url: Optional[str]) -> Optional[date]:
+    """從網址或檔名解析日期（找不到或不是合法日期時回傳 None）"""
+    if not url:
+        return None
+    for match in URL_DATE_RE.finditer(url):
+        try:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # 資料庫儲存日本時間（不含時區）
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(JST).replace(tzinfo=None)
+    return parsed
+
+
+def published_at_from_html(html: str) -> Optional[datetime]:
+    """從文章頁面的 meta 標籤或 JSON 資料取得發布時間"""
+    for pattern in META_DATE_RES:
+        match = pattern.search(html)
+        if match:
+            parsed = _parse_iso(match.group(1))
+            if parsed:
+                return parsed
+
+    match = CREATE_DATE_RE.search(html)
+    if match:
+        from app.services.crawler.date_parser import get_date_parser
+        return get_date_parser().parse_japanese(f"{match.group(1)} {match.group(2)}")
+    return None
+
+
+def is_outside_range(article_info: Dict, start: Optional[date], end: Optional[date]) -> bool:
+    """
+    依已知的日期資訊判斷文章是否確定在日期範圍外
+
+    - published_at / published_date：確定的發布日期
+    - earliest_date：發布日期的下限（例如圖片日期），只能判斷是否晚於範圍
+    """
+    if not start or not end:
+        return False
+
+    published = article_info.get('published_at')
+    published = published.date() if published else article_info.get('published_date')
+    if published:
+        return published < start or published > end
+
+    earliest = article_info.get('earliest_date')
+    return bool(earliest and earliest > end)
+
+
+class PickupDateResolver:
+    """
+    依序以下列方式判斷沒有發布時間的文章日期（越前面越便宜）
+
+    1. 同一頁「新着記事」的相同文章
+    2. 資料庫中已儲存的相同網址
+    3. 網址中的日期（確定）與圖片網址中的日期（發布日期的下限）
+    4. 頁面內容查詢（CRAWLER_PICKUP_METADATA_LOOKUP，結果快取，下載的 HTML 可直接用於解析內文）
+    """
+
+    def __init__(
+        self,
+        db_lookup: Optional[Callable[[List[str]], Dict[str, datetime]]] = None,
+        metadata_lookup: Optional[bool] = None,
+        deadline: Optional[Deadline] = None,
+        session: Optional[requests.Session] = None
+    ):
+        self.db_lookup = db_lookup
+        self.metadata_lookup = settings.CRAWLER_PICKUP_METADATA_LOOKUP if metadata_lookup is None else metadata_lookup
+        self.deadline = deadline
+        self.session = session
+        self._html: Dict[str, str] = {}
+
+    def resolve(
+        self,
+        articles: List[Dict],
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        為沒有發布時間的文章補上日期資訊（直接修改傳入的文章資訊）
+
+        Returns:
+            list: 仍無法判斷日期的文章
+        """
+        pending = [a for a in articles if not a.get('published_at') and a.get('url')]
+        if not pending:
+            return []
+
+        # 1. 同一頁「新着記事」
+        known = {a['url']: a['published_at'] for a in articles if a.get('published_at') and a.get('url')}
+        pending = self._apply(pending, known, 'timeline')
+
+        # 2. 資料庫
+        if pending and self.db_lookup:
+            try:
+                pending = self._apply(pending, self.db_lookup([a['url'] for a in pending]), 'database')
+            except Exception as e:
+                logger.warning(f"查詢已儲存文章日期失敗: {str(e)}")
+
+        # 3. 網址與圖片網址中的日期
+        unresolved = []
+        for article_info in pending:
+            url_date = date_from_url(article_info['url'])
+            if url_date:
+                article_info['published_date'] = url_date
+                continue
+            image_date = date_from_url(article_info.get('image_url'))
+            if image_date:
+                article_info['earliest_date'] = image_date
+            unresolved.append(article_info)
+
+        # 4. 頁面內容查詢（已確定在範圍外的不查）
+        if self.metadata_lookup:
+            remaining = []
+            for article_info in unresolved:
+                if is_outside_range(article_info, start, end):
+                    continue
+                published_at = self._lookup_metadata(article_info['url'])
+                if published_at:
+                    article_info['published_at'] = published_at
+                else:
+                    remaining.append(article_info)
+            unresolved = remaining
+
+        resolved_count = len(pending) - len(unresolved)
+        if resolved_count:
+            logger.debug(f"以網址或頁面資料判斷 {resolved_count} 篇文章日期")
+        return unresolved
+
+    def _apply(self, pending: List[Dict], dates: Dict[str, datetime], source: str) -> List[Dict]:
+        remaining = []
+        for article_info in pending:
+            published_at = dates.get(article_info['url'])
+            if published_at:
+                article_info['published_at'] = published_at
+            else:
+                remaining.append(article_info)
+        matched = len(pending) - len(remaining)
+        if matched:
+            logger.debug(f"從 {source} 找到 {matched} 篇ピックアップ文章的日期")
+        return remaining
+
+    def _lookup_metadata(self, url: str) -> Optional[datetime]:
+        if url in _metadata_cache:
+            _metadata_cache.move_to_end(url)
+            return _metadata_cache[url]
+        if self.deadline and self.deadline.expired:
+            return None
+
+        published_at = None
+        try:
+            get_host_limiter().wait(url, self.deadline)
+            if self.session is None:
+                self.session = requests.Session()
+                self.session.headers['User-Agent'] = settings.CRAWLER_USER_AGENT
+            timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT
+            if self.deadline:
+                timeout = max(1, self.deadline.cap(timeout))
+            response = self.session.get(url, timeout=timeout)
+            if response.status_code == 200:
+                published_at = published_at_from_html(response.text)
+                self._html[url] = response.text
+        except requests.RequestException as e:
+            logger.debug(f"查詢文章日期失敗 {url}: {str(e)}")
+            return None
+
+        _metadata_cache[url] = published_at
+        if len(_metadata_cache) > METADATA_CACHE_SIZE:
+            _metadata_cache.popitem(last=False)
+        return published_at
+
+    def has_html(self, url: Optional[str]) -> bool:
+        """查詢日期時是否已下載該網址的 HTML（不需要預先抓取）"""
+        return bool(url) and url in self._html
+
+    def pop_html(self, url: Optional[str]) -> Optional[str]:
+        """取出查詢日期時下載的 HTML（可直接用於解析內文，避免重複下載）"""
+        return self._html.pop(url, None) if url else None
+
+    def close(self) -> None:
+        self._html.clear()
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+
+def lookup_dates(urls: Iterable[str]) -> Dict[str, datetime]:
+    """從資料庫查詢已儲存文章的發布時間"""
+    from app.core.database import SessionLocal
+    from app.core.db_utils import find_published_dates
+
+    session = SessionLocal()
+    try:
+        return find_published_dates(session, urls)
+    finally:
+        session.close()
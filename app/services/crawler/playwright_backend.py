@@ -0,0 +1,200 @@
+"""
+Playwright 瀏覽器後端
+所有爬蟲共用同一個 Chromium，每個爬蟲使用獨立的 browser context，導覽與等待都是可 await 的非同步操作
+
+只有在 CRAWLER_BROWSER_BACKEND = "playwright" 時才會載入此模組。
+"""
+import asyncio
+import logging
+import random
+import weakref
+from typing import Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    retry_if_exception_type,
+    before_sleep_log
+)
+
+from app.core.config import settings
+from app.services.crawler.deadline import Deadline, stop_at_deadline
+from app.services.crawler.prefetch import get_host_limiter
+
+logger = logging.getLogger(__name__)
+
+# 不需要下載的資源類型
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+
+
+class SharedBrowser:
+    """
+    同一個事件迴圈內共用的 Chromium
+
+    第一個爬蟲開啟時啟動，最後一個爬蟲關閉時結束；同時使用的 context 數量受 MAX_CONCURRENT_CRAWLERS 限制。
+    """
+
+    def __init__(self):
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._users = 0
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(settings.MAX_CONCURRENT_CRAWLERS)
+
+    async def acquire(self) -> Browser:
+        async with self._lock:
+            self._users += 1
+            if self._browser is None:
+                try:
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(
+                        executable_path=settings.CHROME_BIN,
+                        headless=settings.CHROME_HEADLESS,
+                        args=[
+                            '--no-sandbox',
+                            '--disable-dev-shm-usage',
+                            '--disable-gpu',
+                            '--disable-extensions',
+                            '--disable-notifications',
+                        ]
+                    )
+                    logger.info(f"Playwright Chromium 已啟動: {settings.CHROME_BIN}")
+                except Exception:
+                    self._users -= 1
+                    await self._stop()
+                    raise
+        await self._slots.acquire()
+        return self._browser
+
+    async def release(self) -> None:
+        self._slots.release()
+        async with self._lock:
+            self._users -= 1
+            if self._users <= 0:
+                self._users = 0
+                await self._stop()
+
+    async def _stop(self) -> None:
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except PlaywrightError as e:
+                logger.warning(f"關閉 Chromium 失敗: {str(e)}")
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+            logger.info("Playwright Chromium 已關閉")
+
+
+_shared_browsers: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SharedBrowser]' = weakref.WeakKeyDictionary()
+
+
+def get_shared_browser() -> SharedBrowser:
+    """取得目前事件迴圈的共用瀏覽器（asyncio 物件不能跨事件迴圈使用）"""
+    loop = asyncio.get_running_loop()
+    browser = _shared_browsers.get(loop)
+    if browser is None:
+        browser = SharedBrowser()
+        _shared_browsers[loop] = browser
+    return browser
+
+
+class PlaywrightSession:
+    """單一爬蟲的 browser context 與分頁"""
+
+    def __init__(self, source_name: str, needs_javascript: bool = True):
+        self.source_name = source_name
+        self.needs_javascript = needs_javascript
+        self._shared: Optional[SharedBrowser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+
+    async def open(self) -> 'PlaywrightSession':
+        shared = get_shared_browser()
+        browser = await shared.acquire()
+        self._shared = shared
+        try:
+            self.context = await browser.new_context(
+                user_agent=settings.CRAWLER_USER_AGENT,
+                java_script_enabled=self.needs_javascript,
+                viewport={'width': 1920, 'height': 1080},
+            )
+            if settings.DISABLE_IMAGES:
+                await self.context.route('**/*', self._block_resources)
+            self.page = await self.context.new_page()
+        except Exception:
+            await self.close()
+            raise
+        logger.info(f"{self.source_name} Playwright context 已建立")
+        return self
+
+    @staticmethod
+    async def _block_resources(route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @retry(
+        stop=stop_after_attempt(3) | stop_at_deadline,
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(PlaywrightTimeoutError),
+        before_sleep=before_sleep_log(logger, logging.WARNING)
+    )
+    async def fetch(
+        self,
+        url: str,
+        deadline: Optional[Deadline] = None,
+        wait_selector: Optional[str] = None,
+        settle_seconds: float = 0
+    ) -> str:
+        """
+        載入頁面並回傳 HTML（帶重試機制）
+
+        Args:
+            url: 網址
+            deadline: 時間預算
+            wait_selector: 等待出現的元素（出現後即可解析，不必固定等待）
+            settle_seconds: 等待元素的最長秒數
+        """
+        if deadline:
+            deadline.check(url)
+
+        # 與 Selenium 相同的隨機延遲與主機頻率限制，但不阻塞事件迴圈
+        delay = random.uniform(settings.CRAWLER_DELAY_MIN, settings.CRAWLER_DELAY_MAX)
+        delay += get_host_limiter().reserve(url)
+        await asyncio.sleep(deadline.cap(delay) if deadline else delay)
+        if deadline:
+            deadline.check(url)
+
+        timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT
+        if deadline:
+            timeout = max(1, deadline.cap(timeout))
+        await self.page.goto(url, wait_until='domcontentloaded', timeout=timeout * 1000)
+
+        if wait_selector and settle_seconds > 0:
+            settle = deadline.cap(settle_seconds) if deadline else settle_seconds
+            try:
+                await self.page.wait_for_selector(wait_selector, timeout=max(1, settle) * 1000)
+            except PlaywrightTimeoutError:
+                logger.debug(f"等待 {wait_selector} 逾時: {url}")
+
+        return await self.page.content()
+
+    async def close(self) -> None:
+        if self.context is not None:
+            try:
+                await self.context.close()
+            except PlaywrightError as e:
+                logger.warning(f"關閉 browser context 失敗: {str(e)}")
+            self.context = None
+            self.page = None
+        if self._shared is not None:
+            shared, self._shared = self._shared, None
+            await shared.release()
+            logger.info(f"{self.source_name} Playwright context 已關閉")
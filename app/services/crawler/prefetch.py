@@ -0,0 +1,141 @@
+"""
+文章預先抓取
+解析目前文章時，下一篇文章已經以 HTTP 請求在背景下載，讓下載與解析的等待時間重疊
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from app.core.config import settings
+from app.services.crawler.deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    依主機限制請求頻率
+
+    同一主機的兩次請求至少間隔 min_interval 秒，瀏覽器與預先抓取的請求共用同一個限制。
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        """預約下一個請求時段，回傳需要等待的秒數"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        return slot - now
+
+    def wait(self, url: str, deadline: Optional[Deadline] = None) -> None:
+        """等到可以對此主機送出請求"""
+        delay = self.reserve(url)
+        if delay <= 0:
+            return
+        if deadline:
+            deadline.sleep(delay)
+        else:
+            time.sleep(delay)
+
+
+_host_limiter: Optional[HostRateLimiter] = None
+_host_limiter_lock = threading.Lock()
+
+
+def get_host_limiter() -> HostRateLimiter:
+    """取得同一個 Process 內共用的主機頻率限制器"""
+    global _host_limiter
+    if _host_limiter is None:
+        with _host_limiter_lock:
+            if _host_limiter is None:
+                _host_limiter = HostRateLimiter(settings.CRAWLER_HOST_MIN_INTERVAL)
+    return _host_limiter
+
+
+class ArticlePrefetcher:
+    """
+    文章頁面預先抓取器
+
+    - 同時最多 depth + 1 個請求（目前文章與接下來 depth 篇）
+    - 下載失敗或回應不完整時回傳 None，由呼叫端改用瀏覽器抓取
+    - 所有請求都經過 HostRateLimiter，不會超過單一主機的請求頻率
+    """
+
+    def __init__(
+        self,
+        depth: int,
+        deadline: Optional[Deadline] = None,
+        limiter: Optional[HostRateLimiter] = None,
+        session: Optional[requests.Session] = None
+    ):
+        self.depth = depth
+        self.deadline = deadline
+        self.limiter = limiter or get_host_limiter()
+        self.session = session or requests.Session()
+        self.session.headers.setdefault('User-Agent', settings.CRAWLER_USER_AGENT)
+        self._executor = ThreadPoolExecutor(max_workers=depth + 1, thread_name_prefix='prefetch')
+        self._futures: Dict[str, Future] = {}
+
+    def schedule(self, urls: Iterable[str]) -> None:
+        """排入要預先抓取的網址（已在下載中的網址不會重複排入）"""
+        for url in urls:
+            if url and url not in self._futures:
+                self._futures[url] = self._executor.submit(self._fetch, url)
+
+    async def get(self, url: str) -> Optional[str]:
+        """
+        取得預先抓取的 HTML，沒有排入、失敗或逾時時回傳 None
+
+        等待下載時不阻塞事件迴圈，同時執行的其他爬蟲可以繼續工作。
+        """
+        future = self._futures.pop(url, None)
+        if future is None:
+            return None
+        timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT + settings.CRAWLER_HOST_MIN_INTERVAL * (self.depth + 1)
+        if self.deadline:
+            timeout = self.deadline.cap(timeout)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except Exception as e:
+            logger.debug(f"預先抓取失敗 {url}: {str(e)}")
+            return None
+
+    def _fetch(self, url: str) -> Optional[str]:
+        self.limiter.wait(url, self.deadline)
+        if self.deadline and self.deadline.expired:
+            return None
+
+        timeout = settings.CRAWLER_PAGE_LOAD_TIMEOUT
+        if self.deadline:
+            timeout = max(1, self.deadline.cap(timeout))
+        response = self.session.get(url, timeout=timeout)
+        if response.status_code != 200:
+            logger.debug(f"預先抓取 {url} 回應 {response.status_code}")
+            return None
+        return response.text
+
+    def close(self) -> None:
+        """取消尚未開始的請求並釋放資源"""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self) -> 'ArticlePrefetcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
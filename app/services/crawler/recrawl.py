@@ -0,0 +1,150 @@
+"""
+文章重新爬取排程
+發布後的文章可能被修改，依發布後經過的時間遞減檢查頻率（前幾小時頻繁，幾天後很少），
+比對內容雜湊，只有內容改變時才寫入資料庫
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db_utils import recrawl_interval
+from app.core.fingerprint import article_fingerprints, content_hash
+from app.models.article import Article
+from app.models.recrawl import RecrawlEntry
+from app.services.crawler.deadline import Deadline, DeadlineExceeded
+from app.services.crawler.prefetch import ArticlePrefetcher
+
+logger = logging.getLogger(__name__)
+
+
+def apply_recrawl_result(
+    session: Session,
+    entry: RecrawlEntry,
+    article_data: Optional[Dict],
+    now: Optional[datetime] = None
+) -> bool:
+    """
+    比對重新抓取的內容，只有改變時才更新文章；並排定下次檢查
+
+    Returns:
+        bool: 文章內容是否有改變
+    """
+    now = now or datetime.now()
+    changed = False
+
+    if article_data and article_data.get('content'):
+        article = session.get(Article, entry.article_id)
+        if article is None:
+            session.delete(entry)
+            return False
+
+        stored_hash = article.content_hash or content_hash(article.title, article.content)
+        fingerprints = article_fingerprints(article_data['title'], article_data['content'])
+        if fingerprints['content_hash'] != stored_hash:
+            article.title = article_data['title']
+            article.content = article_data['content']
+            article.description = article_data.get('description')
+            for column, value in fingerprints.items():
+                setattr(article, column, value)
+            article.updated_at = now
+            entry.change_count += 1
+            entry.last_changed_at = now
+            changed = True
+
+    entry.check_count += 1
+    entry.last_checked_at = now
+    interval = recrawl_interval(entry.published_at, now)
+    if interval is None:
+        session.delete(entry)
+    else:
+        entry.next_check_at = now + interval
+    return changed
+
+
+async def run_recrawl(limit: Optional[int] = None, deadline: Optional[Deadline] = None) -> Dict[str, int]:
+    """
+    重新抓取到期的文章
+
+    先以 HTTP 下載並解析頁面中的 JSON 資料，失敗時才開啟瀏覽器。
+
+    Returns:
+        dict: {'checked': 檢查數量, 'changed': 內容改變數量}
+    """
+    from app.core.database import SessionLocal
+    from app.tests.test_crawler import get_crawler
+
+    limit = limit or settings.RECRAWL_BATCH_SIZE
+    deadline = deadline or Deadline(settings.RECRAWL_TIME_BUDGET_SECONDS, name='recrawl')
+    stats = {'checked': 0, 'changed': 0}
+
+    session = SessionLocal()
+    try:
+        entries = session.query(RecrawlEntry)\
+            .filter(RecrawlEntry.next_check_at <= datetime.now())\
+            .order_by(RecrawlEntry.next_check_at)\
+            .limit(limit)\
+            .all()
+        if not entries:
+            return stats
+
+        by_source: Dict[str, List[RecrawlEntry]] = {}
+        for entry in entries:
+            by_source.setdefault(entry.source, []).append(entry)
+
+        for source, source_entries in by_source.items():
+            crawler = get_crawler(source)
+            if crawler is None:
+                logger.warning(f"未知的來源 {source}，移出重新爬取佇列")
+                for entry in source_entries:
+                    session.delete(entry)
+                session.commit()
+                continue
+
+            depth = max(1, settings.CRAWLER_PREFETCH_DEPTH)
+            browser_open = False
+            try:
+                with ArticlePrefetcher(depth, deadline=deadline) as prefetcher:
+                    for index, entry in enumerate(source_entries):
+                        deadline.check(entry.url)
+                        prefetcher.schedule(e.url for e in source_entries[index:index + depth + 1])
+
+                        info = {'url': entry.url, 'title': '', 'published_at': entry.published_at}
+                        html = await prefetcher.get(entry.url)
+                        article_data = crawler._extract_from_json(BeautifulSoup(html, 'html.parser'), info) if html else None
+                        if article_data is None:
+                            if not browser_open:
+                                await crawler.open_browser()
+                                browser_open = True
+                            article_data = await crawler.crawl_article(info, deadline=deadline)
+
+                        if apply_recrawl_result(session, entry, article_data):
+                            stats['changed'] += 1
+                            logger.info(f"文章內容已更新: {entry.url}")
+                        stats['checked'] += 1
+                        session.commit()
+            finally:
+                if browser_open:
+                    await crawler.close_browser()
+
+    except DeadlineExceeded as e:
+        logger.warning(f"{str(e)}，停止重新爬取")
+    finally:
+        session.close()
+
+    logger.info(f"重新爬取完成：檢查 {stats['checked']} 篇，內容改變 {stats['changed']} 篇")
+    return stats
+
+
+def run_recrawl_process() -> None:
+    """在新的 Process 中執行重新爬取（由排程器呼叫）"""
+    asyncio.run(run_recrawl())
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    run_recrawl_process()
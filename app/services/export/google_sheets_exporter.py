@@ -8,7 +8,7 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from pytz import timezone
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from app.core.config import settings
 from app.models.article import Article
@@ -102,12 +102,15 @@ def export_articles_to_sheet(session: Session, target_date: Optional[Union[str,
 
     stmt = (
         select(Article)
+        .options(undefer(Article.content))
         .where(
             Article.created_at >= start_of_day,
             Article.created_at < end_of_day,
         )
         .order_by(Article.published_at.desc())
     )
+    if settings.DEDUP_HIDE_DUPLICATES:
+        stmt = stmt.where(Article.duplicate_of_id.is_(None))
     articles = session.execute(stmt).scalars().all()
 
     column_resolvers: Dict[str, Callable[[Article], Any]] = {
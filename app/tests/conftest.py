@@ -0,0 +1,40 @@
+"""
+測試共用的 fixture
+- schema：建立資料表與 ensure_schema 的結構（分割、觸發器、索引），整個測試過程只執行一次
+- make_article：產生寫入用的文章資料，各測試只需指定與測試相關的欄位
+"""
+from datetime import datetime
+import pytest
+from app.core.database import engine, Base
+from app.core.schema import ensure_schema
+
+PUBLISHED_AT = datetime(2025, 11, 4, 12, 0)
+
+
+@pytest.fixture(scope='session')
+def schema():
+    Base.metadata.create_all(bind=engine)
+    ensure_schema(engine)
+
+
+@pytest.fixture
+def make_article():
+    """
+    文章資料的工廠：make_article(來源, 路徑, **欄位)
+
+    網址為 https://test.com/<來源>/<路徑>，摘要預設為內文開頭，未指定的欄位使用固定值
+    """
+    def make(source, path, **fields):
+        content = fields.get('content', f'本文{path}')
+        article = {
+            'url': f'https://test.com/{source}/{path}',
+            'title': f'記事{path}',
+            'content': content,
+            'description': content[:200] if content else None,
+            'published_at': PUBLISHED_AT,
+            'source': source,
+            'category': None,
+        }
+        article.update(fields)
+        return article
+    return make
@@ -0,0 +1,54 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+from app.core.database import SessionLocal
+from app.core.db_utils import article_list_options
+from app.models.article import Article
+
+
+def test_list_query_skips_content():
+    sql = str(select(Article).options(*article_list_options()).compile(dialect=postgresql.dialect()))
+    assert 'articles.title' in sql
+    assert 'articles.content' not in sql
+    assert 'search_vector' not in sql
+
+
+@pytest.mark.usefixtures('schema')
+def test_list_excerpt_only_without_description():
+    """沒有摘要的文章以內文開頭代替；列表中存取未載入的內文直接報錯"""
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'list_test').delete()
+        for path, description in (('a', '摘要'), ('b', None)):
+            db.add(Article(
+                url=f'https://test.com/list/{path}',
+                title=f'記事{path}',
+                description=description,
+                content='あ' * 300,
+                published_at=datetime(2025, 11, 4, 12, 0),
+                source='list_test',
+            ))
+        db.commit()
+        db.expunge_all()
+
+        query = select(Article).options(*article_list_options(excerpt_length=100))\
+            .where(Article.source == 'list_test')\
+            .order_by(Article.url)
+        with_summary, without_summary = db.execute(query).scalars().all()
+        assert with_summary.description == '摘要' and with_summary.excerpt is None
+        assert without_summary.excerpt == 'あ' * 100
+        with pytest.raises(InvalidRequestError):
+            without_summary.content
+
+        # 一般查詢仍可延遲載入內文（同步 session）
+        db.expunge_all()
+        article = db.query(Article).filter(Article.url == 'https://test.com/list/a').one()
+        assert 'content' not in article.__dict__
+        assert article.content == 'あ' * 300
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'list_test').delete()
+        db.commit()
+        db.close()
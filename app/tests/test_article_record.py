@@ -0,0 +1,58 @@
+import sys
+from datetime import datetime
+import pytest
+from bs4 import BeautifulSoup
+from app.core.db_utils import with_fingerprints
+from app.core.spool import encode_record, read_records
+from app.schemas.article_record import ArticleRecord
+from app.services.crawler.npb_crawler import NPBCrawler
+from benchmarks.corpus import load_fixture
+
+
+def test_record_behaves_like_dict():
+    """沒有設定的欄位視為不存在，與 dict 的存取方式相同"""
+    record = ArticleRecord(url='https://test.com/1', title='タイトル', section='ピックアップ')
+    assert record['url'] == 'https://test.com/1'
+    assert record.get('published_at') is None
+    assert record.get('content', '') == ''
+    assert 'content' not in record
+    assert dict(record) == {'url': 'https://test.com/1', 'title': 'タイトル', 'section': 'ピックアップ'}
+    assert record == {'url': 'https://test.com/1', 'title': 'タイトル', 'section': 'ピックアップ'}
+
+    record['published_at'] = datetime(2025, 11, 4)
+    assert {**record, 'published_at': None}['published_at'] is None
+    with pytest.raises(KeyError):
+        record['unknown'] = 1
+    with pytest.raises(AttributeError):
+        record.unknown = 1
+    assert not hasattr(record, '__dict__')
+
+
+def test_record_smaller_than_dict():
+    fields = {
+        'url': 'https://test.com/1', 'title': 't', 'image_url': '', 'news_source': '',
+        'published_at': None, 'category': 'c', 'section': 's',
+    }
+    assert sys.getsizeof(ArticleRecord(**fields)) < sys.getsizeof(dict(fields))
+
+
+def test_record_flows_from_list_to_params(tmp_path):
+    """列表頁的紀錄在解析內文後直接更新，寫入參數只含資料表欄位"""
+    crawler = NPBCrawler()
+    info = crawler._crawl_timeline_section(BeautifulSoup(load_fixture('list_npb'), 'html.parser'))[0]
+    assert isinstance(info, ArticleRecord)
+
+    article = crawler._extract_from_json(BeautifulSoup(load_fixture('article_npb_json'), 'html.parser'), info)
+    assert article is info
+    assert article['content'] and article['section'] == '新着記事'
+
+    params = with_fingerprints(article)
+    assert 'section' not in params and 'news_source' not in params
+    assert params['url'] == info['url']
+    assert params['content_simhash'] is not None
+
+    # 寫入暫存區時同樣只保留資料表欄位
+    path = tmp_path / 'segment.spool'
+    path.write_bytes(encode_record([article]))
+    _, (restored,) = next(read_records(str(path)))
+    assert restored['url'] == info['url'] and 'section' not in restored
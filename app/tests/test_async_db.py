@@ -0,0 +1,62 @@
+from datetime import datetime
+import asyncio
+import io
+import pandas as pd
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.core.database import dispose_async_engines, SessionLocal
+from app.main import app
+from app.models.article import Article
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('schema')
+async def test_endpoints_use_async_session():
+    """匯出與文章頁面以非同步 session 查詢；查詢期間事件迴圈可以處理其他工作"""
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'async_test').delete()
+        article = Article(
+            url='https://test.com/async/1',
+            title='非同步テスト記事',
+            content='本文',
+            published_at=datetime(2025, 11, 4, 12, 0),
+            source='async_test',
+        )
+        db.add(article)
+        db.commit()
+
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.post('/export/articles', data={
+                'start_date': '2025-11-04',
+                'end_date': '2025-11-04',
+                'source': 'async_test',
+            })
+            assert response.status_code == 200
+            assert '非同步テスト記事' in response.content.decode('utf-8-sig')
+            assert '本文' in response.content.decode('utf-8-sig')
+
+            response = await client.get('/export/latest', params={'source': 'async_test'})
+            assert response.status_code == 200
+            exported = pd.read_excel(io.BytesIO(response.content))
+            assert exported['標題'].tolist() == ['非同步テスト記事']
+            assert exported['內容'].tolist() == ['本文']
+
+            assert (await client.get('/article/0')).status_code == 404
+        ticker.cancel()
+        assert ticks > 0
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'async_test').delete()
+        db.commit()
+        db.close()
+        await dispose_async_engines()
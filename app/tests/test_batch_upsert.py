@@ -0,0 +1,49 @@
+from functools import partial
+import pytest
+from app.core.database import SessionLocal
+from app.core.db_utils import batch_upsert_articles
+from app.models.article import Article
+
+
+@pytest.mark.usefixtures('schema')
+def test_batch_upsert_counts_and_fallback(make_article):
+    """新增與更新數量精確；同一網址只寫入最後一筆；有問題的文章不影響同批次其他文章"""
+    article = partial(make_article, 'upsert_test')
+
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'upsert_test').delete()
+        db.commit()
+
+        assert batch_upsert_articles(db, [article('b', title='B'), article('a', title='A')]) == (2, 0)
+
+        inserted, updated = batch_upsert_articles(db, [
+            article('c', title='C'),
+            article('a', title='A 舊'),
+            article('a', title='A 新'),
+            article('b', title='B', content=None),
+        ], batch_size=10)
+        assert (inserted, updated) == (1, 2)
+
+        saved = {a.url.rsplit('/', 1)[1]: a for a in db.query(Article).filter(Article.source == 'upsert_test')}
+        assert saved['a'].title == 'A 新'
+        # 沒有內文時保留既有內文
+        assert saved['b'].content == '本文b'
+
+        # 內容沒有變化的文章不改寫資料列
+        before = db.query(Article.updated_at).filter(Article.url == saved['a'].url).scalar()
+        assert batch_upsert_articles(db, [article('a', title='A 新'), article('c', title='C')]) == (0, 0)
+        # 略過內文抓取的文章只比較內文以外的欄位
+        assert batch_upsert_articles(db, [{**article('a', title='A 新'), 'content': None}]) == (0, 0)
+        assert db.query(Article.updated_at).filter(Article.url == saved['a'].url).scalar() == before
+        assert batch_upsert_articles(db, [article('c', title='C', content='新しい本文')]) == (0, 1)
+
+        # 標題超過欄位長度的文章寫入失敗，其他文章照常寫入
+        inserted, updated = batch_upsert_articles(db, [article('d', title='D'), article('e', title='E' * 300)])
+        assert (inserted, updated) == (1, 0)
+        assert db.query(Article).filter(Article.url == 'https://test.com/upsert_test/d').count() == 1
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'upsert_test').delete()
+        db.commit()
+        db.close()
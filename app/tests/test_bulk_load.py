@@ -0,0 +1,49 @@
+from functools import partial
+import pytest
+from app.core.bulk_load import copy_upsert_articles
+from app.core.database import SessionLocal
+from app.models.article import Article
+
+
+@pytest.mark.usefixtures('schema')
+def test_copy_upsert_counts_and_rejects(make_article):
+    """COPY 載入的新增與更新數量精確；不符合欄位限制的文章被回報而不影響其他文章"""
+    article = partial(make_article, 'copy_test')
+
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'copy_test').delete()
+        db.commit()
+
+        assert copy_upsert_articles(db, [article('a', title='A'), article('b', title='B')]) == (2, 0, [])
+
+        too_long = article('d', title='D' * 300)
+        no_date = article('e', title='E', published_at=None)
+        inserted, updated, rejected = copy_upsert_articles(db, [
+            article('c', title='C\t改行\nあり\\'),
+            article('a', title='A 舊'),
+            article('a', title='A 新'),
+            article('b', title='B', content=None),
+            too_long,
+            no_date,
+        ], chunk_rows=4)
+        assert (inserted, updated) == (1, 2)
+        assert [row['url'] for row in rejected] == [too_long['url'], no_date['url']]
+
+        saved = {a.url.rsplit('/', 1)[1]: a for a in db.query(Article).filter(Article.source == 'copy_test')}
+        assert set(saved) == {'a', 'b', 'c'}
+        assert saved['a'].title == 'A 新'
+        assert saved['c'].title == 'C\t改行\nあり\\'
+        # 沒有內文時保留既有內文
+        assert saved['b'].content == '本文b'
+        assert saved['a'].content_hash is not None
+
+        # 僅新增模式不更新既有文章
+        assert copy_upsert_articles(db, [article('a', title='A 再'), article('f', title='F')], update_existing=False) == (1, 0, [])
+        db.expire_all()
+        assert db.query(Article).filter(Article.url == 'https://test.com/copy_test/a').one().title == 'A 新'
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'copy_test').delete()
+        db.commit()
+        db.close()
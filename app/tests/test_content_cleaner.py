@@ -0,0 +1,43 @@
+import random
+from app.services.crawler.base import BaseCrawler
+from app.services.crawler.content_cleaner import (
+    ContentCleaner,
+    clean_content_reference,
+    get_cleaner,
+)
+from benchmarks.corpus import ARTICLE_FIXTURES, article_raw_content
+
+
+def test_matches_reference_on_fixtures():
+    """樣本文章的清理結果與原始實作相同"""
+    for name in ARTICLE_FIXTURES:
+        for factor in (1, 4):
+            raw = article_raw_content(name, factor)
+            assert BaseCrawler.clean_content(raw) == clean_content_reference(raw)
+
+
+def test_matches_reference_on_random_input():
+    """隨機內容與廣告文字組合的清理結果與原始實作相同"""
+    rng = random.Random(20251104)
+    alphabet = 'ab xy\n\n  ,\t　'
+    for _ in range(20000):
+        ads = [
+            ''.join(rng.choice('abxy') for _ in range(rng.randint(1, 3)))
+            for _ in range(rng.randint(0, 3))
+        ]
+        content = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        assert ContentCleaner(ads).clean(content) == clean_content_reference(content, ads), (ads, content)
+
+
+def test_ads_joined_after_removal():
+    """移除廣告後前後文字接合成新的廣告文字時，結果與逐一取代相同"""
+    cleaner = ContentCleaner(['ab', 'xy'])
+    assert cleaner.clean('axyb 本文') == clean_content_reference('axyb 本文', ['ab', 'xy'])
+    cleaner = ContentCleaner(['xy', 'ab'])
+    assert cleaner.clean('axyb 本文') == clean_content_reference('axyb 本文', ['xy', 'ab'])
+
+
+def test_clean_many_and_cache():
+    cleaner = get_cleaner(['宣伝'])
+    assert cleaner is get_cleaner(['宣伝'])
+    assert cleaner.clean_many(['本文 宣伝\n本文 宣伝', None, '']) == ['本文', '', '']
@@ -0,0 +1,77 @@
+from datetime import date, datetime
+from functools import partial
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.core.counters import count_query
+from app.core.database import dispose_async_engines, engine, SessionLocal
+from app.core.db_utils import batch_upsert_articles
+from app.core.schema import rebuild_article_counts
+from app.main import app
+from app.models.article import Article
+from app.models.article_count import ArticleCount
+
+
+def _counts(db):
+    return {
+        (row.category, row.day): (row.article_count, row.duplicate_count)
+        for row in db.query(ArticleCount).filter(ArticleCount.source == 'counter_test')
+        if row.article_count or row.duplicate_count
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('schema')
+async def test_counts_follow_writes(make_article):
+    """新增、更新、標記重複與刪除文章時，統計表由觸發器同步更新"""
+    article = partial(make_article, 'counter_test')
+
+    day1, day2 = datetime(2025, 11, 3, 9, 0), datetime(2025, 11, 4, 9, 0)
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'counter_test').delete()
+        db.commit()
+        assert _counts(db) == {}
+
+        batch_upsert_articles(db, [
+            article('a', published_at=day1, category='NPB'),
+            article('b', published_at=day1, category='NPB'),
+            article('c', published_at=day2),
+        ])
+        assert _counts(db) == {('NPB', date(2025, 11, 3)): (2, 0), ('', date(2025, 11, 4)): (1, 0)}
+
+        # 發布日期改變時移到另一天；標記為重複文章
+        batch_upsert_articles(db, [article('b', published_at=day2, category='NPB')])
+        original = db.query(Article).filter(Article.url == 'https://test.com/counter_test/a').one()
+        db.query(Article).filter(Article.url == 'https://test.com/counter_test/c').update({'duplicate_of_id': original.id})
+        db.commit()
+        assert _counts(db) == {
+            ('NPB', date(2025, 11, 3)): (1, 0),
+            ('NPB', date(2025, 11, 4)): (1, 0),
+            ('', date(2025, 11, 4)): (1, 1),
+        }
+        assert db.scalar(count_query(source='counter_test', hide_duplicates=True)) == 2
+        assert db.scalar(count_query(source='counter_test', hide_duplicates=False)) == 3
+        assert db.scalar(count_query(source='counter_test', since=date(2025, 11, 4), hide_duplicates=False)) == 2
+
+        db.query(Article).filter(Article.url == 'https://test.com/counter_test/a').delete()
+        db.commit()
+        maintained = _counts(db)
+        assert maintained == {('NPB', date(2025, 11, 4)): (1, 0), ('', date(2025, 11, 4)): (1, 1)}
+
+        # 重新計算的結果與觸發器維護的結果相同
+        with engine.begin() as conn:
+            rebuild_article_counts(conn)
+        db.expire_all()
+        assert _counts(db) == maintained
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.get('/api/v1/articles/count', params={'source': 'counter_test'})
+            assert response.json() == {'total': 1, 'estimated': False}
+            response = await client.get('/api/v1/articles/count', params={'source': 'counter_test', 'q': '本文'})
+            assert response.json()['estimated'] is True
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'counter_test').delete()
+        db.commit()
+        db.close()
+        await dispose_async_engines()
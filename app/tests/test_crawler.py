@@ -48,11 +48,14 @@ from app.services.crawler.other_crawler import OtherSportsCrawler
 from app.services.crawler.dosports_crawler import DoSportsCrawler
 
 from app.core.database import SessionLocal
+from app.core.spool import get_spool
+from app.schemas.article_record import ArticleRecord
 from app.models.article import Article
 import pytest
 from datetime import datetime, timedelta
 import argparse
 import logging
+import time
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
@@ -123,55 +126,67 @@ def get_crawler(crawler_name: str):
 	return crawlers.get(crawler_name)
 
 @pytest.mark.asyncio
-async def test_crawler(crawler_type="npb", start_date=None, end_date=None):
-	"""測試爬蟲"""
+async def test_crawler(crawler_type="npb", start_date=None, end_date=None, deadline=None, writer=None):
+	"""測試爬蟲（deadline 為整次排程的時間預算，writer 為共用的 ArticleWriter）"""
 	try:
 		# 根據參數選擇爬蟲
 		crawler = get_crawler(crawler_type.lower())
 		if not crawler:
 			raise ValueError(f"未知的爬蟲類型: {crawler_type}")
 
-		logger.info(f"開始爬取 {crawler_type} 文章 (日期範圍: {start_date} ~ {end_date})...")
+		logger.info(f"開始爬取 {crawler_type} 文章 (日期範圍: {start_date} ~ {end_date}, 瀏覽器: {crawler.browser_backend})...")
 
 		# 執行爬蟲（所有爬蟲都使用統一的 crawl 方法）
-		articles = await crawler.crawl(start_date=start_date, end_date=end_date)
-
-		logger.info(f"爬取到 {len(articles)} 篇文章")
+		started_at = time.monotonic()
+		articles = await crawler.crawl(start_date=start_date, end_date=end_date, deadline=deadline)
+
+		logger.info(f"爬取到 {len(articles)} 篇文章，耗時 {time.monotonic() - started_at:.1f} 秒")
+
+		# 準備文章資料
+		article_data_list = []
+		for article in articles:
+			if isinstance(article, ArticleRecord):
+				# 爬蟲產生的紀錄直接寫入，不另外複製
+				article.source = crawler_type.lower()
+				article_data = article
+			elif isinstance(article, dict):
+				article_data = {
+					'url': article.get('url'),
+					'title': article.get('title'),
+					'content': article.get('content'),
+					'published_at': article.get('published_at'),
+					'source': crawler_type.lower(),
+					'image_url': article.get('image_url'),
+					'description': article.get('description'),
+					'category': article.get('category'),
+					'reporter': article.get('reporter'),
+					'duplicate_of_id': article.get('duplicate_of_id'),
+				}
+			else:
+				article_data = {
+					'url': article.url,
+					'title': article.title,
+					'content': article.content,
+					'published_at': article.published_at,
+					'source': crawler_type.lower(),
+					'image_url': article.image_url,
+					'description': article.description,
+					'category': getattr(article, 'category', None),
+					'reporter': getattr(article, 'reporter', None),
+				}
+			article_data_list.append(article_data)
+
+		# 有共用寫入器時交給寫入器合併寫入，不自己開啟資料庫連線
+		if writer is not None:
+			written = await asyncio.wrap_future(writer.submit(article_data_list))
+			logger.info(f"完成！寫入: {written} 篇")
+			return len(articles)
 
 		# 存入資料庫（使用批次操作）
 		db = SessionLocal()
 		try:
 			from app.core.db_utils import batch_upsert_articles
 
-			# 準備文章資料
-			article_data_list = []
-			for article in articles:
-				if isinstance(article, dict):
-					article_data = {
-						'url': article.get('url'),
-						'title': article.get('title'),
-						'content': article.get('content'),
-						'published_at': article.get('published_at'),
-						'source': crawler_type.lower(),
-						'image_url': article.get('image_url'),
-						'description': article.get('description'),
-						'category': article.get('category'),
-						'reporter': article.get('reporter'),
-					}
-				else:
-					article_data = {
-						'url': article.url,
-						'title': article.title,
-						'content': article.content,
-						'published_at': article.published_at,
-						'source': crawler_type.lower(),
-						'image_url': article.image_url,
-						'description': article.description,
-						'category': getattr(article, 'category', None),
-						'reporter': getattr(article, 'reporter', None),
-					}
-				article_data_list.append(article_data)
-
 			# 批次 upsert
 			saved_count, updated_count = batch_upsert_articles(db, article_data_list, batch_size=50)
 
@@ -181,7 +196,14 @@ async def test_crawler(crawler_type="npb", start_date=None, end_date=None):
 		except Exception as e:
 			logger.error(f"資料庫操作失敗: {str(e)}")
 			db.rollback()
-			raise
+			# 寫入暫存區，由排程稍後補寫，不丟棄已爬到的文章
+			spool = get_spool()
+			if spool is None:
+				raise
+			spool.append(article_data_list)
+			spool.close()
+			logger.warning(f"已將 {len(article_data_list)} 篇文章寫入暫存區，稍後補寫資料庫")
+			return len(articles)
 		finally:
 			db.close()
 
@@ -264,9 +286,15 @@ if __name__ == '__main__':
 					   default='2025-01-07')
 	parser.add_argument('--debug', action='store_true',
 					   help='開啟除錯模式')
+	parser.add_argument('--backend', choices=['selenium', 'playwright'],
+					   help='瀏覽器後端（預設使用 CRAWLER_BROWSER_BACKEND 設定）')
 	args = parser.parse_args()
 
 	if args.debug:
 		logging.getLogger().setLevel(logging.DEBUG)
 
+	if args.backend:
+		from app.core.config import settings
+		settings.CRAWLER_BROWSER_BACKEND = args.backend
+
 	asyncio.run(test_crawler(args.crawler, args.start_date, args.end_date))
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from app.core.config import settings
+from app.core.database import (
+    async_bulk_engine,
+    async_engine,
+    create_async_pool_engine,
+    create_pool_engine,
+    engine,
+    pool_connection_limit,
+    read_engine,
+)
+
+READER = 'sportsnavi_test_reader'
+
+
+def _reader_url():
+    """同一個資料庫的另一個角色（模擬讀取複本的連線字串）"""
+    with engine.begin() as conn:
+        if not conn.execute(text("SELECT 1 FROM pg_roles WHERE rolname = :name"), {'name': READER}).scalar():
+            conn.execute(text(f"CREATE ROLE {READER} LOGIN"))
+        conn.execute(text(f"GRANT SELECT ON ALL TABLES IN SCHEMA public TO {READER}"))
+    return make_url(settings.DATABASE_URL).set(username=READER, password=None).render_as_string(hide_password=False)
+
+
+def test_pools_are_separate():
+    engines = (engine, read_engine, async_engine.sync_engine, async_bulk_engine.sync_engine)
+    pools = {id(pool_engine.pool) for pool_engine in engines}
+    assert len(pools) == 4
+    with engine.connect() as conn:
+        assert conn.execute(text("SHOW default_transaction_read_only")).scalar() == 'off'
+    with read_engine.connect() as conn:
+        assert conn.execute(text("SHOW default_transaction_read_only")).scalar() == 'on'
+
+
+def test_connection_budget():
+    """網頁 Process 加上爬蟲與重新爬取 Process 的連線數低於 max_connections=50，並保留餘裕"""
+    limits = pool_connection_limit()
+    web = sum(limits.values())
+    assert web + 2 * limits['write'] <= 40
+    assert limits['write'] > settings.MAX_CONCURRENT_CRAWLERS
+
+
+def test_read_engine_settings():
+    """讀取引擎連到另一個連線字串，套用各自的語句逾時並拒絕寫入"""
+    reader = create_pool_engine(_reader_url(), 1, 0, statement_timeout_ms=1500, read_only=True)
+    try:
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT current_user")).scalar() == READER
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == '1500ms'
+            conn.execute(text("SELECT count(*) FROM articles"))
+            with pytest.raises(DBAPIError, match='read-only'):
+                conn.execute(text("CREATE TEMP TABLE pool_test (id int)"))
+    finally:
+        reader.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_read_engine_settings():
+    reader = create_async_pool_engine(_reader_url(), 1, 0, statement_timeout_ms=100, read_only=True)
+    try:
+        async with reader.connect() as conn:
+            assert await conn.scalar(text("SELECT current_user")) == READER
+            assert await conn.scalar(text("SHOW default_transaction_read_only")) == 'on'
+            with pytest.raises(DBAPIError, match='statement timeout'):
+                await conn.execute(text("SELECT pg_sleep(1)"))
+    finally:
+        await reader.dispose()
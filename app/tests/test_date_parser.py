@@ -0,0 +1,69 @@
+from datetime import datetime
+from app.services.crawler.npb_crawler import NPBCrawler
+from app.services.crawler.date_parser import DateParser, get_date_parser
+from benchmarks.corpus import DATE_SAMPLES
+
+
+def test_japanese_formats():
+    parser = DateParser('test')
+    reference = datetime(2025, 11, 5, 8, 0)
+    assert parser.parse_japanese('11/3(月) 12:00', reference) == datetime(2025, 11, 3, 12, 0)
+    assert parser.parse_japanese('11/3(月)12:00', reference) == datetime(2025, 11, 3, 12, 0)
+    assert parser.parse_japanese('2025/11/4 11:56', reference) == datetime(2025, 11, 4, 11, 56)
+    assert parser.parse_japanese('2025/11/4', reference) == datetime(2025, 11, 4)
+    assert parser.parse_japanese('11/4', reference) == datetime(2025, 11, 4)
+    assert parser.parse_japanese('13/45 12:00', reference) is None
+    assert parser.parse_japanese('', reference) is None
+
+
+def test_year_rollover():
+    """沒有年份的日期在跨年前後選擇正確的年份"""
+    parser = DateParser('test')
+    # 1 月初看到去年底的文章
+    assert parser.parse_japanese('12/31(水) 23:00', datetime(2026, 1, 3, 9, 0)) == datetime(2025, 12, 31, 23, 0)
+    # 台灣時間 12/31 深夜看到日本時間新年的文章
+    assert parser.parse_japanese('1/1(木) 0:10', datetime(2025, 12, 31, 23, 30)) == datetime(2026, 1, 1, 0, 10)
+    # 不會把過去的文章判斷成未來
+    assert parser.parse_japanese('11/4(火) 11:56', datetime(2026, 10, 19)) == datetime(2025, 11, 4, 11, 56)
+    # 2/29 只存在於閏年
+    assert parser.parse_japanese('2/29 10:00', datetime(2025, 3, 1)) == datetime(2024, 2, 29, 10, 0)
+
+
+def test_parse_many_uses_one_reference():
+    parser = DateParser('test')
+    reference = datetime(2026, 1, 1, 0, 30)
+    dates = parser.parse_many(['1/1(木) 0:10', '12/31(水) 23:50', '', None], reference)
+    assert dates == [datetime(2026, 1, 1, 0, 10), datetime(2025, 12, 31, 23, 50), None, None]
+
+
+def test_flexible_formats():
+    expected = {
+        '2025-11-04 11:56:00': datetime(2025, 11, 4, 11, 56),
+        '2025/11/4 11:56': datetime(2025, 11, 4, 11, 56),
+        '2025-11-04': datetime(2025, 11, 4),
+        '04 Nov 2025': datetime(2025, 11, 4),
+        'November 04, 2025': datetime(2025, 11, 4),
+        '04/11/2025': datetime(2025, 11, 4),
+        '11/30/2025': datetime(2025, 11, 30),
+        '2025-11-04 | 更新': datetime(2025, 11, 4),
+    }
+    crawler = NPBCrawler()
+    for text, value in expected.items():
+        assert crawler.parse_flexible_date(text) == value, text
+    assert crawler.parse_flexible_date('not a date') is None
+    assert crawler.parse_flexible_date('2025-13-01') is None
+    # 使用此來源的解析器，記住上次成功的格式
+    assert crawler.parse_flexible_date('04 Nov 2025') == datetime(2025, 11, 4)
+    assert get_date_parser(crawler.source_name).last_format == '%d %b %Y'
+
+
+def test_format_cache_keeps_priority():
+    """快取上次成功的格式不會改變有歧義日期的解析結果"""
+    parser = get_date_parser('cache-test')
+    assert parser.parse('11/30/2025') == datetime(2025, 11, 30)
+    assert parser.parse('04/11/2025') == datetime(2025, 11, 4)
+    assert parser.parse('Nov 04, 2025') == datetime(2025, 11, 4)
+    assert parser.last_format == '%b %d, %Y'
+    for samples in DATE_SAMPLES.values():
+        for text in samples:
+            assert parser.parse(text) == DateParser().parse(text), text
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import pytest
+from app.core import db_writer
+from app.core.db_writer import ArticleWriter
+
+
+class _FakeSession:
+    def __init__(self):
+        self.closed = False
+        self.rolled_back = False
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def _articles(prefix, count):
+    return [{'url': f'https://test.com/{prefix}/{i}', 'title': str(i)} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_writer_coalesces_batches(monkeypatch):
+    """多個爬蟲送出的文章合併成一次寫入，且只開啟一個 session"""
+    calls = []
+    sessions = []
+
+    def fake_upsert(session, articles, batch_size=100):
+        calls.append((threading.current_thread().name, len(articles), batch_size))
+        return len(articles), 0
+
+    def session_factory():
+        sessions.append(_FakeSession())
+        return sessions[-1]
+
+    monkeypatch.setattr(db_writer, 'batch_upsert_articles', fake_upsert)
+
+    with ArticleWriter(batch_size=10, flush_interval=0.5, session_factory=session_factory) as writer:
+        results = await asyncio.gather(*(
+            asyncio.wrap_future(writer.submit(_articles(source, 3)))
+            for source in ('npb', 'mlb', 'jleague')
+        ))
+        assert results == [3, 3, 3]
+        assert await asyncio.wrap_future(writer.submit([])) == 0
+
+    assert calls == [('article-writer', 9, 9)]
+    assert writer.written == 9
+    assert len(sessions) == 1 and sessions[0].closed
+
+
+def test_writer_batch_size_and_errors(monkeypatch):
+    """達到批次大小就寫入；寫入失敗時錯誤傳回送出的爬蟲"""
+    calls = []
+
+    def fake_upsert(session, articles, batch_size=100):
+        calls.append(len(articles))
+        if any(a['url'].startswith('https://test.com/bad/') for a in articles):
+            raise RuntimeError('寫入失敗')
+        return len(articles), 0
+
+    monkeypatch.setattr(db_writer, 'batch_upsert_articles', fake_upsert)
+
+    writer = ArticleWriter(batch_size=4, flush_interval=5, session_factory=_FakeSession).start()
+    first = writer.submit(_articles('a', 2))
+    second = writer.submit(_articles('b', 2))
+    assert first.result(timeout=2) == 2
+    assert second.result(timeout=2) == 2
+    assert calls == [4]
+
+    bad = writer.submit(_articles('bad', 1))
+    writer.close()
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=1)
+    with pytest.raises(RuntimeError):
+        writer.submit(_articles('late', 1))
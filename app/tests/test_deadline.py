@@ -0,0 +1,99 @@
+import time
+import pytest
+from selenium.common.exceptions import TimeoutException
+from app.core.config import settings
+from app.services.crawler.deadline import Deadline, DeadlineExceeded
+from app.services.crawler.npb_crawler import NPBCrawler
+
+
+def test_deadline_unlimited():
+    deadline = Deadline(0)
+    assert deadline.remaining() is None
+    assert not deadline.expired
+    assert deadline.cap(20) == 20
+    deadline.check()
+
+
+def test_deadline_expired():
+    deadline = Deadline(0.01, name='npb')
+    time.sleep(0.02)
+    assert deadline.expired
+    assert deadline.cap(20) == 0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+
+
+def test_deadline_for_source(monkeypatch):
+    """個別來源的設定優先，整次排程的截止時間較早時取較早者"""
+    monkeypatch.setattr(settings, 'CRAWLER_TIME_BUDGET_SECONDS', 600)
+    monkeypatch.setattr(settings, 'CRAWLER_SOURCE_TIME_BUDGETS', {'npb': 60})
+    assert 59 < Deadline.for_source('npb').remaining() <= 60
+    assert 599 < Deadline.for_source('mlb').remaining() <= 600
+    assert Deadline.for_source('mlb', parent=Deadline(5)).remaining() <= 5
+    assert Deadline.for_source('mlb', parent=Deadline(0)).remaining() > 599
+
+
+class _SlowDriver:
+    """每次載入都逾時的假 WebDriver"""
+
+    def __init__(self):
+        self.calls = 0
+        self.timeouts = []
+
+    def get(self, url):
+        self.calls += 1
+        time.sleep(0.05)
+        raise TimeoutException()
+
+    def set_page_load_timeout(self, seconds):
+        self.timeouts.append(seconds)
+
+    def execute_script(self, script):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+
+def test_wait_and_get_stops_retrying_at_deadline(monkeypatch):
+    """時間預算用完時不再重試，也不會在重試前等待"""
+    monkeypatch.setattr(settings, 'CRAWLER_DELAY_MIN', 0)
+    monkeypatch.setattr(settings, 'CRAWLER_DELAY_MAX', 0)
+    crawler = NPBCrawler()
+    crawler.driver = _SlowDriver()
+
+    started = time.monotonic()
+    with pytest.raises(Exception):
+        crawler.wait_and_get('https://example.com/', deadline=Deadline(0.5))
+    assert time.monotonic() - started < 1.5
+    assert crawler.driver.calls == 1
+    assert crawler.driver.timeouts == [1]
+
+    expired = Deadline(0.001)
+    time.sleep(0.002)
+    with pytest.raises(DeadlineExceeded):
+        crawler.wait_and_get('https://example.com/', deadline=expired)
+    assert crawler.driver.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_returns_partial_results(monkeypatch):
+    """時間預算用完時停止爬取，回傳已爬取的文章"""
+    monkeypatch.setattr(settings, 'CRAWLER_SOURCE_TIME_BUDGETS', {'npb': 0.3})
+    crawler = NPBCrawler()
+    monkeypatch.setattr(crawler, 'setup_driver', lambda: None)
+    monkeypatch.setattr(crawler, 'find_known_duplicates', lambda articles: {})
+    monkeypatch.setattr(crawler, '_sleep', lambda seconds, deadline: None)
+
+    async def crawl_list(page=1, deadline=None):
+        return [{'url': f'https://example.com/{i}', 'title': str(i), 'published_at': None} for i in range(10)]
+
+    async def crawl_article(article_info, deadline=None, html=None):
+        time.sleep(0.1)
+        return dict(article_info)
+
+    monkeypatch.setattr(crawler, 'crawl_list', crawl_list)
+    monkeypatch.setattr(crawler, 'crawl_article', crawl_article)
+
+    articles = await crawler.crawl()
+    assert 1 <= len(articles) < 10
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from datetime import datetime
+import pytest
+import requests
+from app.core.config import settings
+from app.services.crawler.discovery import (
+    FallbackDiscovery,
+    FeedDiscovery,
+    RenderedListDiscovery,
+    get_discovery,
+    parse_feed,
+)
+from app.services.crawler.npb_crawler import NPBCrawler
+
+RSS = '''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+<channel>
+<title>プロ野球 - Yahoo!ニュース</title>
+<item>
+<title>阪神が本拠地で会見</title>
+<link>https://news.yahoo.co.jp/articles/42c8a0f4efd90069c3d1bf8d1489d9d15220432c?source=rss</link>
+<pubDate>Tue, 04 Nov 2025 02:56:00 GMT</pubDate>
+<media:thumbnail url="https://amd-pctr.c.yimg.jp/r/iwiz-amd/20251104-00000000-spnannex-000-1-view.jpg"/>
+<source url="https://www.sanspo.com/">サンケイスポーツ</source>
+</item>
+<item>
+<title>巨人の主将が決意表明</title>
+<link>https://news.yahoo.co.jp/articles/aa58d8299075bec647df137f2be64da093d64693</link>
+<pubDate>Tue, 04 Nov 2025 10:00:00 +0900</pubDate>
+</item>
+<item>
+<title>重複</title>
+<link>https://news.yahoo.co.jp/articles/aa58d8299075bec647df137f2be64da093d64693?source=rss</link>
+</item>
+<item><title>リンクなし</title></item>
+</channel>
+</rss>'''.encode('utf-8')
+
+ATOM = '''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<entry>
+<title>ソフトバンクが逆転勝ち</title>
+<link rel="alternate" href="https://news.yahoo.co.jp/articles/85247ad372ded06a22bc23642e41ab9ddbb8fa01"/>
+<published>2025-11-04T12:30:00+09:00</published>
+<author><name>スポニチアネックス</name></author>
+</entry>
+</feed>'''.encode('utf-8')
+
+
+def _chunks(data, size=37):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_parse_rss_feed():
+    """RSS 分段餵入也能解析，網址移除追蹤參數並去除重複"""
+    articles = parse_feed(_chunks(RSS), 'NPB')
+    assert [a['title'] for a in articles] == ['阪神が本拠地で会見', '巨人の主将が決意表明']
+    first = articles[0]
+    assert first['url'] == 'https://news.yahoo.co.jp/articles/42c8a0f4efd90069c3d1bf8d1489d9d15220432c'
+    assert first['published_at'] == datetime(2025, 11, 4, 11, 56)
+    assert first['image_url'].endswith('-view.jpg')
+    assert first['news_source'] == 'サンケイスポーツ'
+    assert first['category'] == 'NPB'
+    assert articles[1]['published_at'] == datetime(2025, 11, 4, 10, 0)
+
+
+def test_parse_atom_feed():
+    articles = parse_feed([ATOM])
+    assert len(articles) == 1
+    assert articles[0]['url'] == 'https://news.yahoo.co.jp/articles/85247ad372ded06a22bc23642e41ab9ddbb8fa01'
+    assert articles[0]['published_at'] == datetime(2025, 11, 4, 12, 30)
+    assert articles[0]['news_source'] == 'スポニチアネックス'
+
+
+def test_get_discovery(monkeypatch):
+    monkeypatch.setattr(settings, 'CRAWLER_FEED_URLS', {'npb': 'https://example.com/npb.xml'})
+    monkeypatch.setattr(settings, 'CRAWLER_FEED_DISCOVERY', True)
+    assert isinstance(get_discovery('mlb'), RenderedListDiscovery)
+    strategy = get_discovery('npb')
+    assert isinstance(strategy, FallbackDiscovery)
+    assert strategy.name == 'feed+rendered'
+
+    monkeypatch.setattr(settings, 'CRAWLER_FEED_DISCOVERY', False)
+    assert isinstance(get_discovery('npb'), RenderedListDiscovery)
+
+
+class _Response:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise requests.HTTPError(f'{self.status_code}')
+
+    def iter_content(self, chunk_size=None):
+        return iter(_chunks(self.content, chunk_size))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, status_code, content=b'', delay=0):
+        self.response = _Response(status_code, content)
+        self.delay = delay
+
+    def get(self, url, **kwargs):
+        time.sleep(self.delay)
+        return self.response
+
+
+def _crawler_with_rendered_list(monkeypatch):
+    crawler = NPBCrawler()
+    rendered = [{'url': 'https://news.yahoo.co.jp/articles/rendered', 'title': 'rendered'}]
+
+    async def crawl_rendered_list(page=1, deadline=None):
+        return rendered
+
+    monkeypatch.setattr(crawler, 'crawl_rendered_list', crawl_rendered_list)
+    monkeypatch.setattr(settings, 'CRAWLER_HOST_MIN_INTERVAL', 0)
+    monkeypatch.setattr('app.services.crawler.prefetch._host_limiter', None)
+    return crawler, rendered
+
+
+@pytest.mark.asyncio
+async def test_feed_discovery(monkeypatch):
+    crawler, _ = _crawler_with_rendered_list(monkeypatch)
+    crawler.discovery_strategy = FallbackDiscovery([
+        FeedDiscovery('https://example.com/npb.xml', session=_FakeSession(200, RSS)),
+        RenderedListDiscovery(),
+    ])
+    articles = await crawler.crawl_list()
+    assert len(articles) == 2
+    assert articles[0]['section'] == 'フィード'
+
+
+@pytest.mark.asyncio
+async def test_feed_discovery_falls_back(monkeypatch):
+    """feed 失敗或沒有文章時改用列表頁"""
+    crawler, rendered = _crawler_with_rendered_list(monkeypatch)
+    for session in (_FakeSession(503), _FakeSession(200, b'<rss><channel></channel></rss>'), _FakeSession(200, b'<rss><chan')):
+        crawler.discovery_strategy = FallbackDiscovery([
+            FeedDiscovery('https://example.com/npb.xml', session=session),
+            RenderedListDiscovery(),
+        ])
+        assert await crawler.crawl_list() == rendered
+
+
+@pytest.mark.asyncio
+async def test_feed_discovery_does_not_block_loop(monkeypatch):
+    """下載 feed 時事件迴圈可以繼續執行其他工作"""
+    crawler, _ = _crawler_with_rendered_list(monkeypatch)
+    strategy = FeedDiscovery('https://example.com/npb.xml', session=_FakeSession(200, RSS, delay=0.3))
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    task = asyncio.create_task(ticker())
+    try:
+        articles = await strategy.discover(crawler)
+    finally:
+        task.cancel()
+    assert len(articles) == 2
+    assert len(ticks) >= 5
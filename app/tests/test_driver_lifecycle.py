@@ -0,0 +1,125 @@
+import subprocess
+import time
+import psutil
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+from tenacity import wait_none
+from app.core.config import settings
+from app.services.crawler.base import BaseCrawler
+from app.services.crawler.driver_lifecycle import (
+    is_crash_error,
+    kill_process_tree,
+    process_tree_rss_mb,
+)
+from app.services.crawler.npb_crawler import NPBCrawler
+
+
+def test_is_crash_error():
+    assert is_crash_error(InvalidSessionIdException('invalid session id'))
+    assert is_crash_error(WebDriverException('unknown error: session deleted because of page crash'))
+    assert is_crash_error(ConnectionRefusedError())
+    assert not is_crash_error(WebDriverException('no such element'))
+    assert not is_crash_error(TimeoutException())
+
+
+def test_kill_process_tree():
+    """結束 Process 時一併結束子 Process"""
+    parent = subprocess.Popen(['sh', '-c', 'sleep 30 & sleep 30; wait'])
+    try:
+        deadline = time.monotonic() + 2
+        while not psutil.Process(parent.pid).children() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        children = psutil.Process(parent.pid).children(recursive=True)
+        assert children
+        assert process_tree_rss_mb(parent.pid) > 0
+
+        assert kill_process_tree(parent.pid, timeout=2) == len(children) + 1
+        parent.wait(timeout=2)
+        assert not any(child.is_running() and child.status() != psutil.STATUS_ZOMBIE for child in children)
+    finally:
+        if parent.poll() is None:
+            parent.kill()
+    assert kill_process_tree(None) == 0
+
+
+class _Process:
+    def __init__(self):
+        self.exit_code = None
+        self.pid = None
+
+    def poll(self):
+        return self.exit_code
+
+
+class _Service:
+    def __init__(self):
+        self.process = _Process()
+
+
+class _FakeDriver:
+    """記錄載入頁面的假 WebDriver，crash_on 中的網址第一次載入時模擬瀏覽器當機"""
+
+    def __init__(self, crash_on=()):
+        self.service = _Service()
+        self.crash_on = set(crash_on)
+        self.loaded = []
+        self.quit_called = False
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def get(self, url):
+        if url in self.crash_on:
+            raise WebDriverException('chrome not reachable')
+        self.loaded.append(url)
+
+    def execute_script(self, script):
+        return 'complete'
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    monkeypatch.setattr(settings, 'CRAWLER_DELAY_MIN', 0)
+    monkeypatch.setattr(settings, 'CRAWLER_DELAY_MAX', 0)
+    monkeypatch.setattr(settings, 'CRAWLER_HOST_MIN_INTERVAL', 0)
+    monkeypatch.setattr(BaseCrawler.wait_and_get.retry, 'wait', wait_none())
+    monkeypatch.setattr('app.services.crawler.prefetch.HostRateLimiter.wait', lambda self, url, deadline=None: None)
+
+    crawler = NPBCrawler()
+    crawler.drivers = []
+
+    def setup_driver():
+        crawler.driver = _FakeDriver(crash_on=crawler.crash_on if not crawler.drivers else ())
+        crawler.drivers.append(crawler.driver)
+        crawler.pages_loaded = 0
+
+    crawler.crash_on = ()
+    monkeypatch.setattr(crawler, 'setup_driver', setup_driver)
+    return crawler
+
+
+def test_driver_recycled_after_page_limit(crawler, monkeypatch):
+    monkeypatch.setattr(settings, 'CRAWLER_DRIVER_MAX_PAGES', 2)
+    for i in range(5):
+        crawler.wait_and_get(f'https://example.com/{i}')
+    assert [len(d.loaded) for d in crawler.drivers] == [2, 2, 1]
+    assert all(d.quit_called for d in crawler.drivers[:-1])
+
+
+def test_dead_driver_recreated(crawler):
+    crawler.wait_and_get('https://example.com/1')
+    crawler.driver.service.process.exit_code = -9
+    crawler.wait_and_get('https://example.com/2')
+    assert len(crawler.drivers) == 2
+    assert crawler.drivers[1].loaded == ['https://example.com/2']
+
+
+def test_crashed_session_retried_with_new_driver(crawler):
+    crawler.crash_on = ('https://example.com/crash',)
+    crawler.wait_and_get('https://example.com/crash')
+    assert len(crawler.drivers) == 2
+    assert crawler.drivers[0].quit_called
+    assert crawler.drivers[1].loaded == ['https://example.com/crash']
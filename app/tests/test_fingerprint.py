@@ -0,0 +1,123 @@
+from functools import partial
+import pytest
+from app.core.database import SessionLocal
+from app.core.db_utils import batch_upsert_articles, find_title_duplicates, reclean_articles
+from app.core.fingerprint import (
+    article_fingerprints,
+    hamming_distance,
+    normalize_text,
+    simhash,
+    simhash_bands,
+    title_fingerprint,
+    to_unsigned64,
+)
+from app.models.article import Article
+from benchmarks.corpus import article_raw_content
+
+CONTENT = article_raw_content('article_npb_json')
+
+
+def test_normalize_text():
+    """全半形、大小寫、空白與標點不影響比對"""
+    assert normalize_text('ＡＢＣ　1２3。「テスト」') == normalize_text('abc 123 テスト')
+    assert normalize_text(None) == ''
+
+
+def test_simhash_near_duplicate():
+    """轉載時的小幅修改距離很小，不同文章距離較大"""
+    original = simhash(CONTENT)
+    edited = simhash(CONTENT.replace('。', '。\n', 3) + '（共同通信）')
+    other = simhash(article_raw_content('article_jleague_json'))
+    assert original is not None
+    assert hamming_distance(original, edited) <= 3
+    assert hamming_distance(original, other) > 3
+    assert simhash('ab') is None
+
+
+def test_simhash_bands():
+    """分段可以還原原本的指紋，且可存入 BIGINT"""
+    fingerprint = simhash(CONTENT)
+    assert -(1 << 63) <= fingerprint < (1 << 63)
+    bands = simhash_bands(fingerprint)
+    restored = sum(band << (16 * i) for i, band in enumerate(bands))
+    assert restored == to_unsigned64(fingerprint)
+    assert simhash_bands(None) == (None, None, None, None)
+
+
+def test_title_fingerprint():
+    assert title_fingerprint('大谷翔平、 第50号ホームラン！') == title_fingerprint('大谷翔平 第50号ホームラン')
+    assert title_fingerprint('大谷翔平') != title_fingerprint('山本由伸')
+    assert title_fingerprint('') is None
+
+
+@pytest.mark.usefixtures('schema')
+def test_flag_near_duplicates(make_article):
+    """近似重複文章指向最早的原始文章，略過內文的重複文章不覆蓋既有內文"""
+    article = partial(make_article, 'dedup_test')
+
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'dedup_test').delete()
+        db.commit()
+
+        articles = [
+            article('1', title='大谷翔平が第50号', content=CONTENT),
+            article('2', title='大谷翔平 第50号', content=CONTENT + '（共同通信）'),
+            article('3', title='別の記事', content=article_raw_content('article_jleague_json')),
+        ]
+        batch_upsert_articles(db, articles)
+
+        saved = {a.url: a for a in db.query(Article).filter(Article.source == 'dedup_test')}
+        original = saved['https://test.com/dedup_test/1']
+        assert original.duplicate_of_id is None
+        assert saved['https://test.com/dedup_test/2'].duplicate_of_id == original.id
+        assert saved['https://test.com/dedup_test/3'].duplicate_of_id is None
+
+        # 列表頁看到相同標題的其他 URL 時，可以在抓取內文前找到原始文章
+        matches = find_title_duplicates(db, [
+            {'url': 'https://test.com/dedup_test/4', 'title': '大谷翔平が、第50号'},
+            {'url': 'https://test.com/dedup_test/1', 'title': '大谷翔平が第50号'},
+        ])
+        assert list(matches) == ['https://test.com/dedup_test/4']
+        assert matches['https://test.com/dedup_test/4']['id'] == original.id
+
+        # 重新寫入沒有內文的資料時保留原本的內文
+        batch_upsert_articles(db, [article('1', title='大谷翔平が第50号', content=None)])
+        db.expire_all()
+        original = db.query(Article).filter(Article.url == 'https://test.com/dedup_test/1').one()
+        assert original.content
+        assert original.content_simhash == article_fingerprints(original.title, CONTENT)['content_simhash']
+    finally:
+        db.query(Article).filter(Article.source == 'dedup_test').delete()
+        db.commit()
+        db.close()
+
+
+@pytest.mark.usefixtures('schema')
+def test_reclean_updates_fingerprints(make_article):
+    """重新清理內容時一併更新指紋與搜尋向量"""
+    article = partial(make_article, 'dedup_test')
+
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'dedup_test').delete()
+        db.commit()
+
+        url = 'https://test.com/dedup_test/reclean'
+        batch_upsert_articles(db, [article('reclean', title='大谷翔平が第50号', content=CONTENT + '\n點我下載APP')])
+        stale = db.query(Article).filter(Article.url == url).one()
+        stale_hash, stale_vector = stale.content_hash, stale.search_vector
+
+        assert reclean_articles(db, source='dedup_test') == 1
+        db.expire_all()
+        recleaned = db.query(Article).filter(Article.url == url).one()
+        assert '點我下載APP' not in recleaned.content
+        expected = article_fingerprints(recleaned.title, recleaned.content)
+        assert recleaned.content_hash == expected['content_hash'] != stale_hash
+        assert recleaned.content_simhash == expected['content_simhash']
+        assert recleaned.simhash_band_0 == expected['simhash_band_0']
+        assert recleaned.search_vector != stale_vector
+    finally:
+        db.query(Article).filter(Article.source == 'dedup_test').delete()
+        db.commit()
+        db.close()
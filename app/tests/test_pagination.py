@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from app.core.database import dispose_async_engines, SessionLocal
+from app.core.pagination import decode_cursor, encode_cursor, keyset_query, paginate
+from app.main import app
+from app.models.article import Article
+
+
+def test_cursor_round_trip():
+    article = Article(id=42, published_at=datetime(2025, 11, 4, 12, 30))
+    assert decode_cursor(encode_cursor(article)) == (datetime(2025, 11, 4, 12, 30), 42)
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+
+def _page(db, after=None, before=None):
+    query = keyset_query(select(Article).where(Article.source == 'page_test'), 4, after=after, before=before)
+    items, next_cursor, previous_cursor = paginate(db.execute(query).scalars().all(), 4, after=after, before=before)
+    return [article.url.rsplit('/', 1)[1] for article in items], next_cursor, previous_cursor
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('schema')
+async def test_keyset_pages():
+    """前後翻頁的結果與完整排序一致（發布時間相同時以 id 排序）"""
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'page_test').delete()
+        base = datetime(2025, 11, 4, 12, 0)
+        for i in range(10):
+            db.add(Article(
+                url=f'https://test.com/page/{i}',
+                title=f'記事{i}',
+                published_at=base + timedelta(hours=i // 2),
+                source='page_test',
+            ))
+        db.commit()
+        expected = [
+            article.url.rsplit('/', 1)[1]
+            for article in db.query(Article).filter(Article.source == 'page_test')
+            .order_by(Article.published_at.desc(), Article.id.desc())
+        ]
+
+        first, next_cursor, previous_cursor = _page(db)
+        assert first == expected[:4] and previous_cursor is None
+        second, next_cursor, previous_cursor = _page(db, after=next_cursor)
+        assert second == expected[4:8]
+        third, last_cursor, _ = _page(db, after=next_cursor)
+        assert third == expected[8:] and last_cursor is None
+
+        back, _, previous_cursor = _page(db, before=previous_cursor)
+        assert back == first and previous_cursor is None
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.get('/api/v1/articles/', params={'limit': 1})
+            assert response.status_code == 200
+            assert 'x-next-cursor' in response.headers
+            assert (await client.get('/api/v1/articles/', params={'cursor': '!!'})).status_code == 400
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'page_test').delete()
+        db.commit()
+        db.close()
+        await dispose_async_engines()
@@ -0,0 +1,59 @@
+from datetime import datetime
+from bs4 import BeautifulSoup
+from app.services.crawler.npb_crawler import NPBCrawler
+from benchmarks.corpus import load_fixture, scaled_fixture, article_raw_content
+
+
+def _soup(name, factor=1):
+    return BeautifulSoup(scaled_fixture(name, factor), 'html.parser')
+
+
+def test_list_fixtures_parse():
+    """列表頁樣本可以解析出ピックアップ與新着記事"""
+    crawler = NPBCrawler()
+    expected = {
+        'list_npb': (6, 24),
+        'list_jleague': (5, 30),
+        'list_keiba': (8, 20),
+    }
+    for name, (pickup_count, timeline_count) in expected.items():
+        soup = _soup(name)
+        pickups = crawler._crawl_pickup_section(soup)
+        timeline = crawler._crawl_timeline_section(soup)
+        assert len(pickups) == pickup_count, name
+        assert len(timeline) == timeline_count, name
+        assert all(item['url'].startswith('http') for item in pickups + timeline)
+        assert all(isinstance(item['published_at'], datetime) for item in timeline)
+
+
+def test_scaled_list_fixture():
+    """放大後的列表頁項目數量等比增加"""
+    crawler = NPBCrawler()
+    soup = _soup('list_npb', 4)
+    assert len(crawler._crawl_pickup_section(soup)) == 6 * 4
+    assert len(crawler._crawl_timeline_section(soup)) == 24 * 4
+
+
+def test_article_fixtures_parse():
+    """文章頁樣本可以從 JSON 或 HTML 提取內容"""
+    crawler = NPBCrawler()
+    info = {'url': 'https://news.yahoo.co.jp/articles/test', 'title': 'test'}
+
+    article = crawler._extract_from_json(_soup('article_npb_json'), info)
+    assert article is not None
+    assert article['published_at'] == datetime(2025, 11, 4, 11, 56)
+    assert article['content']
+
+    assert crawler._extract_from_json(_soup('article_keiba_html'), info) is None
+    article = crawler._extract_from_html(_soup('article_keiba_html'), info)
+    assert article is not None
+    assert article['title'] != 'Yahoo!ニュース'
+
+
+def test_article_raw_content():
+    """clean_content 的輸入樣本包含廣告文字與重複行"""
+    raw = article_raw_content('article_npb_json')
+    assert '請繼續往下閱讀...' in raw or '點我下載APP' in raw or 'Follow us on' in raw
+    cleaned = NPBCrawler.clean_content(raw)
+    assert len(cleaned) < len(raw)
+    assert load_fixture('article_npb_json')
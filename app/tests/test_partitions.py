@@ -0,0 +1,136 @@
+from datetime import date, datetime
+from functools import partial
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.database import engine, SessionLocal
+from app.core.db_utils import batch_upsert_articles
+from app.core.partitions import (
+    add_months,
+    detached_name,
+    drop_expired_partitions,
+    existing_partitions,
+    partition_name,
+    retention_start,
+)
+from app.models.article import Article
+from app.models.article_count import ArticleCount
+from app.models.article_url import ArticleUrl
+
+
+def _cleanup(db):
+    db.rollback()
+    db.query(Article).filter(Article.source == 'partition_test').delete()
+    db.commit()
+
+
+def test_partition_months():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -13) == date(2023, 12, 1)
+    assert partition_name(date(2025, 3, 1)) == 'articles_p202503'
+    assert detached_name(date(2025, 3, 1), datetime(2026, 4, 1, 3, 0)) == 'articles_p202503_detached_20260401030000'
+    assert retention_start(datetime(2026, 10, 19, 8, 0)) == date(2025, 9, 1)
+
+
+@pytest.mark.usefixtures('schema')
+def test_url_unique_across_partitions(make_article):
+    """網址在所有分割之間唯一；發布日期改變時文章移到另一個分割"""
+    article = partial(make_article, 'partition_test')
+
+    db = SessionLocal()
+    try:
+        _cleanup(db)
+        assert batch_upsert_articles(db, [article('a', published_at=datetime(2025, 10, 30, 9, 0))]) == (1, 0)
+
+        db.add(Article(**article('a', published_at=datetime(2025, 11, 2, 9, 0))))
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
+
+        assert batch_upsert_articles(db, [article('a', published_at=datetime(2025, 11, 2, 9, 0))]) == (0, 1)
+        assert batch_upsert_articles(db, [article('a', published_at=datetime(2025, 11, 2, 9, 0))]) == (0, 0)
+        article = db.query(Article).filter(Article.source == 'partition_test').one()
+        assert article.published_at == datetime(2025, 11, 2, 9, 0)
+        registered = db.get(ArticleUrl, article.url)
+        assert registered.published_at == datetime(2025, 11, 2, 9, 0)
+
+        db.query(Article).filter(Article.source == 'partition_test').delete()
+        db.commit()
+        assert db.get(ArticleUrl, article.url) is None
+    finally:
+        _cleanup(db)
+        db.close()
+
+
+@pytest.mark.usefixtures('schema')
+def test_drop_expired_partitions(make_article):
+    """回補的舊文章會建立所需的分割；過期的分割連同網址登記與數量統計一起移除"""
+    article = partial(make_article, 'partition_test')
+
+    old = datetime(2001, 1, 15, 9, 0)
+    db = SessionLocal()
+    try:
+        _cleanup(db)
+        assert batch_upsert_articles(db, [article('old', published_at=old)]) == (1, 0)
+        with engine.connect() as conn:
+            assert date(2001, 1, 1) in existing_partitions(conn)
+
+        # 卸離分割需要資料表鎖，先結束 session 的交易
+        db.commit()
+        with engine.begin() as conn:
+            removed = drop_expired_partitions(conn, now=datetime(2002, 3, 1))
+        assert removed == ['articles_p200101']
+
+        db.expire_all()
+        assert db.query(Article).filter(Article.source == 'partition_test').count() == 0
+        assert db.get(ArticleUrl, 'https://test.com/partition_test/old') is None
+        assert db.query(ArticleCount).filter(ArticleCount.day < date(2001, 2, 1)).count() == 0
+        with engine.connect() as conn:
+            assert date(2001, 1, 1) not in existing_partitions(conn)
+
+        # 移除後可以重新寫入同一個網址
+        assert batch_upsert_articles(db, [article('old', published_at=old)]) == (1, 0)
+    finally:
+        _cleanup(db)
+        with engine.begin() as conn:
+            drop_expired_partitions(conn, now=datetime(2002, 3, 1))
+        db.close()
+
+
+@pytest.mark.usefixtures('schema')
+def test_keep_detached_partitions(make_article, monkeypatch):
+    """保留的卸離分割改名，之後回補同一個月份時會建立新的分割"""
+    article = partial(make_article, 'partition_test')
+    monkeypatch.setattr(settings, 'RETENTION_KEEP_DETACHED', True)
+
+    old = datetime(2001, 1, 15, 9, 0)
+    db = SessionLocal()
+    try:
+        _cleanup(db)
+        assert batch_upsert_articles(db, [article('old', published_at=old)]) == (1, 0)
+        db.commit()
+        with engine.begin() as conn:
+            assert drop_expired_partitions(conn, now=datetime(2002, 3, 1)) == ['articles_p200101']
+        with engine.connect() as conn:
+            detached = conn.execute(text(
+                "SELECT relname FROM pg_class WHERE relname LIKE 'articles_p200101_detached_%' AND relkind = 'r'"
+            )).scalars().all()
+        assert len(detached) == 1
+
+        # 回補同一個月份：建立新的分割（不會因為舊資料表的名稱而略過）
+        db.expire_all()
+        assert batch_upsert_articles(db, [article('old', published_at=old)]) == (1, 0)
+        with engine.connect() as conn:
+            assert date(2001, 1, 1) in existing_partitions(conn)
+            assert conn.execute(text(f"SELECT count(*) FROM {detached[0]}")).scalar() == 1
+    finally:
+        _cleanup(db)
+        monkeypatch.setattr(settings, 'RETENTION_KEEP_DETACHED', False)
+        with engine.begin() as conn:
+            drop_expired_partitions(conn, now=datetime(2002, 3, 1))
+            for name in conn.execute(text(
+                "SELECT relname FROM pg_class WHERE relname LIKE 'articles_p200101_detached_%' AND relkind = 'r'"
+            )).scalars().all():
+                conn.execute(text(f"DROP TABLE {name}"))
+        db.close()
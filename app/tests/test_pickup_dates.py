@@ -0,0 +1,141 @@
+from datetime import date, datetime
+import pytest
+from bs4 import BeautifulSoup
+from app.services.crawler import pickup_dates
+from app.services.crawler.npb_crawler import NPBCrawler
+from app.services.crawler.pickup_dates import (
+    PickupDateResolver,
+    date_from_url,
+    is_outside_range,
+    published_at_from_html,
+)
+from benchmarks.corpus import load_fixture
+
+
+def test_date_from_url():
+    assert date_from_url('https://baseball.yahoo.co.jp/npb/news/detail/20251104-00000-spnannex-base') == date(2025, 11, 4)
+    assert date_from_url('https://sports.yahoo.co.jp/column/detail/202511040001-spnavi') == date(2025, 11, 4)
+    assert date_from_url('https://amd-pctr.c.yimg.jp/r/iwiz-amd/20251104-00000000-spnannex-000-1-view.jpg') == date(2025, 11, 4)
+    assert date_from_url('https://news.yahoo.co.jp/articles/42c8a0f4efd90069c3d1bf8d1489d9d15220432c') is None
+    assert date_from_url('https://example.com/20251399-x') is None
+    assert date_from_url(None) is None
+
+
+def test_published_at_from_html():
+    assert published_at_from_html(
+        '<meta property="article:published_time" content="2025-11-04T02:56:00Z">'
+    ) == datetime(2025, 11, 4, 11, 56)
+    assert published_at_from_html(load_fixture('article_npb_json')) == datetime(2025, 11, 4, 11, 56)
+    assert published_at_from_html('<html></html>') is None
+
+
+def test_is_outside_range():
+    start, end = date(2025, 11, 4), date(2025, 11, 4)
+    assert is_outside_range({'published_at': datetime(2025, 11, 3, 23, 0)}, start, end)
+    assert not is_outside_range({'published_at': datetime(2025, 11, 4, 0, 0)}, start, end)
+    assert is_outside_range({'published_date': date(2025, 10, 28)}, start, end)
+    # 圖片日期只是下限：比範圍早的無法判斷，比範圍晚的確定在範圍外
+    assert not is_outside_range({'earliest_date': date(2025, 10, 28)}, start, end)
+    assert is_outside_range({'earliest_date': date(2025, 11, 5)}, start, end)
+    assert not is_outside_range({}, start, end)
+    assert not is_outside_range({'published_date': date(2025, 10, 28)}, None, None)
+
+
+def test_resolver_order():
+    """依序使用新着記事、資料庫、網址日期，無法判斷的回傳給呼叫端"""
+    articles = [
+        {'url': 'https://news.yahoo.co.jp/articles/a', 'published_at': datetime(2025, 11, 4, 9, 0)},
+        {'url': 'https://news.yahoo.co.jp/articles/a'},
+        {'url': 'https://news.yahoo.co.jp/articles/b'},
+        {'url': 'https://baseball.yahoo.co.jp/npb/news/detail/20251028-00000-spnannex-base'},
+        {'url': 'https://news.yahoo.co.jp/articles/c', 'image_url': 'https://amd-pctr.c.yimg.jp/r/iwiz-amd/20251101-00000000-x.jpg'},
+    ]
+    looked_up = []
+
+    def db_lookup(urls):
+        looked_up.extend(urls)
+        return {'https://news.yahoo.co.jp/articles/b': datetime(2025, 10, 30, 8, 0)}
+
+    resolver = PickupDateResolver(db_lookup=db_lookup, metadata_lookup=False)
+    undated = resolver.resolve(articles, date(2025, 11, 4), date(2025, 11, 4))
+
+    assert articles[1]['published_at'] == datetime(2025, 11, 4, 9, 0)
+    assert articles[2]['published_at'] == datetime(2025, 10, 30, 8, 0)
+    assert articles[3]['published_date'] == date(2025, 10, 28)
+    assert articles[4]['earliest_date'] == date(2025, 11, 1)
+    assert undated == [articles[4]]
+    assert 'https://news.yahoo.co.jp/articles/a' not in looked_up
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeSession:
+    def __init__(self):
+        self.requested = []
+        self.headers = {}
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        return _Response(load_fixture('article_npb_json'))
+
+    def close(self):
+        pass
+
+
+def test_resolver_metadata_lookup(monkeypatch):
+    """頁面查詢結果會快取，下載的 HTML 可以交給 crawl_article"""
+    monkeypatch.setattr(pickup_dates, '_metadata_cache', pickup_dates.OrderedDict())
+    monkeypatch.setattr('app.services.crawler.prefetch._host_limiter', None)
+    monkeypatch.setattr('app.core.config.settings.CRAWLER_HOST_MIN_INTERVAL', 0)
+    session = _FakeSession()
+    url = 'https://news.yahoo.co.jp/articles/d'
+
+    resolver = PickupDateResolver(metadata_lookup=True, session=session)
+    articles = [{'url': url}, {'url': 'https://news.yahoo.co.jp/articles/e', 'image_url': '/20251201-x.jpg'}]
+    assert resolver.resolve(articles, date(2025, 11, 4), date(2025, 11, 4)) == []
+    assert articles[0]['published_at'] == datetime(2025, 11, 4, 11, 56)
+    # 圖片日期已晚於範圍，不需要查詢
+    assert session.requested == [url]
+    assert resolver.has_html(url)
+    assert resolver.pop_html(url)
+    assert not resolver.has_html(url)
+    assert resolver.pop_html(url) is None
+
+    again = [{'url': url}]
+    PickupDateResolver(metadata_lookup=True, session=session).resolve(again)
+    assert again[0]['published_at'] == datetime(2025, 11, 4, 11, 56)
+    assert session.requested == [url]
+
+
+@pytest.mark.asyncio
+async def test_crawl_skips_pickups_outside_range(monkeypatch):
+    """日期範圍外的ピックアップ文章不會抓取內文"""
+    crawler = NPBCrawler()
+    soup = BeautifulSoup(load_fixture('list_npb'), 'html.parser')
+    pickups = crawler._crawl_pickup_section(soup)
+    pickups[0]['url'] = 'https://baseball.yahoo.co.jp/npb/news/detail/20251028-00000-spnannex-base'
+    pickups[1]['image_url'] = 'https://amd-pctr.c.yimg.jp/r/iwiz-amd/20251120-00000000-x.jpg'
+
+    async def crawl_list(page=1, deadline=None):
+        return pickups
+
+    fetched = []
+
+    async def crawl_article(article_info, deadline=None, html=None):
+        fetched.append(article_info['url'])
+        return None
+
+    monkeypatch.setattr(crawler, 'setup_driver', lambda: None)
+    monkeypatch.setattr(crawler, 'find_known_duplicates', lambda articles: {})
+    monkeypatch.setattr(crawler, 'crawl_list', crawl_list)
+    monkeypatch.setattr(crawler, 'crawl_article', crawl_article)
+    monkeypatch.setattr(crawler, '_sleep', lambda seconds, deadline: None)
+    monkeypatch.setattr('app.services.crawler.baseball_crawler.lookup_dates', lambda urls: {})
+
+    await crawler.crawl(start_date='2025-11-04', end_date='2025-11-04')
+    assert fetched == [p['url'] for p in pickups[2:]]
@@ -0,0 +1,252 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.services.crawler import baseball_crawler, playwright_backend
+from app.services.crawler.npb_crawler import NPBCrawler
+from benchmarks.corpus import load_fixture
+
+
+class _FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = None
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        await asyncio.sleep(0.01)
+        self.url = url
+
+    async def wait_for_selector(self, selector, timeout=None):
+        pass
+
+    async def content(self):
+        return self.browser.pages.get(self.url, '<html></html>')
+
+
+class _FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return _FakePage(self.browser)
+
+    async def close(self):
+        self.browser.open_contexts -= 1
+
+
+class _FakeBrowser:
+    def __init__(self, pages):
+        self.pages = pages
+        self.open_contexts = 0
+        self.max_contexts = 0
+        self.closed = False
+
+    async def new_context(self, **kwargs):
+        self.open_contexts += 1
+        self.max_contexts = max(self.max_contexts, self.open_contexts)
+        return _FakeContext(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakePlaywright:
+    """取代 async_playwright()，記錄啟動的瀏覽器"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.launched = []
+        self.chromium = self
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        return self
+
+    async def launch(self, **kwargs):
+        assert kwargs['executable_path'] == settings.CHROME_BIN
+        browser = _FakeBrowser(self.pages)
+        self.launched.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    pages = {'https://news.yahoo.co.jp/articles/test': load_fixture('article_npb_json')}
+    fake = _FakePlaywright(pages)
+    monkeypatch.setattr(playwright_backend, 'async_playwright', fake)
+    monkeypatch.setattr(settings, 'CRAWLER_BROWSER_BACKEND', 'playwright')
+    monkeypatch.setattr(settings, 'CRAWLER_DELAY_MIN', 0)
+    monkeypatch.setattr(settings, 'CRAWLER_DELAY_MAX', 0)
+    monkeypatch.setattr(settings, 'CRAWLER_HOST_MIN_INTERVAL', 0)
+    monkeypatch.setattr('app.services.crawler.prefetch._host_limiter', None)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_crawl_article_with_playwright(fake_playwright):
+    crawler = NPBCrawler()
+    await crawler.open_browser()
+    try:
+        info = {'url': 'https://news.yahoo.co.jp/articles/test', 'title': 'test'}
+        article = await crawler.crawl_article(info)
+        assert article is not None
+        assert article['content']
+        assert crawler.driver is None
+    finally:
+        await crawler.close_browser()
+    assert fake_playwright.launched[0].closed
+
+
+@pytest.mark.asyncio
+async def test_crawlers_share_one_browser(fake_playwright, monkeypatch):
+    """多個爬蟲共用同一個 Chromium，同時開啟的 context 受 MAX_CONCURRENT_CRAWLERS 限制"""
+    monkeypatch.setattr(settings, 'MAX_CONCURRENT_CRAWLERS', 2)
+
+    async def run_one():
+        crawler = NPBCrawler()
+        await crawler.open_browser()
+        try:
+            await crawler.fetch_page('https://news.yahoo.co.jp/articles/test')
+        finally:
+            await crawler.close_browser()
+
+    await asyncio.gather(*(run_one() for _ in range(5)))
+    assert len(fake_playwright.launched) == 1
+    browser = fake_playwright.launched[0]
+    assert browser.max_contexts == 2
+    assert browser.open_contexts == 0
+    assert browser.closed
+
+
+class _FakeBrowserSession:
+    """取代 PlaywrightSession：列表頁回傳列表的 fixture，其他網址回傳文章的 fixture"""
+
+    def __init__(self, list_url):
+        self.list_url = list_url
+
+    async def fetch(self, url, deadline=None, wait_selector=None, settle_seconds=0):
+        await asyncio.sleep(0.01)
+        return load_fixture('list_npb' if url == self.list_url else 'article_npb_json')
+
+    async def close(self):
+        pass
+
+
+class _BlockingDateResolver:
+    """同步查詢日期（模擬資料庫與 HTTP 查詢）"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def resolve(self, articles, start_date, end_date):
+        time.sleep(0.3)
+        return []
+
+    def has_html(self, url):
+        return False
+
+    def pop_html(self, url):
+        return None
+
+    def close(self):
+        pass
+
+
+def _fake_crawler(monkeypatch, find_known_duplicates):
+    crawler = NPBCrawler()
+
+    async def open_browser():
+        crawler.browser_session = _FakeBrowserSession(crawler.base_url)
+
+    monkeypatch.setattr(crawler, 'open_browser', open_browser)
+    monkeypatch.setattr(crawler, 'crawl_list', crawler.crawl_rendered_list)
+    monkeypatch.setattr(crawler, 'find_known_duplicates', find_known_duplicates)
+    return crawler
+
+
+@pytest.mark.asyncio
+async def test_playwright_crawls_overlap(monkeypatch):
+    """Playwright 後端的爬蟲不阻塞事件迴圈：同時執行的兩次爬取時間重疊"""
+    monkeypatch.setattr(settings, 'CRAWLER_PREFETCH_DEPTH', 0)
+    monkeypatch.setattr(baseball_crawler, 'PickupDateResolver', _BlockingDateResolver)
+    monkeypatch.setattr(baseball_crawler.random, 'uniform', lambda a, b: 0.02)
+
+    def find_known_duplicates(articles):
+        time.sleep(0.3)
+        return {}
+
+    def make_crawler():
+        return _fake_crawler(monkeypatch, find_known_duplicates)
+
+    started = time.monotonic()
+    single = await make_crawler().crawl()
+    single_elapsed = time.monotonic() - started
+
+    started = time.monotonic()
+    results = await asyncio.gather(make_crawler().crawl(), make_crawler().crawl())
+    elapsed = time.monotonic() - started
+
+    assert single
+    assert [len(result) for result in results] == [len(single)] * 2
+    assert elapsed < single_elapsed * 1.3
+
+
+class _RecordingPrefetcher:
+    """記錄排入與取得的網址"""
+    scheduled = []
+    fetched = []
+
+    def __init__(self, depth, deadline=None):
+        pass
+
+    def schedule(self, urls):
+        self.scheduled.extend(urls)
+
+    async def get(self, url):
+        self.fetched.append(url)
+        return load_fixture('article_npb_json')
+
+    def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_resolver_html_is_not_prefetched(monkeypatch):
+    """查詢日期時已下載的頁面不會再排入預先抓取"""
+    monkeypatch.setattr(settings, 'CRAWLER_PREFETCH_DEPTH', 2)
+    monkeypatch.setattr(baseball_crawler.random, 'uniform', lambda a, b: 0)
+    monkeypatch.setattr(_RecordingPrefetcher, 'scheduled', [])
+    monkeypatch.setattr(_RecordingPrefetcher, 'fetched', [])
+    monkeypatch.setattr(baseball_crawler, 'ArticlePrefetcher', _RecordingPrefetcher)
+
+    class _CachedDateResolver(_BlockingDateResolver):
+        def __init__(self, **kwargs):
+            self.html = {}
+
+        def resolve(self, articles, start_date, end_date):
+            self.html = {info['url']: load_fixture('article_npb_json') for info in articles[:2]}
+            return []
+
+        def has_html(self, url):
+            return url in self.html
+
+        def pop_html(self, url):
+            return self.html.pop(url, None)
+
+    monkeypatch.setattr(baseball_crawler, 'PickupDateResolver', _CachedDateResolver)
+
+    articles = await _fake_crawler(monkeypatch, lambda articles: {}).crawl()
+
+    cached = [article['url'] for article in articles[:2]]
+    assert len(articles) == 30
+    assert not set(cached) & set(_RecordingPrefetcher.scheduled)
+    assert not set(cached) & set(_RecordingPrefetcher.fetched)
+    assert len(_RecordingPrefetcher.fetched) == len(articles) - 2
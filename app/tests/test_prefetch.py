@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.config import settings
+from app.services.crawler.deadline import Deadline
+from app.services.crawler.npb_crawler import NPBCrawler
+from app.services.crawler.prefetch import ArticlePrefetcher, HostRateLimiter
+from benchmarks.corpus import load_fixture
+
+
+def test_host_rate_limiter():
+    """同一主機的請求依序間隔 min_interval，不同主機互不影響"""
+    limiter = HostRateLimiter(0.5)
+    assert limiter.reserve('https://news.yahoo.co.jp/a') == 0
+    assert 0.4 < limiter.reserve('https://news.yahoo.co.jp/b') <= 0.5
+    assert 0.9 < limiter.reserve('https://news.yahoo.co.jp/c') <= 1.0
+    assert limiter.reserve('https://baseball.yahoo.co.jp/') == 0
+
+
+class _Response:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+
+class _FakeSession:
+    """記錄請求時間的假 requests.Session"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.headers = {}
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.requested.append((url, time.monotonic()))
+        time.sleep(0.05)
+        if url not in self.pages:
+            return _Response(404, '')
+        return _Response(200, self.pages[url])
+
+    def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_respects_host_limit():
+    pages = {f'https://news.yahoo.co.jp/articles/{i}': f'page {i}' for i in range(4)}
+    session = _FakeSession(pages)
+    with ArticlePrefetcher(2, limiter=HostRateLimiter(0.1), session=session) as prefetcher:
+        prefetcher.schedule(pages)
+        assert [await prefetcher.get(url) for url in pages] == ['page 0', 'page 1', 'page 2', 'page 3']
+        assert await prefetcher.get('https://news.yahoo.co.jp/articles/unknown') is None
+
+    times = sorted(t for _, t in session.requested)
+    assert all(b - a >= 0.09 for a, b in zip(times, times[1:]))
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_failure_returns_none():
+    session = _FakeSession({})
+    with ArticlePrefetcher(1, limiter=HostRateLimiter(0), session=session) as prefetcher:
+        prefetcher.schedule(['https://news.yahoo.co.jp/articles/missing'])
+        assert await prefetcher.get('https://news.yahoo.co.jp/articles/missing') is None
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_stops_at_deadline():
+    expired = Deadline(0.001)
+    time.sleep(0.002)
+    session = _FakeSession({'https://news.yahoo.co.jp/articles/0': 'page'})
+    with ArticlePrefetcher(1, deadline=expired, limiter=HostRateLimiter(0), session=session) as prefetcher:
+        prefetcher.schedule(['https://news.yahoo.co.jp/articles/0'])
+        assert await prefetcher.get('https://news.yahoo.co.jp/articles/0') is None
+    assert session.requested == []
+
+
+@pytest.mark.asyncio
+async def test_prefetcher_wait_does_not_block_loop():
+    """等待預先抓取時事件迴圈可以處理其他工作"""
+    session = _FakeSession({'https://news.yahoo.co.jp/articles/0': 'page'})
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    with ArticlePrefetcher(1, limiter=HostRateLimiter(0), session=session) as prefetcher:
+        prefetcher.schedule(['https://news.yahoo.co.jp/articles/0'])
+        ticker = asyncio.create_task(tick())
+        assert await prefetcher.get('https://news.yahoo.co.jp/articles/0') == 'page'
+        ticker.cancel()
+    assert ticks >= 3
+
+
+@pytest.mark.asyncio
+async def test_crawl_article_uses_prefetched_html():
+    """預先抓取的 HTML 可以解析時不需要使用瀏覽器"""
+    crawler = NPBCrawler()
+    info = {'url': 'https://news.yahoo.co.jp/articles/test', 'title': 'test'}
+    article = await crawler.crawl_article(info, html=load_fixture('article_npb_json'))
+    assert article is not None
+    assert article['content']
+    assert crawler.driver is None
+
+
+@pytest.mark.asyncio
+async def test_crawl_with_prefetch(monkeypatch):
+    """開啟預先抓取時，每篇文章都先排入下載，並把 HTML 交給 crawl_article"""
+    monkeypatch.setattr(settings, 'CRAWLER_PREFETCH_DEPTH', 1)
+    crawler = NPBCrawler()
+    urls = [f'https://news.yahoo.co.jp/articles/{i}' for i in range(3)]
+    monkeypatch.setattr(crawler, 'setup_driver', lambda: None)
+    monkeypatch.setattr(crawler, 'find_known_duplicates', lambda articles: {})
+
+    async def crawl_list(page=1, deadline=None):
+        return [{'url': url, 'title': url, 'published_at': None} for url in urls]
+
+    received = []
+
+    async def crawl_article(article_info, deadline=None, html=None):
+        received.append(html)
+        return dict(article_info)
+
+    def get(self, url, timeout=None):
+        return _Response(200, f'<html>{url}</html>')
+
+    monkeypatch.setattr(crawler, 'crawl_list', crawl_list)
+    monkeypatch.setattr(crawler, 'crawl_article', crawl_article)
+    monkeypatch.setattr('requests.Session.get', get)
+    monkeypatch.setattr(HostRateLimiter, 'wait', lambda self, url, deadline=None: None)
+
+    articles = await crawler.crawl()
+    assert [a['url'] for a in articles] == urls
+    assert received == [f'<html>{url}</html>' for url in urls]
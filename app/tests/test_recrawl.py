@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from functools import partial
+import pytest
+from app.core.database import SessionLocal
+from app.core.db_utils import batch_upsert_articles, recrawl_interval
+from app.models.article import Article
+from app.models.recrawl import RecrawlEntry
+from app.services.crawler import recrawl
+from app.services.crawler.recrawl import apply_recrawl_result, run_recrawl
+from benchmarks.corpus import article_raw_content, load_fixture
+
+CONTENT = article_raw_content('article_npb_json')
+URL = 'https://test.com/npb/recrawl'
+
+
+def test_recrawl_interval():
+    """發布後越久檢查間隔越長，超過最後一個上限就不再檢查"""
+    now = datetime(2025, 11, 10, 12, 0)
+    assert recrawl_interval(now - timedelta(hours=2), now) == timedelta(hours=1)
+    assert recrawl_interval(now - timedelta(hours=12), now) == timedelta(hours=3)
+    assert recrawl_interval(now - timedelta(days=2), now) == timedelta(hours=12)
+    assert recrawl_interval(now - timedelta(days=5), now) == timedelta(hours=48)
+    assert recrawl_interval(now - timedelta(days=8), now) is None
+    assert recrawl_interval(None, now) is None
+
+
+def _cleanup(db):
+    db.query(RecrawlEntry).filter(RecrawlEntry.url == URL).delete()
+    db.query(Article).filter(Article.url == URL).delete()
+    db.commit()
+
+
+@pytest.mark.usefixtures('schema')
+def test_recrawl_writes_only_changes(make_article):
+    """新文章加入佇列；內容相同時只排定下次檢查，內容改變時才更新文章"""
+    recrawl_article = partial(make_article, 'npb', 'recrawl', title='大谷翔平が第50号')
+
+    db = SessionLocal()
+    try:
+        _cleanup(db)
+        now = datetime.now()
+        batch_upsert_articles(db, [recrawl_article(content=CONTENT, published_at=now - timedelta(hours=2))])
+
+        entry = db.query(RecrawlEntry).filter(RecrawlEntry.url == URL).one()
+        article = db.get(Article, entry.article_id)
+        assert article.content_hash
+        assert entry.next_check_at > now
+
+        # 內容相同：不寫入文章
+        updated_at = article.updated_at
+        assert not apply_recrawl_result(db, entry, {'title': article.title, 'content': CONTENT}, now=now)
+        db.commit()
+        db.expire_all()
+        assert db.get(Article, entry.article_id).updated_at == updated_at
+        assert (entry.check_count, entry.change_count) == (1, 0)
+        assert entry.next_check_at == now + timedelta(hours=1)
+
+        # 內容改變：更新內文與指紋
+        changed = CONTENT + '（追記）'
+        assert apply_recrawl_result(db, entry, {'title': article.title, 'content': changed}, now=now)
+        db.commit()
+        db.expire_all()
+        article = db.get(Article, entry.article_id)
+        assert article.content == changed
+        assert article.updated_at == now
+        assert (entry.check_count, entry.change_count) == (2, 1)
+
+        # 文章超過檢查期限後移出佇列
+        apply_recrawl_result(db, entry, None, now=now + timedelta(days=8))
+        db.commit()
+        assert db.query(RecrawlEntry).filter(RecrawlEntry.url == URL).count() == 0
+    finally:
+        _cleanup(db)
+        db.close()
+
+
+class _FakePrefetcher:
+    """以固定 HTML 回應的 ArticlePrefetcher"""
+
+    def __init__(self, depth, deadline=None):
+        pass
+
+    def schedule(self, urls):
+        list(urls)
+
+    async def get(self, url):
+        return load_fixture('article_npb_json')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('schema')
+async def test_run_recrawl(make_article, monkeypatch):
+    """到期的文章以 HTTP 重新抓取，內容改變時更新"""
+    recrawl_article = partial(make_article, 'npb', 'recrawl', title='大谷翔平が第50号')
+    monkeypatch.setattr(recrawl, 'ArticlePrefetcher', _FakePrefetcher)
+
+    db = SessionLocal()
+    try:
+        _cleanup(db)
+        db.query(RecrawlEntry).filter(RecrawlEntry.next_check_at <= datetime.now()).delete()
+        batch_upsert_articles(db, [recrawl_article(content='舊的內文', published_at=datetime.now() - timedelta(hours=2))])
+        db.query(RecrawlEntry).filter(RecrawlEntry.url == URL).update(
+            {'next_check_at': datetime.now() - timedelta(minutes=1)}
+        )
+        db.commit()
+
+        stats = await run_recrawl(limit=10)
+        assert stats == {'checked': 1, 'changed': 1}
+
+        db.expire_all()
+        article = db.query(Article).filter(Article.url == URL).one()
+        assert article.content != '舊的內文'
+        assert article.content_hash
+    finally:
+        _cleanup(db)
+        db.close()
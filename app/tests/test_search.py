@@ -0,0 +1,72 @@
+from functools import partial
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.core.database import dispose_async_engines, SessionLocal
+from app.core.db_utils import article_search, batch_upsert_articles
+from app.core.search import search_query, search_terms, search_vector
+from app.main import app
+from app.models.article import Article
+
+
+def test_search_terms_normalized():
+    assert search_terms('ＭＬＢ・大谷翔平　ﾎｰﾑﾗﾝ') == ['mlb', '大谷翔平', 'ホームラン']
+    assert search_query('大谷 翔平') == "('大谷') & ('翔平')"
+    assert search_query('大谷翔平') == "('大谷' <-> '谷翔' <-> '翔平')"
+    assert search_query('谷') == "'谷':*"
+    assert search_query(' 、 ') is None
+
+
+def test_search_vector_positions():
+    """標題權重 A；詞段之間空出一個位置；引號會被跳脫"""
+    assert search_vector('大谷', 'イチロー打つ') == "'大谷':1A '谷':2A 'イチ':4 'チロ':5 'ロー':6 'ー打':7 '打つ':8 'つ':9"
+    assert search_vector(None, "it's ab") == "'it':1 't':2 's':4 'ab':6 'b':7"
+    assert search_vector(None, 'b\\c') == "'b\\\\':1 '\\\\c':2 'c':3"
+    assert search_vector(None, None) is None
+
+
+def _search(db, keyword):
+    condition, rank = article_search(keyword)
+    rows = db.query(Article.url).filter(Article.source == 'search_test').filter(condition)\
+        .order_by(rank.desc(), Article.url).all()
+    return [row.url.rsplit('/', 1)[1] for row in rows]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('schema')
+async def test_search_articles(make_article):
+    """bigram 片語查詢等同子字串比對；標題命中排在內文命中之前"""
+    article = partial(make_article, 'search_test')
+
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'search_test').delete()
+        db.commit()
+        batch_upsert_articles(db, [
+            article('title', title='大谷翔平が２本塁打', content='ドジャースが勝利した。'),
+            article('content', title='ドジャース連勝', content='先発の山本に続き、大谷翔平も活躍した。'),
+            article('other', title='ＭＬＢ開幕', content='大谷選手と翔平くんは別人です。'),
+        ])
+
+        assert _search(db, '大谷翔平') == ['title', 'content']
+        assert _search(db, '谷翔') == ['title', 'content']
+        assert _search(db, 'mlb') == ['other']
+        assert _search(db, '大谷 翔平') == ['title', 'content', 'other']
+        assert set(_search(db, '塁')) == {'title'}
+        assert _search(db, '2本塁打') == ['title']
+        assert _search(db, '翔平大谷') == []
+
+        # 沒有內文的更新保留既有的搜尋向量
+        batch_upsert_articles(db, [article('content', title='ドジャース連勝', content=None, description='先発の山本に続き、大谷翔平も活躍した。')])
+        assert _search(db, '山本') == ['content']
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.get('/api/v1/articles/search', params={'q': '大谷翔平', 'source': 'search_test'})
+            assert response.status_code == 200
+            assert [a['title'] for a in response.json()] == ['大谷翔平が２本塁打', 'ドジャース連勝']
+            assert (await client.get('/api/v1/articles/search', params={'q': '・'})).status_code == 400
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'search_test').delete()
+        db.commit()
+        db.close()
+        await dispose_async_engines()
@@ -0,0 +1,83 @@
+import os
+from datetime import datetime
+import pytest
+from app.core import db_writer
+from app.core.db_writer import ArticleWriter
+from app.core.spool import ArticleSpool, encode_record, read_records
+
+
+def _articles(prefix, count):
+    return [
+        {'url': f'https://test.com/{prefix}/{i}', 'title': f'{prefix} {i}', 'published_at': datetime(2025, 11, 4, 12, i)}
+        for i in range(count)
+    ]
+
+
+def test_read_records_stops_at_torn_write(tmp_path):
+    """寫入到一半的紀錄不會被讀出"""
+    path = tmp_path / 'segment.spool'
+    first = encode_record(_articles('a', 2))
+    second = encode_record(_articles('b', 1))
+    path.write_bytes(first + second[:-3])
+
+    records = list(read_records(str(path)))
+    assert len(records) == 1
+    offset, articles = records[0]
+    assert offset == len(first)
+    assert articles == _articles('a', 2)
+
+
+def test_drain_is_idempotent(tmp_path):
+    """寫入失敗時保留在暫存區；成功後記錄位置，不會重複寫入"""
+    spool = ArticleSpool(str(tmp_path), fsync=False)
+    spool.append(_articles('a', 3))
+    spool.append(_articles('b', 3))
+    assert spool.pending_count() == 6
+
+    def failing_write(articles):
+        raise RuntimeError('資料庫無法連線')
+
+    with pytest.raises(RuntimeError):
+        spool.drain(failing_write, batch_size=4)
+    assert spool.pending_count() == 6
+
+    written = []
+    assert spool.drain(written.append, batch_size=4) == 6
+    assert [len(batch) for batch in written] == [6]
+    assert spool.pending_count() == 0
+    # 仍在寫入中的 segment 不會被刪除
+    assert len(spool.segments()) == 1
+
+    spool.close()
+    assert spool.drain(written.append, batch_size=4) == 0
+    assert spool.segments() == []
+    assert os.listdir(tmp_path) == ['drain.lock']
+
+
+def test_writer_keeps_articles_until_database_recovers(tmp_path, monkeypatch):
+    """資料庫寫入失敗時 submit 仍立即完成，恢復後從暫存區寫入"""
+    calls = []
+
+    def flaky_upsert(session, articles, batch_size=100):
+        calls.append(len(articles))
+        if len(calls) == 1:
+            raise RuntimeError('資料庫無法連線')
+        return len(articles), 0
+
+    monkeypatch.setattr(db_writer, 'batch_upsert_articles', flaky_upsert)
+
+    class _Session:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    spool = ArticleSpool(str(tmp_path), fsync=False)
+    writer = ArticleWriter(batch_size=10, flush_interval=0.05, session_factory=_Session, spool=spool).start()
+    assert writer.submit(_articles('a', 2)).result(timeout=1) == 2
+    writer.close()
+
+    assert calls[0] == 2 and calls[-1] == 2
+    assert writer.written == 2
+    assert spool.segments() == []
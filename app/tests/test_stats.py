@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from functools import partial
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.core.database import dispose_async_engines, SessionLocal
+from app.core.db_utils import batch_upsert_articles
+from app.core.stats import refresh_recent_daily_stats
+from app.main import app
+from app.models.article import Article
+from app.models.article_stats import ArticleDailyStats
+
+
+def _stats(db):
+    db.expire_all()
+    return {
+        (row.category, row.day): (row.article_count, row.content_count, row.content_bytes,
+                                  row.first_published_at, row.last_published_at)
+        for row in db.query(ArticleDailyStats).filter(ArticleDailyStats.source == 'stats_test')
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('schema')
+async def test_daily_stats_follow_batches(make_article):
+    """每批寫入後更新受影響日期的統計；其他修改由定期重新計算補上"""
+    article = partial(make_article, 'stats_test', content=None)
+
+    yesterday = datetime.combine(datetime.now().date() - timedelta(days=1), datetime.min.time())
+    day1, day2 = yesterday - timedelta(days=1), yesterday
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.source == 'stats_test').delete()
+        db.query(ArticleDailyStats).filter(ArticleDailyStats.source == 'stats_test').delete()
+        db.commit()
+
+        batch_upsert_articles(db, [
+            article('a', published_at=day1 + timedelta(hours=9), category='NPB', content='本文です'),
+            article('b', published_at=day1 + timedelta(hours=15), category='NPB', content='ab'),
+            article('c', published_at=day2 + timedelta(hours=8)),
+        ])
+        assert _stats(db) == {
+            ('NPB', day1.date()): (2, 2, 14, day1 + timedelta(hours=9), day1 + timedelta(hours=15)),
+            ('', day2.date()): (1, 0, 0, day2 + timedelta(hours=8), day2 + timedelta(hours=8)),
+        }
+
+        # 修改發布日期：該批只更新新的日期，舊日期由定期重新計算修正
+        batch_upsert_articles(db, [article('b', published_at=day2 + timedelta(hours=10), category='NPB', content='ab')])
+        assert _stats(db)[('NPB', day2.date())] == (1, 1, 2, day2 + timedelta(hours=10), day2 + timedelta(hours=10))
+        refresh_recent_daily_stats(db, days=3)
+        assert _stats(db)[('NPB', day1.date())] == (1, 1, 12, day1 + timedelta(hours=9), day1 + timedelta(hours=9))
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+            response = await client.get('/api/v1/stats/', params={'source': 'stats_test', 'group_by': 'category'})
+            assert response.status_code == 200
+            by_category = {row['category']: row for row in response.json()}
+            assert by_category['NPB']['article_count'] == 2
+            assert by_category['NPB']['avg_content_bytes'] == 7
+            assert by_category['']['avg_content_bytes'] is None
+            assert by_category['NPB']['source'] is None and by_category['NPB']['day'] is None
+
+            response = await client.get('/api/v1/stats/', params={'source': 'stats_test'})
+            assert [(row['day'], row['article_count']) for row in response.json()] == [
+                (day1.date().isoformat(), 1),
+                (day2.date().isoformat(), 2),
+            ]
+            assert (await client.get('/api/v1/stats/', params={'group_by': 'url'})).status_code == 400
+    finally:
+        db.rollback()
+        db.query(Article).filter(Article.source == 'stats_test').delete()
+        db.query(ArticleDailyStats).filter(ArticleDailyStats.source == 'stats_test').delete()
+        db.commit()
+        db.close()
+        await dispose_async_engines()
@@ -0,0 +1,6 @@
+"""
+離線解析器效能基準測試
+
+使用 benchmarks/fixtures 內的列表頁與文章頁樣本，
+量測爬蟲解析函數的 ops/sec 與記憶體配置，並與 baselines.json 比較。
+"""
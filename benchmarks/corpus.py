@@ -0,0 +1,112 @@
+"""
+基準測試樣本載入與放大工具
+"""
+import copy
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# 列表頁樣本（不同來源類型的版面）
+LIST_FIXTURES = ['list_npb', 'list_jleague', 'list_keiba']
+
+# 文章頁樣本（JSON 內嵌與純 HTML 兩種）
+ARTICLE_FIXTURES = ['article_npb_json', 'article_jleague_json', 'article_keiba_html']
+
+# 放大時要複製的重複項目
+REPEATED_ITEM_SELECTORS = [
+    '.sn-articlePickup',
+    '.io-pickup__item',
+    '.sn-timeLine__item',
+    'article p',
+]
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> str:
+    """讀取樣本 HTML"""
+    path = os.path.join(FIXTURES_DIR, f'{name}.html')
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _scale_preloaded_state(script_text: str, factor: int) -> str:
+    """放大 __PRELOADED_STATE__ 中的段落數量"""
+    start = script_text.find('{')
+    end = script_text.rfind('}') + 1
+    data = json.loads(script_text[start:end])
+    detail = data.get('articleDetail', {})
+    paragraphs = detail.get('paragraphs', [])
+    scaled = []
+    for i in range(factor):
+        for para in paragraphs:
+            if isinstance(para, dict) and para.get('text'):
+                # 加上序號避免被去重後縮回原大小
+                para = dict(para, text=f"{para['text']}（{i}）")
+            scaled.append(para)
+    detail['paragraphs'] = scaled
+    return script_text[:start] + json.dumps(data, ensure_ascii=False) + script_text[end:]
+
+
+@lru_cache(maxsize=None)
+def scaled_fixture(name: str, factor: int = 1) -> str:
+    """
+    取得放大 factor 倍的樣本 HTML
+
+    列表頁會複製文章項目，文章頁會複製段落，
+    用來觀察解析時間隨頁面大小的變化。
+    """
+    html = load_fixture(name)
+    if factor <= 1:
+        return html
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in REPEATED_ITEM_SELECTORS:
+        items = soup.select(selector)
+        for i in range(1, factor):
+            for item in items:
+                clone = copy.copy(item)
+                for text_node in clone.find_all(string=True):
+                    if text_node.strip():
+                        text_node.replace_with(f"{text_node}（{i}）")
+                        break
+                items[-1].insert_after(clone)
+
+    for script in soup.find_all('script'):
+        if script.string and '__PRELOADED_STATE__' in script.string:
+            script.string = _scale_preloaded_state(script.string, factor)
+
+    return str(soup)
+
+
+def article_raw_content(name: str, factor: int = 1) -> str:
+    """取得文章樣本未清理前的內文（clean_content 的輸入）"""
+    soup = BeautifulSoup(scaled_fixture(name, factor), 'html.parser')
+    for script in soup.find_all('script'):
+        if script.string and '__PRELOADED_STATE__' in script.string:
+            text = script.string
+            data = json.loads(text[text.find('{'):text.rfind('}') + 1])
+            paragraphs = data['articleDetail']['paragraphs']
+            return '\n\n'.join(
+                p['text'] for p in paragraphs if isinstance(p, dict) and p.get('text')
+            )
+    return '\n\n'.join(p.text.strip() for p in soup.select('article p') if p.text.strip())
+
+
+# parse_flexible_date 的輸入樣本，依命中格式的位置分組
+DATE_SAMPLES: Dict[str, List[str]] = {
+    'iso': ['2025-11-04 11:56:00', '2025-11-04 11:56', '2025-11-04'],
+    'slash': ['2025/11/04 11:56:00', '2025/11/4 11:56', '2025/11/04'],
+    'english': ['04 Nov 2025', 'November 04, 2025', 'Nov 04, 2025'],
+    'numeric': ['04/11/2025', '11/30/2025'],
+}
+
+# _parse_japanese_datetime 的輸入樣本
+JAPANESE_DATE_SAMPLES: Dict[str, List[str]] = {
+    'short': ['11/3(月) 12:00', '11/4(火) 9:05', '10/31(金) 23:59'],
+    'full': ['2025/11/4 11:56', '2025/1/1 0:00', '2024/12/31 23:59'],
+}
@@ -0,0 +1,235 @@
+"""
+解析器基準測試執行器
+
+用法：
+    python -m benchmarks.run                      # 執行全部並與基準值比較
+    python -m benchmarks.run --filter timeline    # 只執行名稱包含 timeline 的項目
+    python -m benchmarks.run --save-baseline      # 將結果寫入 baselines.json
+    python -m benchmarks.run --max-regression 0.2 # ops/sec 下降超過 20% 時回傳非 0
+
+全部在本機以樣本檔執行，不需要瀏覽器、網路或資料庫。
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.services.crawler.npb_crawler import NPBCrawler
+from benchmarks.corpus import (
+    ARTICLE_FIXTURES,
+    DATE_SAMPLES,
+    JAPANESE_DATE_SAMPLES,
+    LIST_FIXTURES,
+    article_raw_content,
+    scaled_fixture,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_SCALES = (1, 4, 16)
+
+
+@dataclass
+class Benchmark:
+    """單一基準測試項目"""
+    name: str
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+
+
+def _article_info(name: str) -> Dict[str, Any]:
+    return {
+        'url': f'https://news.yahoo.co.jp/articles/{name}',
+        'title': name,
+        'image_url': '',
+        'news_source': '',
+    }
+
+
+def _parse_all(func: Callable[[str], Any], samples: List[str]) -> None:
+    for sample in samples:
+        func(sample)
+
+
+def build_benchmarks(scales: Tuple[int, ...] = DEFAULT_SCALES) -> List[Benchmark]:
+    """建立所有基準測試項目"""
+    crawler = NPBCrawler()
+    benchmarks: List[Benchmark] = []
+
+    for fixture in LIST_FIXTURES:
+        for scale in scales:
+            html = scaled_fixture(fixture, scale)
+            soup = BeautifulSoup(html, 'html.parser')
+            suffix = f'[{fixture}]x{scale}'
+            benchmarks.append(Benchmark(f'list_soup{suffix}', BeautifulSoup, (html, 'html.parser')))
+            benchmarks.append(Benchmark(f'_crawl_pickup_section{suffix}', crawler._crawl_pickup_section, (soup,)))
+            benchmarks.append(Benchmark(f'_crawl_timeline_section{suffix}', crawler._crawl_timeline_section, (soup,)))
+
+    for fixture in ARTICLE_FIXTURES:
+        info = _article_info(fixture)
+        for scale in scales:
+            html = scaled_fixture(fixture, scale)
+            soup = BeautifulSoup(html, 'html.parser')
+            suffix = f'[{fixture}]x{scale}'
+            benchmarks.append(Benchmark(f'article_soup{suffix}', BeautifulSoup, (html, 'html.parser')))
+            if fixture.endswith('_json'):
+                benchmarks.append(Benchmark(f'_extract_from_json{suffix}', crawler._extract_from_json, (soup, info)))
+            benchmarks.append(Benchmark(f'_extract_from_html{suffix}', crawler._extract_from_html, (soup, info)))
+            benchmarks.append(Benchmark(f'clean_content{suffix}', crawler.clean_content, (article_raw_content(fixture, scale),)))
+
+    for shape, samples in DATE_SAMPLES.items():
+        benchmarks.append(Benchmark(f'parse_flexible_date[{shape}]', _parse_all, (crawler.parse_flexible_date, samples)))
+
+    for shape, samples in JAPANESE_DATE_SAMPLES.items():
+        benchmarks.append(Benchmark(f'_parse_japanese_datetime[{shape}]', _parse_all, (crawler._parse_japanese_datetime, samples)))
+
+    return benchmarks
+
+
+def measure_speed(bench: Benchmark, repeat: int = 5) -> float:
+    """量測每秒執行次數（取最佳值）"""
+    timer = timeit.Timer(lambda: bench.func(*bench.args))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def measure_memory(bench: Benchmark) -> Tuple[float, int]:
+    """
+    量測單次呼叫的記憶體配置
+
+    Returns:
+        tuple: (峰值配置 KiB, 呼叫後仍存活的新配置區塊數)
+    """
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        base_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = bench.func(*bench.args)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        blocks = sum(
+            stat.count_diff
+            for stat in after.compare_to(before, 'filename')
+            if stat.count_diff > 0
+        )
+        del result
+    finally:
+        tracemalloc.stop()
+    return (peak - base_current) / 1024, blocks
+
+
+def run_benchmarks(benchmarks: List[Benchmark], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """執行基準測試並回傳結果"""
+    results = {}
+    for bench in benchmarks:
+        ops = measure_speed(bench, repeat=repeat)
+        peak_kib, blocks = measure_memory(bench)
+        results[bench.name] = {
+            'ops_per_sec': round(ops, 2),
+            'peak_kib': round(peak_kib, 1),
+            'alloc_blocks': blocks,
+        }
+        print(f"{bench.name:<60} {ops:>12,.1f} ops/s {peak_kib:>10,.1f} KiB {blocks:>8} blocks", flush=True)
+    return results
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BASELINE_PATH) -> None:
+    """寫入基準值（與既有的結果合併，只執行部分項目時不會刪除其他項目的基準值）"""
+    existing = load_baseline(path) or {}
+    data = {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {**existing.get('results', {}), **results},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare_with_baseline(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    max_regression: Optional[float] = None
+) -> List[str]:
+    """
+    與基準值比較
+
+    Returns:
+        list: ops/sec 下降超過 max_regression 的項目名稱
+    """
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    print(f"\n與基準值比較（{baseline.get('recorded_at')}, Python {baseline.get('python')}）")
+    for name, result in results.items():
+        base = baseline_results.get(name)
+        if not base:
+            print(f"{name:<60} {'(新項目)':>12}")
+            continue
+        speed_delta = result['ops_per_sec'] / base['ops_per_sec'] - 1
+        memory_delta = result['peak_kib'] - base['peak_kib']
+        print(f"{name:<60} {speed_delta:>+11.1%} ops/s {memory_delta:>+10.1f} KiB")
+        if max_regression is not None and speed_delta < -max_regression:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='爬蟲解析器離線基準測試')
+    parser.add_argument('--filter', help='只執行名稱包含此字串的項目')
+    parser.add_argument('--scales', default=','.join(map(str, DEFAULT_SCALES)),
+                        help='頁面放大倍數，以逗號分隔（預設 1,4,16）')
+    parser.add_argument('--repeat', type=int, default=5, help='每個項目重複量測次數')
+    parser.add_argument('--save-baseline', action='store_true', help='將結果寫入 baselines.json')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='基準值檔案路徑')
+    parser.add_argument('--max-regression', type=float,
+                        help='ops/sec 允許的最大下降比例（例如 0.2），超過時回傳非 0')
+    args = parser.parse_args(argv)
+
+    # 解析失敗的警告不影響量測，避免輸出被日誌淹沒
+    logging.disable(logging.CRITICAL)
+
+    scales = tuple(int(s) for s in args.scales.split(',') if s)
+    benchmarks = build_benchmarks(scales)
+    if args.filter:
+        benchmarks = [b for b in benchmarks if args.filter in b.name]
+
+    results = run_benchmarks(benchmarks, repeat=args.repeat)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n已寫入基準值: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print("\n尚無基準值，可使用 --save-baseline 建立")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, args.max_regression)
+    if regressions:
+        print(f"\n效能退步超過 {args.max_regression:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())